@@ -0,0 +1,346 @@
+"""
+Unused-permission detection from IAM service-last-accessed reports.
+
+Reports are asynchronous jobs: one is generated per role, then polled
+until it completes. Jobs for many roles run at once, capped in number
+and call rate. The first poll of a job waits about as long as earlier
+jobs took to finish and later polls back off. Throttling doubles the
+gap between calls; a refused job caps the jobs in flight at the number
+running, and each completed job lets one more start.
+"""
+
+import os
+import time
+import random
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Event
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.policy_analyzer import PolicyRiskAnalyzer, Severity
+from backend.result_sink import ResultSink
+from backend.utils.constants import (
+    SERVICE_ROLE_PREFIX,
+    UNUSED_ACCESS_DAYS,
+    ACCESS_ADVISOR_MAX_JOBS,
+    ACCESS_ADVISOR_CALLS_PER_SECOND,
+    ACCESS_ADVISOR_FIRST_POLL,
+    ACCESS_ADVISOR_MAX_POLL,
+    ACCESS_ADVISOR_BACKOFF,
+    ACCESS_ADVISOR_TIMEOUT,
+)
+
+# botocore is imported where its errors are caught, not with the API
+if TYPE_CHECKING:
+    from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+UNUSED_ACCESS_TITLE = "Unused Service Access"
+ALL_SERVICES = "*"
+THROTTLING_CODES = {"Throttling", "ThrottlingException", "LimitExceeded", "LimitExceededException"}
+
+# (policy kind, policy name) -> service namespaces the policy allows
+GrantedServices = Dict[Tuple[str, str], Set[str]]
+
+
+def unused_access_days() -> int:
+    return int(os.getenv("UNUSED_ACCESS_DAYS", UNUSED_ACCESS_DAYS))
+
+
+def policy_services(document: Dict[str, Any]) -> Set[str]:
+    """
+    Service namespaces a policy document can allow; {"*"} when its
+    actions are not limited to named services.
+    """
+    statements = document.get("Statement", [])
+    if isinstance(statements, dict):
+        statements = [statements]
+
+    services = set()
+    for statement in statements:
+        if str(statement.get("Effect", "Allow")).lower() == "deny":
+            continue
+        if statement.get("NotAction"):
+            return {ALL_SERVICES}
+
+        actions = statement.get("Action", [])
+        for action in [actions] if isinstance(actions, str) else actions:
+            prefix, separator, _ = action.partition(":")
+            if not separator or "*" in prefix:
+                return {ALL_SERVICES}
+            services.add(prefix.lower())
+
+    return services
+
+
+def _error_code(error: "ClientError") -> str:
+    return error.response.get("Error", {}).get("Code", "")
+
+
+# --------------------------------------------------
+# Report Jobs
+# --------------------------------------------------
+@dataclass
+class _Job:
+    arn: str
+    job_id: str
+    submitted: float
+    next_poll: float
+    delay: float
+    checked: float          # last time the job was still in progress
+
+
+class AccessAdvisor:
+    """
+    Fetches service-last-accessed reports for many roles concurrently.
+    """
+
+    def __init__(
+        self,
+        iam,
+        max_jobs: int = ACCESS_ADVISOR_MAX_JOBS,
+        calls_per_second: float = ACCESS_ADVISOR_CALLS_PER_SECOND,
+        first_poll: float = ACCESS_ADVISOR_FIRST_POLL,
+        max_poll: float = ACCESS_ADVISOR_MAX_POLL,
+        backoff: float = ACCESS_ADVISOR_BACKOFF,
+        timeout: float = ACCESS_ADVISOR_TIMEOUT
+    ):
+        self.iam = iam
+        self.max_jobs = max_jobs
+        self.min_interval = 1.0 / calls_per_second
+        self.interval = self.min_interval
+        self.expected = first_poll       # typical job duration, learned as jobs complete
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {"submitted": 0, "polls": 0, "throttled": 0, "failed": 0}
+        self._next_call = 0.0
+
+    def _pace(self) -> None:
+        now = time.monotonic()
+        if self._next_call > now:
+            time.sleep(self._next_call - now)
+        self._next_call = max(now, self._next_call) + self.interval
+
+    def _throttled(self) -> None:
+        self.stats["throttled"] += 1
+        self.interval = min(self.interval * 2, 1.0)
+
+    def _succeeded(self) -> None:
+        self.interval = max(self.min_interval, self.interval * 0.9)
+
+    def _report(self, job_id: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Job status and, once completed, every page of its services.
+        """
+        self._pace()
+        response = self.iam.get_service_last_accessed_details(JobId=job_id)
+        self.stats["polls"] += 1
+        services = list(response.get("ServicesLastAccessed", []))
+
+        while response.get("JobStatus") == "COMPLETED" and response.get("IsTruncated"):
+            self._pace()
+            response = self.iam.get_service_last_accessed_details(JobId=job_id, Marker=response["Marker"])
+            services.extend(response.get("ServicesLastAccessed", []))
+
+        return response.get("JobStatus", "FAILED"), services
+
+    def fetch(
+        self,
+        arns: Iterable[str],
+        cancel_event: Optional[Event] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Role ARN -> ServicesLastAccessed entries (None if its job failed).
+        Roles left when the scan is cancelled or the timeout passes are
+        missing from the result.
+        """
+        from botocore.exceptions import ClientError
+
+        pending = deque(dict.fromkeys(arns))
+        total = len(pending)
+        jobs: Dict[str, _Job] = {}
+        results: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+        limit = self.max_jobs
+        deadline = time.monotonic() + self.timeout
+
+        while pending or jobs:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if time.monotonic() > deadline:
+                logger.warning(f"Access advisor timed out with {len(pending) + len(jobs)} roles left")
+                break
+
+            # Submit while there is room
+            while pending and len(jobs) < limit:
+                self._pace()
+                try:
+                    job_id = self.iam.generate_service_last_accessed_details(Arn=pending[0])["JobId"]
+                except ClientError as e:
+                    if _error_code(e) in THROTTLING_CODES:
+                        self._throttled()
+                        limit = max(1, len(jobs))
+                        break
+                    if _error_code(e) == "AccessDenied":
+                        logger.warning(f"Access advisor disabled for this scan: {e}")
+                        return results
+                    logger.warning(f"Service last accessed job for {pending[0]} not started: {e}")
+                    results[pending.popleft()] = None
+                    self.stats["failed"] += 1
+                    continue
+
+                now = time.monotonic()
+                jobs[job_id] = _Job(pending.popleft(), job_id, now, now + self.expected, self.expected, now)
+                self.stats["submitted"] += 1
+                self._succeeded()
+
+            # Poll the jobs that are due, oldest deadline first
+            now = time.monotonic()
+            for job in sorted((j for j in jobs.values() if j.next_poll <= now), key=lambda j: j.next_poll):
+                try:
+                    status, services = self._report(job.job_id)
+                except ClientError as e:
+                    if _error_code(e) in THROTTLING_CODES:
+                        self._throttled()
+                        job.next_poll = time.monotonic() + job.delay
+                        break
+                    status, services = "FAILED", []
+                    logger.warning(f"Service last accessed job for {job.arn} failed: {e}")
+
+                polled_at = time.monotonic()
+                if status == "IN_PROGRESS":
+                    job.checked = polled_at
+                    job.delay = min(job.delay * self.backoff, self.max_poll)
+                    job.next_poll = polled_at + job.delay * random.uniform(0.9, 1.1)
+                    continue
+
+                del jobs[job.job_id]
+                self._succeeded()
+                if status == "COMPLETED":
+                    results[job.arn] = services
+                    # It finished somewhere between the last two polls
+                    finished = (job.checked + polled_at) / 2 - job.submitted
+                    self.expected = 0.8 * self.expected + 0.2 * finished
+                    limit = min(self.max_jobs, limit + 1)
+                else:
+                    results[job.arn] = None
+                    self.stats["failed"] += 1
+
+            if on_progress:
+                on_progress(len(results), total)
+
+            # Sleep until the next poll is due, unless more jobs can start
+            if jobs and not (pending and len(jobs) < limit):
+                wait = min(job.next_poll for job in jobs.values()) - time.monotonic()
+                if wait > 0:
+                    if cancel_event is not None:
+                        cancel_event.wait(wait)
+                    else:
+                        time.sleep(wait)
+
+        return results
+
+
+# --------------------------------------------------
+# Findings
+# --------------------------------------------------
+def _unused_finding(services: List[str], days: int, severity: Severity) -> Dict[str, Any]:
+    listing = ", ".join(services[:10]) + (f" (+{len(services) - 10} more)" if len(services) > 10 else "")
+    return {
+        "id": "UNUSED_SERVICE_ACCESS",
+        "title": UNUSED_ACCESS_TITLE,
+        "severity": severity,
+        "description": f"Grants access to {len(services)} service(s) not used in the last {days} days: {listing}",
+        "statement_index": None,
+        "services": services,
+    }
+
+
+def apply_unused_findings(
+    roles: List[Dict[str, Any]],
+    reports: Dict[str, Optional[List[Dict[str, Any]]]],
+    granted: Dict[str, GrantedServices],
+    days: int,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Add an "Unused Service Access" finding to every policy that grants
+    services the role has not used within `days` (MEDIUM when none of
+    the policy's services were used, LOW otherwise). Returns the number
+    of findings added.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    added = 0
+
+    for role in roles:
+        report = reports.get(role.get("Arn"))
+        if not report:
+            continue
+
+        reported = {entry["ServiceNamespace"] for entry in report}
+        unused = {
+            entry["ServiceNamespace"] for entry in report
+            if entry.get("LastAuthenticated") is None or entry["LastAuthenticated"] < cutoff
+        }
+        role_granted = granted.get(role.get("RoleName"), {})
+
+        for kind in ("AttachedPolicies", "InlinePolicies"):
+            for policy in role.get(kind, []):
+                services = role_granted.get((kind, policy["PolicyName"]))
+                if not services:
+                    continue
+
+                in_report = reported if ALL_SERVICES in services else services & reported
+                idle = in_report & unused
+                if not idle:
+                    continue
+
+                severity = Severity.MEDIUM if idle == in_report else Severity.LOW
+                policy["Findings"].append(_unused_finding(sorted(idle), days, severity))
+                policy["RiskScore"] += PolicyRiskAnalyzer.SEVERITY_SCORES[severity]
+                added += 1
+
+    return added
+
+
+def add_unused_access_findings(
+    iam,
+    scan_data: Dict[str, Any],
+    granted: Dict[str, GrantedServices],
+    days: int,
+    cancel_event: Optional[Event] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Fetch last-accessed reports for the scanned roles (service-linked
+    roles excluded: their permissions are managed by AWS) and attach
+    unused-access findings in place. Roles spilled to a result sink
+    are rewritten batch by batch.
+    """
+    roles = scan_data.get("roles", [])
+    arns = [
+        role["Arn"] for role in roles
+        if role.get("Arn") and not role.get("RoleName", "").startswith(SERVICE_ROLE_PREFIX)
+    ]
+
+    advisor = AccessAdvisor(iam)
+    reports = advisor.fetch(arns, cancel_event, on_progress)
+
+    def apply(batch: List[Dict[str, Any]]) -> int:
+        return apply_unused_findings(batch, reports, granted, days)
+
+    findings = roles.rewrite(apply) if isinstance(roles, ResultSink) else apply(roles)
+
+    stats = {
+        "days": days,
+        "roles": len(arns),
+        "reports": sum(report is not None for report in reports.values()),
+        "findings": findings,
+        **advisor.stats,
+    }
+    logger.info(f"Access advisor: {stats}")
+    return stats
@@ -1,35 +1,44 @@
-import boto3
+import json
 import logging
 import os
+import time
 from datetime import datetime
-from botocore.config import Config
-from botocore.exceptions import ClientError, NoCredentialsError
-from dotenv import load_dotenv
+from threading import Event
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
 from backend.policy_analyzer import PolicyRiskAnalyzer
-
-
-
-
-
-load_dotenv()
-
-# -----------------------------
-# Logging Configuration
-# -----------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
+from backend.access_advisor import (
+    GrantedServices,
+    policy_services,
+    unused_access_days,
+    add_unused_access_findings,
 )
+from backend.result_sink import ResultSink
+from backend.utils.metrics import IAM_API_SECONDS, ANALYZER_POLICY_SECONDS
+from backend.utils.timing import StageTimings
+
 logger = logging.getLogger(__name__)
 
 # -----------------------------
 # AWS Client Configuration
 # -----------------------------
-AWS_CONFIG = Config(
-    retries={"max_attempts": 5, "mode": "standard"},
-    read_timeout=10,
-    connect_timeout=5
-)
+# botocore.config.Config arguments. boto3 and botocore (its exceptions
+# included) are imported by the functions that use them, at the first
+# scan, not by every process that imports the scanner
+AWS_CONFIG = {
+    "retries": {"max_attempts": 5, "mode": "standard"},
+    "read_timeout": 10,
+    "connect_timeout": 5,
+}
+
+
+TRUST_POLICY_NAME = "AssumeRolePolicy"
+
+
+class ScanCancelled(Exception):
+    """
+    Raised between roles when a scan's cancel event is set.
+    """
 
 
 # -----------------------------
@@ -40,13 +49,41 @@ def validate_env():
         raise EnvironmentError("AWS_DEFAULT_REGION not set")
 
 
+def _start_call_timer(context, **kwargs):
+    context["metrics_started"] = time.perf_counter()
+
+
+def _record_call(model, parsed, context, **kwargs):
+    started = context.get("metrics_started")
+    if started is not None:
+        IAM_API_SECONDS.observe(
+            time.perf_counter() - started,
+            operation=model.name,
+            outcome=parsed.get("Error", {}).get("Code", "ok")
+        )
+
+
 def get_iam_client():
-    return boto3.client(
+    import boto3
+    from botocore.config import Config
+
+    iam = boto3.client(
         "iam",
         region_name=os.getenv("AWS_DEFAULT_REGION"),
-        config=AWS_CONFIG
+        config=Config(**AWS_CONFIG)
     )
 
+    # Time every IAM call (paginated pages included, retries counted in)
+    iam.meta.events.register("before-call.iam", _start_call_timer)
+    iam.meta.events.register("after-call.iam", _record_call)
+    return iam
+
+
+def account_of(arn):
+    # arn:aws:iam::123456789012:role/name
+    parts = (arn or "").split(":")
+    return parts[4] if len(parts) > 5 and parts[4] else None
+
 
 # -----------------------------
 # IAM Fetch Helpers
@@ -93,6 +130,30 @@ def get_managed_policy_document(iam, policy_arn):
     return policy_version.get("PolicyVersion", {}).get("Document", {})
 
 
+def get_role(iam, role_name):
+    """
+    Current role definition, or None if the role no longer exists.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return iam.get_role(RoleName=role_name)["Role"]
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "NoSuchEntity":
+            return None
+        raise
+
+
+def get_roles_for_policy(iam, policy_arn):
+    roles = []
+    paginator = iam.get_paginator("list_entities_for_policy")
+
+    for page in paginator.paginate(PolicyArn=policy_arn, EntityFilter="Role"):
+        roles.extend(role["RoleName"] for role in page.get("PolicyRoles", []))
+
+    return roles
+
+
 def get_inline_policy_document(iam, role_name, policy_name):
     response = iam.get_role_policy(
         RoleName=role_name,
@@ -101,13 +162,190 @@ def get_inline_policy_document(iam, role_name, policy_name):
     return response.get("PolicyDocument", {})
 
 
+# -----------------------------
+# Role Scanner
+# -----------------------------
+def scan_role(
+    iam,
+    analyzer,
+    role,
+    timings: Optional[StageTimings] = None,
+    granted: Optional[GrantedServices] = None
+):
+    """
+    Fetch and analyze every policy of one role.
+    Time spent in IAM calls is recorded as role_fetch, analysis as analyze.
+    If `granted` is given, each policy's service namespaces are recorded
+    in it for the unused-access check.
+    """
+    from botocore.exceptions import ClientError
+
+    role_started = time.perf_counter()
+    analyze_seconds = 0.0
+
+    role_name = role.get("RoleName")
+    logger.info(f"Scanning role: {role_name}")
+
+    role_data = {
+        "RoleName": role_name,
+        "Arn": role.get("Arn"),
+        "AttachedPolicies": [],
+        "InlinePolicies": [],
+        "TrustPolicies": []
+    }
+
+    # -----------------------------
+    # Trust Policy (already in the role listing: no IAM call)
+    # -----------------------------
+    trust_doc = role.get("AssumeRolePolicyDocument")
+    if isinstance(trust_doc, str):
+        trust_doc = json.loads(unquote(trust_doc))
+    if trust_doc:
+        started = time.perf_counter()
+        analysis = analyzer.analyze_trust_policy(trust_doc, account_of(role.get("Arn")))
+        elapsed = time.perf_counter() - started
+        analyze_seconds += elapsed
+        ANALYZER_POLICY_SECONDS.observe(elapsed)
+
+        role_data["TrustPolicies"].append({
+            "PolicyName": TRUST_POLICY_NAME,
+            "RiskScore": analysis["risk_score"],
+            "Findings": analysis["findings"]
+        })
+
+    # -----------------------------
+    # Managed Policies
+    # -----------------------------
+    for policy in get_attached_policies(iam, role_name):
+        try:
+            doc = get_managed_policy_document(iam, policy["PolicyArn"])
+
+            started = time.perf_counter()
+            analysis = analyzer.analyze_policy(
+                policy=doc,
+                policy_name=policy["PolicyName"]
+            )
+            elapsed = time.perf_counter() - started
+            analyze_seconds += elapsed
+            ANALYZER_POLICY_SECONDS.observe(elapsed)
+
+            role_data["AttachedPolicies"].append({
+                "PolicyName": policy["PolicyName"],
+                "PolicyArn": policy["PolicyArn"],
+                "RiskScore": analysis["risk_score"],
+                "Findings": analysis["findings"]
+            })
+            if granted is not None:
+                granted[("AttachedPolicies", policy["PolicyName"])] = policy_services(doc)
+
+        except ClientError as e:
+            logger.warning(
+                f"Failed to scan managed policy {policy['PolicyName']} on role {role_name}: {e}"
+            )
+
+    # -----------------------------
+    # Inline Policies
+    # -----------------------------
+    for policy_name in get_inline_policies(iam, role_name):
+        try:
+            doc = get_inline_policy_document(iam, role_name, policy_name)
+
+            started = time.perf_counter()
+            analysis = analyzer.analyze_policy(
+                policy=doc,
+                policy_name=policy_name
+            )
+            elapsed = time.perf_counter() - started
+            analyze_seconds += elapsed
+            ANALYZER_POLICY_SECONDS.observe(elapsed)
+
+            role_data["InlinePolicies"].append({
+                "PolicyName": policy_name,
+                "RiskScore": analysis["risk_score"],
+                "Findings": analysis["findings"]
+            })
+            if granted is not None:
+                granted[("InlinePolicies", policy_name)] = policy_services(doc)
+
+        except ClientError as e:
+            logger.warning(
+                f"Failed to scan inline policy {policy_name} on role {role_name}: {e}"
+            )
+
+    if timings is not None:
+        timings.add("role_fetch", time.perf_counter() - role_started - analyze_seconds)
+        timings.add("analyze", analyze_seconds)
+
+    return role_data
+
+
 # -----------------------------
 # Main Scanner
 # -----------------------------
-def scan_roles_and_policies():
+def scan_role_list(
+    iam,
+    roles,
+    timings: StageTimings,
+    cancel_event: Optional[Event] = None,
+    on_progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+    sink: Optional[ResultSink] = None
+) -> Tuple[Union[List[Dict], ResultSink], Optional[Dict]]:
+    """
+    Scan listed roles (a whole account, or one shard in distributed mode).
+    Unless UNUSED_ACCESS_DAYS is 0, policies granting services the role
+    has not used in that many days get an unused-access finding.
+    Returns the scanned roles (a list, or `sink` if given) and the
+    unused-access stats (or None).
+    """
+    analyzer = PolicyRiskAnalyzer()
+    days = unused_access_days()
+    granted: Dict[str, GrantedServices] = {}
+    scanned = sink if sink is not None else []
+
+    for done, role in enumerate(roles):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+        if on_progress:
+            on_progress("scan_roles", done, len(roles))
+
+        role_granted = granted.setdefault(role["RoleName"], {}) if days else None
+        scanned.append(scan_role(iam, analyzer, role, timings, role_granted))
+
+    if on_progress:
+        on_progress("scan_roles", len(roles), len(roles))
+
+    if not days:
+        return scanned, None
+
+    def report_progress(done, total):
+        if on_progress:
+            on_progress("access_advisor", done, total)
+
+    with timings.measure("access_advisor"):
+        unused_access = add_unused_access_findings(
+            iam, {"roles": scanned}, granted, days, cancel_event, report_progress
+        )
+    if cancel_event is not None and cancel_event.is_set():
+        raise ScanCancelled()
+
+    return scanned, unused_access
+
+
+def scan_roles_and_policies(
+    cancel_event: Optional[Event] = None,
+    on_progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+    sink: Optional[ResultSink] = None
+):
+    """
+    Scan every IAM role. `on_progress(stage, roles_done, roles_total)`
+    is called when listing starts, before each role and at the end.
+    With a `sink`, scanned roles are appended to it instead of a list.
+    """
     validate_env()
     iam = get_iam_client()
-    analyzer = PolicyRiskAnalyzer()
+    from botocore.exceptions import ClientError, NoCredentialsError
+
+    timings = StageTimings()
 
     results = {
         "scan_metadata": {
@@ -118,67 +356,16 @@ def scan_roles_and_policies():
     }
 
     try:
-        roles = list_iam_roles(iam)
-
-        for role in roles:
-            role_name = role.get("RoleName")
-            logger.info(f"Scanning role: {role_name}")
-
-            role_data = {
-                "RoleName": role_name,
-                "Arn": role.get("Arn"),
-                "AttachedPolicies": [],
-                "InlinePolicies": []
-            }
-
-            # -----------------------------
-            # Managed Policies
-            # -----------------------------
-            for policy in get_attached_policies(iam, role_name):
-                try:
-                    doc = get_managed_policy_document(iam, policy["PolicyArn"])
-
-                    analysis = analyzer.analyze_policy(
-                        policy=doc,
-                        policy_name=policy["PolicyName"]
-                    )
-
-                    role_data["AttachedPolicies"].append({
-                        "PolicyName": policy["PolicyName"],
-                        "PolicyArn": policy["PolicyArn"],
-                        "RiskScore": analysis["risk_score"],
-                        "Findings": analysis["findings"]
-                    })
-
-                except ClientError as e:
-                    logger.warning(
-                        f"Failed to scan managed policy {policy['PolicyName']} on role {role_name}: {e}"
-                    )
-
-            # -----------------------------
-            # Inline Policies
-            # -----------------------------
-            for policy_name in get_inline_policies(iam, role_name):
-                try:
-                    doc = get_inline_policy_document(iam, role_name, policy_name)
-
-                    analysis = analyzer.analyze_policy(
-                        policy=doc,
-                        policy_name=policy_name
-                    )
-
-                    role_data["InlinePolicies"].append({
-                        "PolicyName": policy_name,
-                        "RiskScore": analysis["risk_score"],
-                        "Findings": analysis["findings"]
-                    })
-
-                except ClientError as e:
-                    logger.warning(
-                        f"Failed to scan inline policy {policy_name} on role {role_name}: {e}"
-                    )
-
-            results["roles"].append(role_data)
+        if on_progress:
+            on_progress("list_roles", 0, None)
+        with timings.measure("list_roles"):
+            roles = list_iam_roles(iam)
+
+        results["roles"], unused_access = scan_role_list(iam, roles, timings, cancel_event, on_progress, sink)
+        if unused_access is not None:
+            results["scan_metadata"]["unused_access"] = unused_access
+
+        results["scan_metadata"]["timings"] = timings.to_dict()
 
         logger.info("IAM policy scan completed successfully")
         return results
@@ -195,6 +382,11 @@ def scan_roles_and_policies():
 # Local Execution
 # -----------------------------
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from backend.utils.logger import configure_logging
+
+    load_dotenv()
+    configure_logging()
     scan_data = scan_roles_and_policies()
 
     for role in scan_data["roles"]:
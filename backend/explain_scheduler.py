@@ -0,0 +1,129 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.constants import (
+    SEVERITY_CRITICAL,
+    SEVERITY_HIGH,
+    SEVERITY_MEDIUM,
+    SEVERITY_LOW,
+    ECONOMY_TIER_SEVERITIES,
+)
+
+# CRITICAL first; anything unknown goes last
+SEVERITY_ORDER = (SEVERITY_CRITICAL, SEVERITY_HIGH, SEVERITY_MEDIUM, SEVERITY_LOW)
+
+TIER_PREMIUM = "premium"
+TIER_ECONOMY = "economy"
+
+WorkItem = Tuple[str, Dict[str, Any]]  # (cache key, {"finding": ..., "chunks": ...})
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+def severity_of(finding: Dict[str, Any]) -> str:
+    severity = finding.get("severity")
+    return str(getattr(severity, "value", severity) or "").upper()
+
+
+def severity_rank(finding: Dict[str, Any]) -> int:
+    severity = severity_of(finding)
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+
+def model_tier(finding: Dict[str, Any]) -> str:
+    return TIER_ECONOMY if severity_of(finding) in ECONOMY_TIER_SEVERITIES else TIER_PREMIUM
+
+
+@dataclass
+class ExplainBudget:
+    """
+    Per-scan LLM budget. Tokens are reserved before each call (prompt +
+    completion ceiling) and settled with actual usage afterwards. Once a
+    reservation is refused every later one is too, so lower-severity
+    work can never overtake deferred higher-severity work.
+    """
+    max_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+    used_tokens: int = 0
+    reserved_tokens: int = 0
+    calls: int = 0
+    exhausted: bool = False
+    started: float = field(default_factory=time.perf_counter)
+
+    def reserve(self, tokens: int) -> int:
+        elapsed = time.perf_counter() - self.started
+
+        if (
+            self.exhausted
+            or (self.max_seconds is not None and elapsed > self.max_seconds)
+            or (
+                self.max_tokens is not None
+                and self.used_tokens + self.reserved_tokens + tokens > self.max_tokens
+            )
+        ):
+            self.exhausted = True
+            raise BudgetExhausted(f"explanation budget exhausted after {self.calls} calls")
+
+        self.reserved_tokens += tokens
+        self.calls += 1
+        return tokens
+
+    def settle(self, reserved: int, used: int) -> None:
+        self.reserved_tokens -= reserved
+        self.used_tokens += used
+
+    def release(self, reserved: int) -> None:
+        self.reserved_tokens -= reserved
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.max_tokens,
+            "max_seconds": self.max_seconds,
+            "used_tokens": self.used_tokens,
+            "llm_calls": self.calls,
+            "elapsed_seconds": round(time.perf_counter() - self.started, 3),
+            "exhausted": self.exhausted,
+        }
+
+
+def plan_groups(
+    policy_groups: List[List[WorkItem]],
+    batch_size: Optional[int]
+) -> List[List[WorkItem]]:
+    """
+    Order pending work by severity and cut it into LLM requests that
+    never mix model tiers.
+
+    batch_size None keeps one request per policy (split by tier);
+    otherwise requests hold up to batch_size findings across policies.
+    """
+    if batch_size is None:
+        groups = []
+        for group in policy_groups:
+            for tier in (TIER_PREMIUM, TIER_ECONOMY):
+                part = [item for item in group if model_tier(item[1]["finding"]) == tier]
+                if part:
+                    groups.append(sorted(part, key=lambda item: severity_rank(item[1]["finding"])))
+        return sorted(groups, key=lambda g: severity_rank(g[0][1]["finding"]))
+
+    size = max(batch_size, 1)
+    ordered = sorted(
+        (item for group in policy_groups for item in group),
+        key=lambda item: severity_rank(item[1]["finding"])
+    )
+
+    groups: List[List[WorkItem]] = []
+    for item in ordered:
+        tier = model_tier(item[1]["finding"])
+        if (
+            not groups
+            or len(groups[-1]) >= size
+            or model_tier(groups[-1][0][1]["finding"]) != tier
+        ):
+            groups.append([])
+        groups[-1].append(item)
+
+    return groups
@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from backend.utils.constants import (
+    EXPLAIN_CACHE_MEMORY_ENTRIES,
+    EXPLAIN_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DB_PATH = os.path.join(BASE_DIR, "explanation_cache", "explanations.db")
+
+
+def prompt_fingerprint(**parts: Any) -> str:
+    """
+    Stable hash of the role-independent inputs of an explanation.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """
+    Per-job cache accounting.
+    """
+    lookups: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    deduplicated: int = 0         # repeats of a prompt already resolved in this job
+    misses: int = 0
+    tokens_avoided: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits + self.deduplicated
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["hit_rate"] = round(self.hits / self.lookups, 4) if self.lookups else 0.0
+        return data
+
+
+class ExplanationCache:
+    """
+    Two-tier explanation cache: an in-memory LRU in front of a durable
+    SQLite table whose entries expire after `ttl_seconds`. Async callers
+    use aget/aput, which run the SQLite tier in a worker thread.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = CACHE_DB_PATH,
+        max_entries: int = EXPLAIN_CACHE_MEMORY_ENTRIES,
+        ttl_seconds: int = EXPLAIN_CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self._lock = Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                "key TEXT PRIMARY KEY, explanation TEXT NOT NULL, "
+                "tokens INTEGER NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "DELETE FROM explanations WHERE created_at < ?",
+                (time.time() - ttl_seconds,)
+            )
+
+    # --------------------------------------------------
+    # Lookup / Store
+    # --------------------------------------------------
+    def get(self, key: str, stats: Optional[CacheStats] = None) -> Optional[str]:
+        if stats:
+            stats.lookups += 1
+
+        text = self._get_memory(key, stats)
+        if text is None:
+            text = self._get_disk(key, stats)
+        return text
+
+    async def aget(self, key: str, stats: Optional[CacheStats] = None) -> Optional[str]:
+        if stats:
+            stats.lookups += 1
+
+        text = self._get_memory(key, stats)
+        if text is None:
+            if self._db is None:
+                return self._get_disk(key, stats)
+            text = await asyncio.to_thread(self._get_disk, key, stats)
+        return text
+
+    def put(self, key: str, explanation: str, tokens: int) -> None:
+        entry = (explanation, tokens, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        self._put_disk(key, entry)
+
+    async def aput(self, key: str, explanation: str, tokens: int) -> None:
+        entry = (explanation, tokens, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        if self._db is not None:
+            await asyncio.to_thread(self._put_disk, key, entry)
+
+    # --------------------------------------------------
+    # Tiers
+    # --------------------------------------------------
+    def _get_memory(self, key: str, stats: Optional[CacheStats]) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if not entry or time.time() - entry[2] >= self.ttl_seconds:
+                return None
+            self._memory.move_to_end(key)
+
+        if stats:
+            stats.memory_hits += 1
+            stats.tokens_avoided += entry[1]
+        return entry[0]
+
+    def _get_disk(self, key: str, stats: Optional[CacheStats]) -> Optional[str]:
+        with self._lock:
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT explanation, tokens, created_at FROM explanations "
+                    "WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds)
+                ).fetchone()
+
+            if row is None:
+                if stats:
+                    stats.misses += 1
+                return None
+
+            self._remember(key, row)
+
+        if stats:
+            stats.disk_hits += 1
+            stats.tokens_avoided += row[1]
+        return row[0]
+
+    def _put_disk(self, key: str, entry: Tuple[str, int, float]) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO explanations VALUES (?, ?, ?, ?)",
+                    (key, *entry)
+                )
+
+    def _remember(self, key: str, entry: Tuple[str, int, float]) -> None:
+        self._memory[key] = tuple(entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,562 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import zstandard
+
+from backend.result_sink import ResultSink, spilled_roles
+from backend.utils.serialization import dumps, loads
+from backend.utils.constants import (
+    JOB_STORE_BACKEND,
+    JOB_RETENTION_SECONDS,
+    JOB_STORE_MAX_JOBS,
+    JOB_RESULT_COMPRESSION_LEVEL,
+    JOB_SEGMENT_GRACE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_DB_PATH = os.path.join(BASE_DIR, "job_store", "jobs.db")
+
+# Columns kept outside the result blob
+_META_FIELDS = ("status", "created_at", "finished_at", "error", "summary")
+
+# Columns added after the first release of the table
+_MIGRATIONS = {
+    "summary": "ALTER TABLE scan_jobs ADD COLUMN summary TEXT",
+    "result_path": "ALTER TABLE scan_jobs ADD COLUMN result_path TEXT",
+    "result_roles": "ALTER TABLE scan_jobs ADD COLUMN result_roles INTEGER",
+}
+
+
+# Job timestamps are naive UTC datetimes (datetime.utcnow())
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    return value.replace(tzinfo=timezone.utc).timestamp() if value is not None else None
+
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    return datetime.utcfromtimestamp(value) if value is not None else None
+
+
+class _RetiredSegments:
+    """
+    Segment files of replaced or evicted results, removed on a later
+    prune once `grace_seconds` have passed: a reader may still be
+    streaming one (a cached ResultSink, an export, an explain job), and
+    on Windows an open file cannot be removed at all. Files that still
+    fail to go are retried on the next prune.
+    """
+
+    def __init__(self, grace_seconds: float = JOB_SEGMENT_GRACE_SECONDS):
+        self.grace_seconds = grace_seconds
+        self._segments: List[Tuple[float, str]] = []
+        self._lock = Lock()
+
+    def retire(self, paths: Iterable[Optional[str]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._segments += [(now, path) for path in paths if path]
+
+    def collect(self) -> None:
+        cutoff = time.monotonic() - self.grace_seconds
+        with self._lock:
+            due = [path for retired_at, path in self._segments if retired_at <= cutoff]
+            self._segments = [(t, path) for t, path in self._segments if t > cutoff]
+
+        kept = []
+        for path in due:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Result segment {path} not removed yet: {e!r}")
+                kept.append(path)
+
+        if kept:
+            self.retire(kept)
+
+
+class JobStore(ABC):
+    """
+    Storage for scan jobs.
+
+    A job is a dict with `status`, `data` (scan results or None),
+    `created_at` and, once finished, `finished_at` / `error` and a
+    precomputed `summary`. The roles of a large scan may be a finished
+    ResultSink; the store then owns its segment file.
+    """
+
+    @abstractmethod
+    def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, expected_revision: Optional[int] = None, **fields: Any) -> bool:
+        """
+        With `expected_revision`, write only if the stored summary is
+        still at that revision (`patches`, 0 before the first patch), so
+        concurrent read-modify-writes cannot lose each other's changes.
+        Returns whether the write happened.
+        """
+
+    @abstractmethod
+    def get(self, job_id: str, include_data: bool = True) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put_artifact(self, job_id: str, name: str, value: Any) -> None:
+        """
+        Store a derived, per-job value (e.g. scan fingerprints) next to
+        the job; it is evicted together with the job.
+        """
+
+    @abstractmethod
+    def get_artifact(self, job_id: str, name: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Most recent jobs first, without result data.
+        """
+
+    @abstractmethod
+    def prune(self) -> int:
+        """
+        Apply the retention policy; returns the number of evicted jobs.
+        """
+
+    @abstractmethod
+    def acquire_lease(self, name: str, owner: str, seconds: float) -> bool:
+        """
+        Take or renew the lease `name` for `seconds`; False while another
+        owner holds an unexpired one.
+        """
+
+    @abstractmethod
+    def release_lease(self, name: str, owner: str) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+def _revision(summary: Optional[Dict[str, Any]]) -> int:
+    return (summary or {}).get("patches", 0)
+
+
+# --------------------------------------------------
+# In-Memory Store (single process, lost on restart)
+# --------------------------------------------------
+class MemoryJobStore(JobStore):
+
+    def __init__(
+        self,
+        retention_seconds: Optional[int] = JOB_RETENTION_SECONDS,
+        max_jobs: Optional[int] = JOB_STORE_MAX_JOBS
+    ):
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._artifacts: Dict[str, Dict[str, Any]] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._lock = Lock()
+        self._retired = _RetiredSegments()
+
+    def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job_id] = {"data": None, **job}
+        self.prune()
+
+    def update(self, job_id: str, expected_revision: Optional[int] = None, **fields: Any) -> bool:
+        with self._lock:
+            job = self._jobs[job_id]
+            if expected_revision is not None and _revision(job.get("summary")) != expected_revision:
+                replaced, applied = spilled_roles(fields.get("data")), False
+            else:
+                replaced = spilled_roles(job.get("data")) if "data" in fields else None
+                job.update(fields)
+                applied = True
+
+        # The old segment once replaced, or the new one if the write lost
+        if replaced is not None and replaced is not spilled_roles(job.get("data")):
+            self._retired.retire([replaced.path])
+        return applied
+
+    def get(self, job_id: str, include_data: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if include_data:
+                return dict(job)
+            return {key: value for key, value in job.items() if key != "data"}
+
+    def put_artifact(self, job_id: str, name: str, value: Any) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._artifacts.setdefault(job_id, {})[name] = value
+
+    def get_artifact(self, job_id: str, name: str) -> Optional[Any]:
+        with self._lock:
+            return self._artifacts.get(job_id, {}).get(name)
+
+    def acquire_lease(self, name: str, owner: str, seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            holder, expires_at = self._leases.get(name, (owner, now))
+            if holder != owner and expires_at > now:
+                return False
+            self._leases[name] = (owner, now + seconds)
+            return True
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._lock:
+            if self._leases.get(name, (None,))[0] == owner:
+                del self._leases[name]
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = [
+                {"job_id": job_id, **{k: v for k, v in job.items() if k != "data"}}
+                for job_id, job in self._jobs.items()
+                if status is None or job["status"] == status
+            ]
+        jobs.sort(key=lambda job: job["created_at"], reverse=True)
+        return jobs[:limit]
+
+    def prune(self) -> int:
+        with self._lock:
+            finished = sorted(
+                (job["created_at"], job_id)
+                for job_id, job in self._jobs.items()
+                if job.get("finished_at") is not None
+            )
+
+            evict = set()
+            if self.retention_seconds is not None:
+                cutoff = datetime.utcnow().timestamp() - self.retention_seconds
+                evict.update(
+                    job_id for created_at, job_id in finished
+                    if created_at.timestamp() < cutoff
+                )
+            if self.max_jobs is not None and len(self._jobs) > self.max_jobs:
+                overflow = len(self._jobs) - self.max_jobs
+                evict.update(job_id for _, job_id in finished[:overflow])
+
+            segments = []
+            for job_id in evict:
+                spilled = spilled_roles(self._jobs.pop(job_id).get("data"))
+                segments.append(spilled.path if spilled is not None else None)
+                self._artifacts.pop(job_id, None)
+
+        self._retired.retire(segments)
+        self._retired.collect()
+        return len(evict)
+
+
+# --------------------------------------------------
+# SQLite Store (durable, shared by all workers on a host)
+# --------------------------------------------------
+class SQLiteJobStore(JobStore):
+    """
+    Job metadata lives in indexed columns; results are stored once as
+    zstd-compressed JSON, except the roles of a spilled scan, which stay
+    in their segment file (`result_path`). WAL mode lets every thread
+    (and every uvicorn worker) read while a single writer commits.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOB_DB_PATH,
+        retention_seconds: Optional[int] = JOB_RETENTION_SECONDS,
+        max_jobs: Optional[int] = JOB_STORE_MAX_JOBS,
+        compression_level: int = JOB_RESULT_COMPRESSION_LEVEL
+    ):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+        self.compression_level = compression_level
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = Lock()
+        self._write_lock = Lock()
+        self._retired = _RetiredSegments()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS scan_jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "created_at REAL NOT NULL, finished_at REAL, error TEXT, "
+            "result BLOB, result_bytes INTEGER, summary TEXT)"
+        )
+        columns = {row[1] for row in db.execute("PRAGMA table_info(scan_jobs)")}
+        for column, ddl in _MIGRATIONS.items():
+            if column not in columns:
+                db.execute(ddl)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_scan_jobs_status ON scan_jobs (status, created_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_scan_jobs_created ON scan_jobs (created_at)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS job_artifacts ("
+            "job_id TEXT NOT NULL, name TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (job_id, name))"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA busy_timeout=5000")
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    # --------------------------------------------------
+    # Result blobs
+    # --------------------------------------------------
+    def _compress(self, data: Any) -> bytes:
+        raw = dumps(data)
+        return zstandard.ZstdCompressor(level=self.compression_level).compress(raw)
+
+    @staticmethod
+    def _decompress(blob: Optional[bytes]) -> Any:
+        if blob is None:
+            return None
+        return loads(zstandard.ZstdDecompressor().decompress(blob))
+
+    # --------------------------------------------------
+    # Job CRUD
+    # --------------------------------------------------
+    def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        with self._write_lock:
+            self._db().execute(
+                "INSERT INTO scan_jobs (job_id, status, created_at, finished_at, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    job["status"],
+                    _to_epoch(job["created_at"]),
+                    _to_epoch(job.get("finished_at")),
+                    job.get("error"),
+                )
+            )
+        self.prune()
+
+    def update(self, job_id: str, expected_revision: Optional[int] = None, **fields: Any) -> bool:
+        columns, values = [], []
+        spilled = None
+
+        for name, value in fields.items():
+            if name == "data":
+                spilled = spilled_roles(value)
+                if spilled is not None:
+                    value = {**value, "roles": []}
+                blob = self._compress(value) if value is not None else None
+                size = len(blob) if blob is not None else None
+                if spilled is not None:
+                    size += spilled.segment_bytes
+                columns += ["result = ?", "result_bytes = ?", "result_path = ?", "result_roles = ?"]
+                values += [
+                    blob,
+                    size,
+                    spilled.path if spilled is not None else None,
+                    len(spilled) if spilled is not None else None,
+                ]
+            elif name in ("created_at", "finished_at"):
+                columns.append(f"{name} = ?")
+                values.append(_to_epoch(value))
+            elif name == "summary":
+                columns.append("summary = ?")
+                values.append(json.dumps(value) if value is not None else None)
+            elif name in _META_FIELDS:
+                columns.append(f"{name} = ?")
+                values.append(value)
+            else:
+                raise ValueError(f"Unknown job field: {name}")
+
+        where, params = "job_id = ?", [job_id]
+        if expected_revision is not None:
+            where += " AND coalesce(json_extract(summary, '$.patches'), 0) = ?"
+            params.append(expected_revision)
+
+        new_path = spilled.path if spilled is not None else None
+        with self._write_lock:
+            db = self._db()
+            # One transaction across workers: the replaced segment is the
+            # one this write actually replaced
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = None
+                if "data" in fields:
+                    row = db.execute("SELECT result_path FROM scan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+                    replaced = row[0] if row is not None else None
+
+                applied = db.execute(
+                    f"UPDATE scan_jobs SET {', '.join(columns)} WHERE {where}",
+                    (*values, *params)
+                ).rowcount > 0
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        if not applied:
+            self._retired.retire([new_path])  # the write lost; its segment is unused
+        elif replaced and replaced != new_path:
+            self._retired.retire([replaced])
+        return applied
+
+    def get(self, job_id: str, include_data: bool = True) -> Optional[Dict[str, Any]]:
+        row = self._db().execute(
+            "SELECT status, created_at, finished_at, error, summary"
+            f"{', result, result_path, result_roles' if include_data else ''} "
+            "FROM scan_jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        job = {"status": row[0], "created_at": _from_epoch(row[1])}
+        if include_data:
+            job["data"] = self._decompress(row[5])
+            if row[6] is not None and job["data"] is not None:
+                job["data"]["roles"] = ResultSink.open(row[6], row[7])
+        if row[2] is not None:
+            job["finished_at"] = _from_epoch(row[2])
+        if row[3] is not None:
+            job["error"] = row[3]
+        if row[4] is not None:
+            job["summary"] = json.loads(row[4])
+        return job
+
+    def put_artifact(self, job_id: str, name: str, value: Any) -> None:
+        blob = self._compress(value)
+        with self._write_lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO job_artifacts (job_id, name, value) "
+                "SELECT job_id, ?, ? FROM scan_jobs WHERE job_id = ?",
+                (name, blob, job_id)
+            )
+
+    def get_artifact(self, job_id: str, name: str) -> Optional[Any]:
+        row = self._db().execute(
+            "SELECT value FROM job_artifacts WHERE job_id = ? AND name = ?",
+            (job_id, name)
+        ).fetchone()
+        return self._decompress(row[0]) if row is not None else None
+
+    def acquire_lease(self, name: str, owner: str, seconds: float) -> bool:
+        now = time.time()
+        with self._write_lock:
+            return self._db().execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+                (name, owner, now + seconds, now)
+            ).rowcount > 0
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._write_lock:
+            self._db().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = "SELECT job_id, status, created_at, finished_at, error, result_bytes FROM scan_jobs"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+
+        rows = self._db().execute(f"{query} ORDER BY created_at DESC LIMIT ?", (*params, limit))
+        return [
+            {
+                "job_id": row[0],
+                "status": row[1],
+                "created_at": _from_epoch(row[2]),
+                "finished_at": _from_epoch(row[3]),
+                "error": row[4],
+                "result_bytes": row[5],
+            }
+            for row in rows
+        ]
+
+    def prune(self) -> int:
+        """
+        Evict finished jobs past retention, then the oldest finished
+        jobs above `max_jobs`. Running jobs are never evicted.
+        """
+        segments = []
+
+        with self._write_lock:
+            db = self._db()
+            if self.retention_seconds is not None:
+                segments += db.execute(
+                    "DELETE FROM scan_jobs WHERE finished_at IS NOT NULL AND created_at < ? "
+                    "RETURNING result_path",
+                    (time.time() - self.retention_seconds,)
+                ).fetchall()
+
+            if self.max_jobs is not None:
+                segments += db.execute(
+                    "DELETE FROM scan_jobs WHERE job_id IN ("
+                    "SELECT job_id FROM scan_jobs WHERE finished_at IS NOT NULL "
+                    "ORDER BY created_at "
+                    "LIMIT max(0, (SELECT count(*) FROM scan_jobs) - ?)) "
+                    "RETURNING result_path",
+                    (self.max_jobs,)
+                ).fetchall()
+
+            if segments:
+                db.execute(
+                    "DELETE FROM job_artifacts WHERE job_id NOT IN (SELECT job_id FROM scan_jobs)"
+                )
+
+        # Spilled results go with their job, once readers had time to finish
+        self._retired.retire(path for (path,) in segments)
+        self._retired.collect()
+
+        if segments:
+            logger.info(f"Job store evicted {len(segments)} jobs")
+        return len(segments)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for db in self._connections:
+                db.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def create_job_store(backend: Optional[str] = None) -> JobStore:
+    """
+    Build the configured job store ("sqlite" or "memory").
+    """
+    backend = (backend or os.getenv("JOB_STORE_BACKEND") or JOB_STORE_BACKEND).lower()
+
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "sqlite":
+        return SQLiteJobStore(db_path=os.getenv("JOB_STORE_PATH") or JOB_DB_PATH)
+
+    raise ValueError(f"Unknown job store backend: {backend}")
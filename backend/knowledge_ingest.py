@@ -0,0 +1,296 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+from collections import deque
+from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.utils.constants import (
+    KB_CHUNK_SIZE,
+    KB_CHUNK_OVERLAP,
+    KB_FILE_EXTENSIONS,
+    KB_SEGMENT_BYTES,
+    KB_INGEST_WORKERS,
+    KB_EMBED_BATCH_SIZE,
+    KB_MINHASH_PERMUTATIONS,
+    KB_LSH_BANDS,
+    KB_DEDUP_THRESHOLD,
+)
+
+from backend.utils.metrics import EMBEDDING_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# MinHash Parameters
+# --------------------------------------------------
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SHINGLE_SIZE = 5
+
+_rng = random.Random(1337)  # fixed seed: signatures must match across workers
+_PERMUTATIONS: List[Tuple[int, int]] = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(KB_MINHASH_PERMUTATIONS)
+]
+
+
+@dataclass
+class IngestReport:
+    files: int = 0
+    segments: int = 0
+    bytes_read: int = 0
+    chunks_total: int = 0
+    chunks_kept: int = 0
+    duplicates_dropped: int = 0
+    embed_batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        if not self.chunks_total:
+            return 0.0
+        return self.duplicates_dropped / self.chunks_total
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed_seconds or 1e-9
+        data = asdict(self)
+        data.update({
+            "dedup_ratio": round(self.dedup_ratio, 4),
+            "chunks_per_second": round(self.chunks_total / elapsed, 2),
+            "mb_per_second": round(self.bytes_read / elapsed / 1_000_000, 3),
+        })
+        return data
+
+
+# --------------------------------------------------
+# Discovery
+# --------------------------------------------------
+def iter_knowledge_files(root: str) -> Iterator[str]:
+    """
+    Recursively yield knowledge files under root in a stable order.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(KB_FILE_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def _iter_segments(root: str, segment_bytes: int) -> Iterator[Tuple[str, str, int, int]]:
+    """
+    Split every file into byte ranges so large files never load whole.
+    """
+    for path in iter_knowledge_files(root):
+        size = os.path.getsize(path)
+        source = os.path.relpath(path, root).replace(os.sep, "/")
+
+        start = 0
+        while True:
+            end = min(start + segment_bytes, size)
+            yield path, source, start, end
+            if end >= size:
+                break
+            start = end
+
+
+# --------------------------------------------------
+# Worker (runs in child processes)
+# --------------------------------------------------
+def _read_segment(path: str, start: int, end: int) -> str:
+    """
+    Read the lines that begin inside [start, end).
+    A line straddling a boundary belongs to the segment it starts in.
+    """
+    lines = []
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                f.readline()  # finish the line owned by the previous segment
+
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+
+    return b"".join(lines).decode("utf-8", errors="replace")
+
+
+def _shingles(text: str) -> Iterable[int]:
+    words = text.lower().split()
+    if len(words) < _SHINGLE_SIZE:
+        words = words or [""]
+        grams = [" ".join(words)]
+    else:
+        grams = (
+            " ".join(words[i:i + _SHINGLE_SIZE])
+            for i in range(len(words) - _SHINGLE_SIZE + 1)
+        )
+
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        for g in grams
+    }
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    MinHash signature over word 5-gram shingles.
+    """
+    hashes = _shingles(text)
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def _chunk_segment(task: Tuple[str, str, int, int]) -> Tuple[int, int, List[tuple]]:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    path, source, start, end = task
+    text = _read_segment(path, start, end)
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=KB_CHUNK_SIZE,
+        chunk_overlap=KB_CHUNK_OVERLAP
+    )
+
+    chunks = [
+        (chunk, {"source": source, "offset": start}, minhash_signature(chunk))
+        for chunk in splitter.split_text(text)
+        if chunk.strip()
+    ]
+    return start, end - start, chunks
+
+
+# --------------------------------------------------
+# Near-Duplicate Index (LSH banding)
+# --------------------------------------------------
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures.
+    Bands propose candidates; the estimated Jaccard similarity decides.
+    """
+
+    def __init__(self, bands: int = KB_LSH_BANDS, threshold: float = KB_DEDUP_THRESHOLD):
+        self.bands = bands
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._signatures: List[Tuple[int, ...]] = []
+
+    def add_if_new(self, signature: Tuple[int, ...]) -> bool:
+        rows = len(signature) // self.bands
+        keys = [
+            (band, signature[band * rows:(band + 1) * rows])
+            for band in range(self.bands)
+        ]
+
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        for idx in candidates:
+            other = self._signatures[idx]
+            matches = sum(1 for x, y in zip(signature, other) if x == y)
+            if matches / len(signature) >= self.threshold:
+                return False
+
+        idx = len(self._signatures)
+        self._signatures.append(signature)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(idx)
+        return True
+
+
+# --------------------------------------------------
+# Pipeline
+# --------------------------------------------------
+def _bounded_map(executor, fn, tasks: Iterator, window: int) -> Iterator:
+    """
+    Ordered map that keeps at most `window` tasks in flight.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    for future in pending:
+        yield future.result()
+
+
+def ingest_knowledge_base(
+    root: str,
+    embeddings,
+    workers: Optional[int] = None,
+    batch_size: int = KB_EMBED_BATCH_SIZE,
+):
+    """
+    Stream the knowledge base into a FAISS store.
+
+    Files are chunked in worker processes, near-duplicate chunks are
+    dropped before embedding, and embeddings are computed in bounded
+    batches. Returns (vector_store, IngestReport).
+    """
+    from langchain_community.vectorstores import FAISS
+
+    workers = workers or KB_INGEST_WORKERS or os.cpu_count() or 1
+    report = IngestReport()
+    dedup = NearDuplicateIndex()
+    vector_store = None
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+
+    def flush():
+        nonlocal vector_store
+        if not batch:
+            return
+        texts = [text for text, _ in batch]
+        metadatas = [meta for _, meta in batch]
+        with EMBEDDING_SECONDS.time():
+            vectors = embeddings.embed_documents(texts)
+
+        if vector_store is None:
+            vector_store = FAISS.from_embeddings(
+                list(zip(texts, vectors)), embeddings, metadatas=metadatas
+            )
+        else:
+            vector_store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+
+        report.embed_batches += 1
+        batch.clear()
+
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        segments = _iter_segments(root, KB_SEGMENT_BYTES)
+        for start, size, chunks in _bounded_map(executor, _chunk_segment, segments, workers * 2):
+            report.segments += 1
+            report.bytes_read += size
+            if start == 0:
+                report.files += 1
+
+            for text, metadata, signature in chunks:
+                report.chunks_total += 1
+
+                if not dedup.add_if_new(signature):
+                    report.duplicates_dropped += 1
+                    continue
+
+                report.chunks_kept += 1
+                batch.append((text, metadata))
+                if len(batch) >= batch_size:
+                    flush()
+
+    flush()
+    report.elapsed_seconds = round(time.perf_counter() - started, 4)
+
+    if vector_store is None:
+        raise RuntimeError("No knowledge files found in knowledge_base")
+
+    logger.info(f"Knowledge ingest report: {json.dumps(report.to_dict())}")
+    return vector_store, report
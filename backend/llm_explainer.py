@@ -1,24 +1,151 @@
 import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
 import logging
-from typing import Dict, Any, List
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, List, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
+import httpx
 
 # Local imports (works when running from backend/)
 from backend.rag_engine import SecurityRAGEngine
+from backend.policy_analyzer import PolicyRiskAnalyzer
+from backend.explanation_cache import ExplanationCache, CacheStats, prompt_fingerprint
+from backend.explain_scheduler import (
+    BudgetExhausted,
+    ExplainBudget,
+    WorkItem,
+    model_tier,
+    plan_groups,
+    severity_of,
+    severity_rank,
+    TIER_ECONOMY,
+)
+from backend.utils.tokens import count_tokens, truncate_to_tokens
+from backend.utils.metrics import LLM_CALL_SECONDS
+from backend.utils.constants import (
+    LLM_MODEL,
+    LLM_MODEL_ECONOMY,
+    LLM_MAX_TOKENS,
+    LLM_TEMPERATURE,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_TIMEOUT,
+    LLM_CALL_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    EXPLAIN_CONCURRENCY,
+    EXPLAIN_BATCH_SIZE,
+    EXPLAIN_CONTEXT_TOKEN_BUDGET,
+)
 
-# --------------------------------------------------
-# Environment & Logging
-# --------------------------------------------------
-load_dotenv()
+# The OpenAI SDK and langchain are only needed for real (not injected)
+# models, and take most of a second to import
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+# Prompts never carry real role/policy names so explanations can be cached
+# across roles; the names are substituted into the model's answer instead.
+ROLE_PLACEHOLDER = "<ROLE_NAME>"
+POLICY_PLACEHOLDER = "<POLICY_NAME>"
+PROMPT_VERSION = 3
+
+FALLBACK_EXPLANATION = (
+    "Unable to generate explanation due to an internal error. "
+    "Please review this finding manually."
+)
+
+DEFERRED_EXPLANATION = (
+    "Explanation deferred: the per-scan AI budget was exhausted before "
+    "this finding was reached. Re-run the explanation to process it."
+)
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS
+    )
+
+
+def build_http_client() -> httpx.Client:
+    """
+    Keep-alive HTTP client shared by the chat model and the embeddings.
+    """
+    return httpx.Client(limits=_http_limits(), timeout=LLM_HTTP_TIMEOUT)
+
+
+def build_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=_http_limits(), timeout=LLM_HTTP_TIMEOUT)
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    # Without the SDK loaded the error cannot be one of its exceptions
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(exc, openai.RateLimitError)
+
+
+@contextmanager
+def _llm_call_timer(llm):
+    """
+    Record one LLM request in the llm_call_seconds histogram.
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    except Exception as exc:
+        outcome = "rate_limited" if _is_rate_limited(exc) else "error"
+        raise
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        LLM_CALL_SECONDS.observe(
+            time.perf_counter() - started,
+            model=getattr(llm, "model_name", type(llm).__name__),
+            outcome=outcome
+        )
+
+
+class _PlaceholderStream:
+    """
+    Substitutes role/policy placeholders in streamed text. A trailing
+    fragment that could still grow into a placeholder is held back until
+    the next delta (or flush) decides it.
+    """
+
+    def __init__(self, role_name: str, policy_name: str):
+        self._names = {ROLE_PLACEHOLDER: role_name, POLICY_PLACEHOLDER: policy_name}
+        self._buffer = ""
+
+    def feed(self, delta: str) -> str:
+        self._buffer += delta
+        for placeholder, name in self._names.items():
+            self._buffer = self._buffer.replace(placeholder, name)
+
+        cut = self._buffer.rfind("<")
+        if cut != -1 and any(p.startswith(self._buffer[cut:]) for p in self._names):
+            out, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        else:
+            out, self._buffer = self._buffer, ""
+        return out
+
+    def flush(self) -> str:
+        out, self._buffer = self._buffer, ""
+        return out
+
 
 class SecurityLLMExplainer:
     """
@@ -26,20 +153,76 @@ class SecurityLLMExplainer:
     Uses RAG for grounding and enforces strict security constraints.
     """
 
-    def __init__(self):
-        self._validate_env()
+    def __init__(
+        self,
+        llm=None,
+        rag: Optional[SecurityRAGEngine] = None,
+        cache: Optional[ExplanationCache] = None,
+        economy_llm=None
+    ):
+        """
+        `llm`, `economy_llm`, `rag` and `cache` may be injected (tests,
+        benchmarks); otherwise OpenAI-backed clients are built sharing
+        one pooled HTTP client. `economy_llm` serves LOW/MEDIUM findings
+        and defaults to `llm` when that is injected.
+        """
+        self.http_client: Optional[httpx.Client] = None
+        self.http_async_client: Optional[httpx.AsyncClient] = None
+
+        if llm is None or rag is None:
+            self._validate_env()
+            self.http_client = build_http_client()
+            self.http_async_client = build_async_http_client()
 
         # LLM configuration (cost-safe + deterministic)
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            max_tokens=800
-        )
+        self.llm = llm or self._chat_model(LLM_MODEL)
+        self.economy_llm = economy_llm or llm or self._chat_model(LLM_MODEL_ECONOMY)
 
         # RAG engine (shared knowledge base)
-        self.rag = SecurityRAGEngine()
+        self.rag = rag or SecurityRAGEngine(http_client=self.http_client)
         self.rag.build_or_load_knowledge_base()
 
+        # Explanation cache (memory LRU + on-disk TTL tier)
+        self.cache = cache or ExplanationCache()
+
+    # --------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Precompute retrieval contexts for every finding type the analyzer
+        emits. The embedding round trips also open pooled connections.
+        """
+        started = time.perf_counter()
+
+        for title in PolicyRiskAnalyzer.FINDING_TITLES:
+            self.rag.retrieve_context(query=self._context_query(title))
+
+        return {
+            "contexts_cached": len(PolicyRiskAnalyzer.FINDING_TITLES),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+
+    def _chat_model(self, model: str) -> "ChatOpenAI":
+        from langchain_openai import ChatOpenAI
+
+        # Client retries are disabled: _ainvoke applies jittered backoff itself
+        return ChatOpenAI(
+            model=model,
+            temperature=LLM_TEMPERATURE,
+            max_tokens=LLM_MAX_TOKENS,
+            max_retries=0,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client
+        )
+
+    async def aclose(self):
+        self.cache.close()
+        if self.http_client is not None:
+            self.http_client.close()
+        if self.http_async_client is not None:
+            await self.http_async_client.aclose()
+
     # --------------------------------------------------
     # Validation
     # --------------------------------------------------
@@ -54,49 +237,634 @@ class SecurityLLMExplainer:
         self,
         role_name: str,
         policy_name: str,
-        findings: List[Dict[str, Any]]
+        findings: List[Dict[str, Any]],
+        stats: Optional[CacheStats] = None
     ) -> Dict[str, Any]:
         """
         Explain IAM findings using RAG + LLM safely.
         """
 
         if not findings:
-            return {
-                "summary": "No security risks detected.",
-                "details": [],
-                "recommended_policy": None
-            }
+            return self._no_findings_result()
 
         explanations = []
 
         for finding in findings:
             try:
-                context = self.rag.retrieve_context(
-                    query=f"{finding['title']} IAM security risk"
+                chunks = self.rag.retrieve_chunks(
+                    query=self._context_query(finding["title"])
                 )
 
-                prompt = self._build_prompt(
-                    role_name=role_name,
-                    policy_name=policy_name,
-                    finding=finding,
-                    context=context
-                )
+                key = self._cache_key(finding, "\n\n".join(chunks))
+                text = self.cache.get(key, stats)
 
-                response = self.llm.invoke(prompt).content
+                if text is None:
+                    prompt = self._build_prompt(
+                        role_name=ROLE_PLACEHOLDER,
+                        policy_name=POLICY_PLACEHOLDER,
+                        finding=finding,
+                        context=self._fit_context(chunks)
+                    )
+                    llm = self._llm_for(finding)
+                    with _llm_call_timer(llm):
+                        message = llm.invoke(prompt)
+                    text = message.content
+                    self.cache.put(key, text, self._tokens_used(prompt, message))
+
+                response = self._personalize(text, role_name, policy_name)
 
             except Exception as e:
                 logger.error(f"LLM/RAG error for finding {finding.get('id')}: {e}")
-                response = (
-                    "Unable to generate explanation due to an internal error. "
-                    "Please review this finding manually."
+                response = FALLBACK_EXPLANATION
+
+            explanations.append(self._detail(finding, response))
+
+        return self._findings_result(role_name, policy_name, findings, explanations)
+
+    async def aexplain_findings(
+        self,
+        role_name: str,
+        policy_name: str,
+        findings: List[Dict[str, Any]],
+        limiter: Optional[asyncio.Semaphore] = None,
+        stats: Optional[CacheStats] = None,
+        batch_size: Optional[int] = 1,
+        budget: Optional[ExplainBudget] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of explain_findings for a single policy.
+        """
+        results = await self.aexplain_policies(
+            [{"role_name": role_name, "policy_name": policy_name, "findings": findings}],
+            limiter=limiter,
+            stats=stats,
+            batch_size=batch_size,
+            budget=budget
+        )
+        return results[0]
+
+    async def aexplain_policies(
+        self,
+        items: List[Dict[str, Any]],
+        limiter: Optional[asyncio.Semaphore] = None,
+        stats: Optional[CacheStats] = None,
+        batch_size: Optional[int] = EXPLAIN_BATCH_SIZE,
+        budget: Optional[ExplainBudget] = None,
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Explain many policies at once. Each item holds `role_name`,
+        `policy_name` and `findings`; one result per item, in order.
+
+        Findings are resolved from the cache first. The remaining unique
+        prompts are scheduled CRITICAL-first and sent `batch_size` per LLM
+        request (1 = one request per finding, None = one request per
+        policy), concurrently under `limiter`, which is meant to be shared
+        across a whole scan. Work refused by `budget` is reported in each
+        result's `deferred` list.
+
+        `on_result(index, result)` fires as soon as every finding of an
+        item is resolved, so callers can publish partial results.
+        """
+        limiter = limiter or asyncio.Semaphore(EXPLAIN_CONCURRENCY)
+
+        titles = list(dict.fromkeys(
+            finding["title"] for item in items for finding in item["findings"]
+        ))
+        chunk_lists = await asyncio.gather(*(
+            self._aretrieve(title, limiter) for title in titles
+        ))
+        chunks_by_title = dict(zip(titles, chunk_lists))
+
+        # Resolve every finding to a cache key; collect unique misses
+        keys_per_item: List[List[Optional[str]]] = []
+        texts: Dict[str, str] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        groups: List[List[WorkItem]] = []
+
+        for item in items:
+            item_keys = []
+            item_pending = []
+
+            for finding in item["findings"]:
+                chunks = chunks_by_title[finding["title"]]
+                if chunks is None:
+                    item_keys.append(None)
+                    continue
+
+                key = self._cache_key(finding, "\n\n".join(chunks))
+                item_keys.append(key)
+
+                if key in texts or key in pending:
+                    if stats:
+                        stats.lookups += 1
+                        stats.deduplicated += 1
+                    continue
+
+                cached = await self.cache.aget(key, stats)
+                if cached is not None:
+                    texts[key] = cached
+                    continue
+
+                pending[key] = {"finding": finding, "chunks": chunks}
+                item_pending.append((key, pending[key]))
+
+            keys_per_item.append(item_keys)
+            if item_pending:
+                groups.append(item_pending)
+
+        deferred = set()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        waiting = [
+            {key for key in item_keys if key in pending}
+            for item_keys in keys_per_item
+        ]
+        items_by_key: Dict[str, List[int]] = {}
+        for index, item_waiting in enumerate(waiting):
+            for key in item_waiting:
+                items_by_key.setdefault(key, []).append(index)
+
+        def publish(index: int):
+            results[index] = self._assemble(items[index], keys_per_item[index], texts, deferred)
+            if on_result:
+                on_result(index, results[index])
+
+        for index, item_waiting in enumerate(waiting):
+            if not item_waiting:
+                publish(index)
+
+        # Tasks reach the limiter in creation order, i.e. severity order
+        tasks = [
+            asyncio.ensure_future(self._aexplain_group(group, limiter, budget))
+            for group in plan_groups(groups, batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                group_texts, group_deferred, group_keys = await next_done
+                texts.update(group_texts)
+                deferred.update(group_deferred)
+
+                for key in group_keys:
+                    for index in items_by_key.get(key, ()):
+                        waiting[index].discard(key)
+                        if not waiting[index]:
+                            publish(index)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return results
+
+    def _assemble(
+        self,
+        item: Dict[str, Any],
+        item_keys: List[Optional[str]],
+        texts: Dict[str, str],
+        deferred: set
+    ) -> Dict[str, Any]:
+        """
+        Per-policy result in the legacy explain_findings shape.
+        """
+        if not item["findings"]:
+            return self._no_findings_result()
+
+        explanations = []
+        item_deferred = []
+
+        for finding, key in zip(item["findings"], item_keys):
+            if key in deferred:
+                text = DEFERRED_EXPLANATION
+                item_deferred.append(finding.get("id"))
+            else:
+                text = texts.get(key) or FALLBACK_EXPLANATION
+
+            explanations.append(self._detail(
+                finding,
+                self._personalize(text, item["role_name"], item["policy_name"])
+            ))
+
+        result = self._findings_result(
+            item["role_name"], item["policy_name"], item["findings"], explanations
+        )
+        result["deferred"] = item_deferred
+        return result
+
+    # --------------------------------------------------
+    # Streaming
+    # --------------------------------------------------
+    async def astream_policies(
+        self,
+        items: List[Dict[str, Any]],
+        limiter: Optional[asyncio.Semaphore] = None,
+        budget: Optional[ExplainBudget] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream explanation tokens for every finding of `items`.
+
+        Findings run concurrently (CRITICAL first) and their events are
+        multiplexed into one sequence. Every event carries the finding's
+        stream id "<item index>.<finding index>":
+        finding_start -> token* -> finding_end, then a final done event.
+        Cached explanations arrive as a single token event.
+        """
+        limiter = limiter or asyncio.Semaphore(EXPLAIN_CONCURRENCY)
+        queue: asyncio.Queue = asyncio.Queue()
+        producers: Dict[str, asyncio.Future] = {}
+
+        work = sorted(
+            (
+                (f"{i}.{j}", item, finding)
+                for i, item in enumerate(items)
+                for j, finding in enumerate(item["findings"])
+            ),
+            key=lambda entry: severity_rank(entry[2])
+        )
+
+        async def run(stream_id: str, item: Dict[str, Any], finding: Dict[str, Any]):
+            try:
+                await self._astream_finding(stream_id, item, finding, queue, producers, limiter, budget)
+            finally:
+                queue.put_nowait(None)
+
+        tasks = [asyncio.ensure_future(run(*entry)) for entry in work]
+        remaining = len(tasks)
+
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield {"event": "done", "findings": len(work)}
+
+    async def _astream_finding(
+        self,
+        stream_id: str,
+        item: Dict[str, Any],
+        finding: Dict[str, Any],
+        queue: asyncio.Queue,
+        producers: Dict[str, asyncio.Future],
+        limiter: asyncio.Semaphore,
+        budget: Optional[ExplainBudget]
+    ) -> None:
+        role_name, policy_name = item["role_name"], item["policy_name"]
+        substitute = _PlaceholderStream(role_name, policy_name)
+
+        def emit(event: str, **data):
+            queue.put_nowait({"event": event, "id": stream_id, **data})
+
+        def relay(delta: str):
+            out = substitute.feed(delta)
+            if out:
+                emit("token", delta=out)
+
+        emit(
+            "finding_start",
+            role=role_name,
+            policy=policy_name,
+            finding_id=finding.get("id"),
+            severity=severity_of(finding),
+            title=finding.get("title")
+        )
+
+        end = {"cached": False, "deferred": False, "error": False}
+        try:
+            chunks = await self._aretrieve(finding["title"], limiter)
+            if chunks is None:
+                raise RuntimeError("context retrieval failed")
+
+            key = self._cache_key(finding, "\n\n".join(chunks))
+            text = await self.cache.aget(key)
+
+            if text is None and key in producers:
+                # Same prompt already streaming for another finding
+                text = await asyncio.shield(producers[key])
+                if isinstance(text, BudgetExhausted):
+                    raise text  # deferred like the finding that streamed it
+                if text is None:
+                    raise RuntimeError("shared generation failed")
+
+            if text is not None:
+                end["cached"] = True
+                emit("token", delta=self._personalize(text, role_name, policy_name))
+            else:
+                producers[key] = asyncio.get_running_loop().create_future()
+                try:
+                    text = await self._astream_generate(finding, chunks, limiter, budget, relay)
+                    await self.cache.aput(key, text, count_tokens(text))
+                except BudgetExhausted as e:
+                    producers[key].set_result(e)
+                    raise
+                finally:
+                    if not producers[key].done():
+                        producers[key].set_result(text)
+
+                tail = substitute.flush()
+                if tail:
+                    emit("token", delta=tail)
+
+        except BudgetExhausted:
+            end["deferred"] = True
+            emit("token", delta=DEFERRED_EXPLANATION)
+
+        except Exception as e:
+            logger.error(f"Streaming error for finding {finding.get('id')}: {e!r}")
+            end["error"] = True
+            emit("token", delta=FALLBACK_EXPLANATION)
+
+        emit("finding_end", **end)
+
+    async def _astream_generate(
+        self,
+        finding: Dict[str, Any],
+        chunks: List[str],
+        limiter: asyncio.Semaphore,
+        budget: Optional[ExplainBudget],
+        on_delta: Callable[[str], None]
+    ) -> str:
+        """
+        Stream one explanation through the chat model's astream
+        interface. Rate limits are retried with jittered backoff as long
+        as no token has been relayed yet.
+        """
+        llm = self._llm_for(finding)
+        prompt = self._build_prompt(
+            role_name=ROLE_PLACEHOLDER,
+            policy_name=POLICY_PLACEHOLDER,
+            finding=finding,
+            context=self._fit_context(chunks)
+        )
+        reserved = 0
+
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            parts: List[str] = []
+            try:
+                async with limiter:
+                    if budget is not None and attempt == 0:
+                        reserved = budget.reserve(count_tokens(prompt) + LLM_MAX_TOKENS)
+
+                    with _llm_call_timer(llm):
+                        stream = llm.astream(prompt).__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(stream.__anext__(), timeout=LLM_CALL_TIMEOUT)
+                            except StopAsyncIteration:
+                                break
+                            delta = str(chunk.content or "")
+                            parts.append(delta)
+                            on_delta(delta)
+
+                text = "".join(parts)
+                if budget is not None:
+                    budget.settle(reserved, count_tokens(prompt) + count_tokens(text))
+                return text
+
+            except BudgetExhausted:
+                raise
+
+            except Exception as exc:
+                if parts or not _is_rate_limited(exc) or attempt == LLM_MAX_RETRIES:
+                    if budget is not None:
+                        budget.release(reserved)
+                    raise
+
+                delay = random.uniform(
+                    0,
+                    min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt)
                 )
+                logger.warning(f"LLM rate limited, retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    # --------------------------------------------------
+    # Async Internals
+    # --------------------------------------------------
+    async def _aretrieve(self, title: str, limiter: asyncio.Semaphore) -> Optional[List[str]]:
+        try:
+            async with limiter:
+                return await asyncio.to_thread(
+                    self.rag.retrieve_chunks,
+                    self._context_query(title)
+                )
+        except Exception as e:
+            logger.error(f"RAG error for finding type {title!r}: {e!r}")
+            return None
+
+    async def _aexplain_group(
+        self,
+        group: List[WorkItem],
+        limiter: asyncio.Semaphore,
+        budget: Optional[ExplainBudget] = None
+    ) -> Tuple[Dict[str, str], List[str], List[str]]:
+        """
+        Generate explanations for a group of unique same-tier findings,
+        caching each success. Unparseable batch answers fall back to one
+        request per missing finding.
+        Returns (texts, deferred keys, all keys of the group).
+        """
+        texts: Dict[str, str] = {}
+        llm = self._llm_for(group[0][1]["finding"])
+
+        if len(group) > 1:
+            try:
+                prompt = self._build_batch_prompt(group)
+                message = await self._ainvoke(prompt, limiter, llm, budget)
+                parsed = self._parse_batch_response(message.content, len(group))
+                tokens = self._tokens_used(prompt, message) // len(group)
 
-            explanations.append({
-                "finding_id": finding.get("id"),
-                "severity": finding.get("severity"),
-                "explanation": response
-            })
+                for (key, _), text in zip(group, parsed):
+                    if text:
+                        texts[key] = text
+                        await self.cache.aput(key, text, tokens)
 
+            except BudgetExhausted:
+                return texts, [key for key, _ in group], [key for key, _ in group]
+
+            except Exception as e:
+                logger.warning(f"Batched explanation of {len(group)} findings failed: {e!r}")
+
+        missing = [(key, work) for key, work in group if key not in texts]
+        if len(group) > 1 and missing:
+            logger.info(f"Falling back to per-finding calls for {len(missing)} findings")
+
+        deferred = []
+        singles = await asyncio.gather(
+            *(self._aexplain_single(key, work, limiter, llm, budget) for key, work in missing),
+            return_exceptions=True
+        )
+        for (key, _), text in zip(missing, singles):
+            if isinstance(text, BudgetExhausted):
+                deferred.append(key)
+            elif isinstance(text, BaseException):
+                # Falls back to FALLBACK_EXPLANATION in _assemble
+                logger.error(f"Explanation failed for finding {key}: {text!r}")
+            elif text is not None:
+                texts[key] = text
+
+        return texts, deferred, [key for key, _ in group]
+
+    async def _aexplain_single(
+        self,
+        key: str,
+        work: Dict[str, Any],
+        limiter: asyncio.Semaphore,
+        llm,
+        budget: Optional[ExplainBudget] = None
+    ) -> Optional[str]:
+        """
+        Returns the explanation or None on failure.
+        Raises BudgetExhausted when the budget refuses the call.
+        """
+        finding = work["finding"]
+
+        try:
+            prompt = self._build_prompt(
+                role_name=ROLE_PLACEHOLDER,
+                policy_name=POLICY_PLACEHOLDER,
+                finding=finding,
+                context=self._fit_context(work["chunks"])
+            )
+            message = await self._ainvoke(prompt, limiter, llm, budget)
+        except BudgetExhausted:
+            raise
+        except Exception as e:
+            logger.error(f"LLM error for finding {finding.get('id')}: {e!r}")
+            return None
+
+        await self.cache.aput(key, message.content, self._tokens_used(prompt, message))
+        return message.content
+
+    async def _ainvoke(
+        self,
+        prompt: str,
+        limiter: asyncio.Semaphore,
+        llm=None,
+        budget: Optional[ExplainBudget] = None
+    ):
+        """
+        One LLM call with a per-attempt timeout and full-jitter
+        exponential backoff on rate limiting. The limiter slot is
+        released while backing off. The budget is charged once the slot
+        is acquired, so reservations follow scheduling order.
+        """
+        llm = llm or self.llm
+        reserved = 0
+
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                async with limiter:
+                    if budget is not None and attempt == 0:
+                        reserved = budget.reserve(count_tokens(prompt) + LLM_MAX_TOKENS)
+
+                    with _llm_call_timer(llm):
+                        message = await asyncio.wait_for(
+                            llm.ainvoke(prompt),
+                            timeout=LLM_CALL_TIMEOUT
+                        )
+
+                if budget is not None:
+                    budget.settle(reserved, self._tokens_used(prompt, message))
+                return message
+
+            except BudgetExhausted:
+                raise
+
+            except Exception as exc:
+                if not _is_rate_limited(exc) or attempt == LLM_MAX_RETRIES:
+                    if budget is not None:
+                        budget.release(reserved)
+                    raise
+
+                delay = random.uniform(
+                    0,
+                    min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt)
+                )
+                logger.warning(f"LLM rate limited, retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def _llm_for(self, finding: Dict[str, Any]):
+        return self.economy_llm if model_tier(finding) == TIER_ECONOMY else self.llm
+
+    def _fit_context(self, chunks: List[str]) -> str:
+        """
+        Keep whole chunks, in retrieval order and without duplicates,
+        until the per-call context token budget is reached. A first chunk
+        larger than the budget is truncated rather than dropped.
+        """
+        kept = []
+        remaining = EXPLAIN_CONTEXT_TOKEN_BUDGET
+
+        for chunk in dict.fromkeys(chunks):
+            tokens = count_tokens(chunk)
+            if tokens > remaining:
+                if not kept:
+                    kept.append(truncate_to_tokens(chunk, remaining))
+                break
+            kept.append(chunk)
+            remaining -= tokens
+
+        return "\n\n".join(kept)
+
+    # --------------------------------------------------
+    # Caching
+    # --------------------------------------------------
+    def _cache_key(self, finding: Dict[str, Any], context: str) -> str:
+        return prompt_fingerprint(
+            prompt_version=PROMPT_VERSION,
+            title=finding.get("title"),
+            severity=finding.get("severity"),
+            description=finding.get("description"),
+            context=context,
+            model=getattr(self._llm_for(finding), "model_name", type(self.llm).__name__),
+            temperature=getattr(self._llm_for(finding), "temperature", None),
+            knowledge_version=self.rag.knowledge_version,
+            context_budget=EXPLAIN_CONTEXT_TOKEN_BUDGET
+        )
+
+    @staticmethod
+    def _personalize(text: str, role_name: str, policy_name: str) -> str:
+        return (
+            text.replace(ROLE_PLACEHOLDER, role_name)
+            .replace(POLICY_PLACEHOLDER, policy_name)
+        )
+
+    @staticmethod
+    def _tokens_used(prompt: str, message) -> int:
+        usage = getattr(message, "usage_metadata", None)
+        if usage and usage.get("total_tokens"):
+            return usage["total_tokens"]
+        return count_tokens(prompt) + count_tokens(str(message.content))
+
+    # --------------------------------------------------
+    # Result Assembly
+    # --------------------------------------------------
+    @staticmethod
+    def _no_findings_result() -> Dict[str, Any]:
+        return {
+            "summary": "No security risks detected.",
+            "details": [],
+            "recommended_policy": None
+        }
+
+    @staticmethod
+    def _detail(finding: Dict[str, Any], explanation: str) -> Dict[str, Any]:
+        return {
+            "finding_id": finding.get("id"),
+            "severity": finding.get("severity"),
+            "explanation": explanation
+        }
+
+    def _findings_result(
+        self,
+        role_name: str,
+        policy_name: str,
+        findings: List[Dict[str, Any]],
+        explanations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         recommended_policy = self._generate_secure_policy(
             role_name=role_name,
             policy_name=policy_name,
@@ -112,6 +880,10 @@ class SecurityLLMExplainer:
     # --------------------------------------------------
     # Prompt Engineering (STRICT & SAFE)
     # --------------------------------------------------
+    @staticmethod
+    def _context_query(title: str) -> str:
+        return f"{title} IAM security risk"
+
     def _build_prompt(
         self,
         role_name: str,
@@ -132,6 +904,7 @@ STRICT RULES:
 - Do NOT recommend wildcard actions.
 - Do NOT output IAM policy JSON or code.
 - Be factual, concise, and security-focused.
+- Refer to the role and policy only by the names given below.
 
 IAM ROLE: {role_name}
 POLICY NAME: {policy_name}
@@ -151,6 +924,77 @@ Explain:
 3. High-level mitigation strategy (no code)
 """
 
+    def _build_batch_prompt(self, group: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        One constrained prompt for several findings. Rules and shared
+        context appear once; answers come back as JSON keyed by id.
+        """
+
+        context = self._fit_context(
+            [chunk for _, work in group for chunk in work["chunks"]]
+        )
+
+        findings = "\n".join(
+            f"[F{i}] Title: {work['finding'].get('title')} | "
+            f"Severity: {work['finding'].get('severity')} | "
+            f"Description: {work['finding'].get('description')}"
+            for i, (_, work) in enumerate(group, start=1)
+        )
+
+        return f"""
+You are a senior cloud security engineer.
+
+STRICT RULES:
+- Use ONLY the provided security context.
+- Do NOT invent permissions.
+- Do NOT recommend wildcard actions.
+- Do NOT output IAM policy JSON or code.
+- Be factual, concise, and security-focused.
+- Refer to the role and policy only by the names given below.
+
+IAM ROLE: {ROLE_PLACEHOLDER}
+POLICY NAME: {POLICY_PLACEHOLDER}
+
+SECURITY FINDINGS:
+{findings}
+
+SECURITY CONTEXT:
+{context}
+
+TASK:
+For EACH finding explain:
+1. Why this configuration is dangerous
+2. What real-world impact it can cause
+3. High-level mitigation strategy (no code)
+
+OUTPUT FORMAT:
+Respond with JSON only, exactly:
+{{"explanations": [{{"id": "F1", "explanation": "..."}}, ...]}}
+with one entry per finding id.
+"""
+
+    @staticmethod
+    def _parse_batch_response(content: str, expected: int) -> List[Optional[str]]:
+        """
+        Map a batched JSON answer back to finding order.
+        Ids that are missing or empty come back as None.
+        """
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        if not match:
+            raise ValueError("No JSON object in batched response")
+
+        entries = json.loads(match.group(0)).get("explanations", [])
+        by_id = {
+            str(entry.get("id", "")).strip().upper(): entry.get("explanation")
+            for entry in entries
+            if isinstance(entry, dict)
+        }
+
+        return [
+            text if isinstance(text, str) and text.strip() else None
+            for text in (by_id.get(f"F{i}") for i in range(1, expected + 1))
+        ]
+
     # --------------------------------------------------
     # Secure Policy Generator (DETERMINISTIC)
     # --------------------------------------------------
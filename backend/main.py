@@ -1,29 +1,103 @@
+import time
 import uuid
+import asyncio
+from contextlib import asynccontextmanager, aclosing
 from datetime import datetime
-from typing import Dict, Any
-from threading import Lock
+import os
+from typing import Dict, Any, List, Optional, Set
+from threading import Event
 
-from fastapi import FastAPI, HTTPException, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, status, Request, Response, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse, FileResponse
 from pydantic import BaseModel, Field
+from dotenv import load_dotenv
 
 # Application imports (assumes backend/ is the working directory or PYTHONPATH)
-from backend.services.scan_service import run_iam_scan
-from backend.services.explain_service import explain_scan_results
-from backend.schemas.explain_response import ExplainResponse
-from backend.utils.logger import get_logger
+from backend.aws_scanner import ScanCancelled
+from backend.services.scan_service import run_iam_scan, scan_key
+from backend.services.scan_scheduler import ScanScheduler, QueueFull
+from backend.services.iam_events import create_event_consumer, QueueEventSource
+from backend.services.scan_progress import ScanProgress, TERMINAL_STATUSES, job_state
+from backend.job_store import create_job_store
+from backend.result_sink import spilled_roles
+from backend.services.scan_query import (
+    summarize_scan,
+    query_roles,
+    findings_table,
+    completed_results,
+    job_revision,
+    compute_etag,
+    etag_matches,
+)
+from backend.services.findings_index import build_index, get_index
+from backend.services.scan_export import (
+    EXPORT_TABLES,
+    export_available,
+    scan_tables,
+    iter_arrow_stream,
+    parquet_bytes,
+    write_parquet_dataset,
+)
+from backend.services.scan_diff import store_fingerprint, get_fingerprint, iter_diff, diff_scans, diff_summary
+from backend.services.explain_service import (
+    explain_scan_results_async,
+    stream_scan_explanations,
+    warm_up_explainer,
+    shutdown_explainer,
+    explainer_state,
+)
+from backend.utils.logger import get_logger, configure_logging
+from backend.utils.sse import format_sse, SSE_HEADERS
+from backend.utils.serialization import cached_body, negotiate_encoding, dumps
+from backend.utils.profiler import SamplingProfiler, save_profile, profile_path
+from backend.utils.timing import StageTimings
+from backend.utils.metrics import (
+    REGISTRY,
+    PROMETHEUS_CONTENT_TYPE,
+    HTTP_REQUEST_SECONDS,
+    SCAN_JOB_SECONDS,
+)
 from backend.utils.constants import (
     APP_NAME,
     APP_VERSION,
+    JOB_STATUS_PENDING,
     JOB_STATUS_IN_PROGRESS,
     JOB_STATUS_COMPLETED,
     JOB_STATUS_FAILED,
+    JOB_STATUS_CANCELLED,
+    SCAN_PAGE_MAX_LIMIT,
+    SCAN_DEFAULT_PRIORITY,
+    SCAN_EVENTS_KEEPALIVE,
 )
 # --------------------------------------------------
-# Logging
+# Environment & Logging
 # --------------------------------------------------
+# Done here, by the entry point, not as a side effect of importing
+# the scanner or the AI modules
+load_dotenv()
+configure_logging()
 logger = get_logger(APP_NAME)
 
+# --------------------------------------------------
+# Lifespan (scan workers + shared AI stack)
+# --------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scan_scheduler.start()
+    iam_event_consumer.start()
+    # Warm in the background so /health and /scan are served immediately
+    warm_task = asyncio.create_task(asyncio.to_thread(warm_up_explainer))
+    yield
+    for task in list(explain_tasks.values()):
+        task.cancel()
+    await asyncio.to_thread(scan_scheduler.stop)
+    await asyncio.to_thread(iam_event_consumer.stop)
+    await warm_task
+    await shutdown_explainer()
+    jobs_db.close()
+
+
 # --------------------------------------------------
 # FastAPI App
 # --------------------------------------------------
@@ -31,6 +105,7 @@ app = FastAPI(
     title="AI-Powered Cloud Security Copilot",
     description="Enterprise-grade AWS IAM security analysis using AI + RAG",
     version=APP_VERSION,
+    lifespan=lifespan,
 )
 
 # --------------------------------------------------
@@ -43,11 +118,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+
+    # Label by route template so per-job URLs share one series
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+    return response
+
 # --------------------------------------------------
-# In-Memory Job Store (Demo / Portfolio)
+# Job Stores
 # --------------------------------------------------
-jobs_db: Dict[str, Dict[str, Any]] = {}
-jobs_lock = Lock()
+# Scan jobs: SQLite by default, so results survive restarts and are
+# visible to every uvicorn worker (JOB_STORE_BACKEND=memory for demos)
+jobs_db = create_job_store()
+
+# Explanation jobs run as tasks on the event loop and are only touched
+# from async endpoints, so they need no lock.
+explain_jobs_db: Dict[str, Dict[str, Any]] = {}
+explain_tasks: Dict[str, asyncio.Task] = {}
+explanations_by_scan: Dict[str, str] = {}  # scan_id -> latest explain job_id
+
+# Live scan status and progress, pushed to /scan/{job_id}/events
+scan_progress = ScanProgress()
+
+# IAM change events patch the latest completed scan (IAM_EVENTS_FILE or POST /events/iam)
+iam_event_consumer = create_event_consumer(jobs_db)
+
+# Jobs to run under the sampling profiler (opt-in per request)
+profiled_jobs: Set[str] = set()
 
 # --------------------------------------------------
 # Schemas
@@ -61,33 +168,170 @@ class ScanJobStatus(BaseModel):
 
 class ExplainRequest(BaseModel):
     scan_id: str = Field(..., description="Completed scan job ID")
+    refresh: bool = Field(
+        default=False,
+        description="Recompute even if an explanation for this scan exists"
+    )
+    profile: bool = Field(
+        default=False,
+        description="Run under the sampling profiler; download from /explain/{job_id}/profile"
+    )
+
+
+class ExplainJobStatus(BaseModel):
+    job_id: str
+    scan_id: str
+    status: str
+    message: str
+    created_at: datetime
 
 
 # --------------------------------------------------
 # Background Worker
 # --------------------------------------------------
-def run_scan_task(job_id: str) -> None:
+def run_scan_task(job_id: str, cancel_event: Event, queue_wait: float) -> None:
+    started = time.perf_counter()
+    final_status, error = JOB_STATUS_FAILED, None
+    profiler = SamplingProfiler() if job_id in profiled_jobs else None
+    timings = StageTimings()
+
+    def on_progress(stage: str, done: int, total: Optional[int]) -> None:
+        scan_progress.publish(job_id, stage=stage, roles_done=done, roles_total=total)
+
+    def stage(name: str):
+        scan_progress.publish(job_id, stage=name)
+        return timings.measure(name)
+
     try:
-        logger.info(f"[SCAN STARTED] job_id={job_id}")
+        logger.info(f"[SCAN STARTED] job_id={job_id} queue_wait={queue_wait:.2f}s")
+        jobs_db.update(job_id, status=JOB_STATUS_IN_PROGRESS)
+        scan_progress.publish(job_id, status=JOB_STATUS_IN_PROGRESS, stage="starting")
+        if profiler:
+            profiler.start()
 
-        results = run_iam_scan()
+        results = run_iam_scan(cancel_event=cancel_event, on_progress=on_progress, job_id=job_id)
+        metadata = results["scan_metadata"]
+        spilled = spilled_roles(results)
 
-        with jobs_lock:
-            jobs_db[job_id].update(
-                {
-                    "status": JOB_STATUS_COMPLETED,
-                    "data": results,
-                    "finished_at": datetime.utcnow(),
-                }
-            )
+        if spilled is not None:
+            # Counted while the roles streamed to disk; the index is
+            # built on first use instead of holding every role now
+            summary = spilled.summary.to_dict()
+            metadata["spilled_roles"] = {"roles": len(spilled), "bytes": spilled.segment_bytes}
+        else:
+            with stage("index"):
+                index = build_index(job_id, results)
+            with stage("summarize"):
+                summary = summarize_scan(results)
+            metadata["index_build_seconds"] = index.stats["build_seconds"]
+
+        metadata["queue_wait_seconds"] = round(queue_wait, 3)
+        metadata["timings"] = {**metadata.get("timings", {}), **timings.to_dict()}
 
+        # The result blob is written first; its store and fingerprint times
+        # can only be reported in the job summary, which flips the job to completed
+        with stage("store"):
+            jobs_db.update(job_id, data=results)
+        # Per-role content hashes for /scan/{a}/diff/{b}
+        with stage("fingerprint"):
+            store_fingerprint(jobs_db, job_id, results)
+
+        jobs_db.update(
+            job_id,
+            status=JOB_STATUS_COMPLETED,
+            summary={**summary, "timings": {**metadata["timings"], **timings.to_dict()}},
+            finished_at=datetime.utcnow(),
+        )
+
+        final_status = JOB_STATUS_COMPLETED
         logger.info(f"[SCAN COMPLETED] job_id={job_id}")
 
+    except ScanCancelled:
+        final_status = JOB_STATUS_CANCELLED
+        logger.info(f"[SCAN CANCELLED] job_id={job_id}")
+        jobs_db.update(job_id, status=JOB_STATUS_CANCELLED, finished_at=datetime.utcnow())
+
     except Exception as exc:
         logger.exception(f"[SCAN FAILED] job_id={job_id}")
-        with jobs_lock:
-            jobs_db[job_id]["status"] = JOB_STATUS_FAILED
-            jobs_db[job_id]["error"] = str(exc)
+        error = str(exc)
+        jobs_db.update(
+            job_id,
+            status=JOB_STATUS_FAILED,
+            error=error,
+            finished_at=datetime.utcnow(),
+        )
+
+    finally:
+        # Published after the store update so subscribers can fetch results
+        scan_progress.publish(job_id, status=final_status, stage=None, error=error)
+        SCAN_JOB_SECONDS.observe(time.perf_counter() - started, status=final_status)
+        if profiler:
+            profiler.stop()
+            save_profile(profiler, "scan", job_id)
+            profiled_jobs.discard(job_id)
+
+
+# Bounded scan worker pool; identical in-flight scans coalesce
+scan_scheduler = ScanScheduler(run_scan_task)
+
+
+async def run_explain_task(job_id: str, scan_data: Dict[str, Any]) -> None:
+    job = explain_jobs_db[job_id]
+
+    def on_result(index: int, total: int, entry: Dict[str, Any]) -> None:
+        job["partial"][index] = entry
+        job["progress"] = {"policies_total": total, "policies_done": len(job["partial"])}
+
+    # Samples the event loop thread, so concurrent requests show up too
+    profiler = SamplingProfiler() if job_id in profiled_jobs else None
+
+    try:
+        logger.info(f"[EXPLAIN STARTED] job_id={job_id} scan_id={job['scan_id']}")
+        if profiler:
+            profiler.start()
+
+        result = await explain_scan_results_async(scan_data, on_result=on_result)
+
+        job.update(
+            {
+                "status": JOB_STATUS_COMPLETED,
+                "results": result["results"],
+                "summary": result.get("summary"),
+                "progress": {
+                    "policies_total": len(result["results"]),
+                    "policies_done": len(result["results"]),
+                },
+                "finished_at": datetime.utcnow(),
+            }
+        )
+        job["partial"].clear()
+
+        logger.info(f"[EXPLAIN COMPLETED] job_id={job_id}")
+
+    except asyncio.CancelledError:
+        logger.info(f"[EXPLAIN CANCELLED] job_id={job_id}")
+        job.update({"status": JOB_STATUS_CANCELLED, "finished_at": datetime.utcnow()})
+
+    except Exception as exc:
+        logger.exception(f"[EXPLAIN FAILED] job_id={job_id}")
+        job.update({"status": JOB_STATUS_FAILED, "error": str(exc)})
+
+    finally:
+        explain_tasks.pop(job_id, None)
+        if profiler:
+            profiler.stop()
+            await asyncio.to_thread(save_profile, profiler, "explain", job_id)
+            profiled_jobs.discard(job_id)
+
+
+def _explain_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    view = {key: value for key, value in job.items() if key != "partial"}
+
+    # While running, expose finished policies in scan order
+    if job["status"] != JOB_STATUS_COMPLETED:
+        view["results"] = [job["partial"][index] for index in sorted(job["partial"])]
+
+    return view
 
 
 # --------------------------------------------------
@@ -102,36 +346,133 @@ def health_check():
     }
 
 
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/ready", tags=["system"])
+def readiness_check():
+    explainer = explainer_state()
+    ready = explainer["status"] == "warm"
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"ready": ready, "explainer": explainer},
+    )
+
+
 @app.post(
     "/scan",
     response_model=ScanJobStatus,
     status_code=status.HTTP_202_ACCEPTED,
     tags=["security"],
 )
-def start_scan(background_tasks: BackgroundTasks):
+def start_scan(
+    response: Response,
+    priority: int = Query(default=SCAN_DEFAULT_PRIORITY, ge=0, le=9, description="Lower runs first"),
+    profile: bool = Query(default=False, description="Run under the sampling profiler"),
+):
     job_id = str(uuid.uuid4())
+    created_at = datetime.utcnow()
 
-    with jobs_lock:
-        jobs_db[job_id] = {
-            "status": JOB_STATUS_IN_PROGRESS,
-            "data": None,
-            "created_at": datetime.utcnow(),
-        }
+    def accept(new_job_id: str) -> None:
+        jobs_db.create(new_job_id, {"status": JOB_STATUS_PENDING, "created_at": created_at})
+        scan_progress.publish(new_job_id, status=JOB_STATUS_PENDING, stage="queued")
+        if profile:
+            profiled_jobs.add(new_job_id)
 
-    background_tasks.add_task(run_scan_task, job_id)
+    try:
+        job_id, coalesced = scan_scheduler.submit(scan_key(), job_id, accept, priority=priority)
+    except QueueFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    if coalesced:
+        existing = jobs_db.get(job_id, include_data=False)
+        response.status_code = status.HTTP_200_OK
+
+        return {
+            "job_id": job_id,
+            "status": existing["status"],
+            "message": "Identical scan already queued or running",
+            "created_at": existing["created_at"],
+        }
 
     return {
         "job_id": job_id,
-        "status": JOB_STATUS_IN_PROGRESS,
-        "message": "IAM scan initiated",
-        "created_at": jobs_db[job_id]["created_at"],
+        "status": JOB_STATUS_PENDING,
+        "message": "IAM scan queued",
+        "created_at": created_at,
     }
 
 
+@app.get("/scan/queue", tags=["security"])
+def scan_queue_stats():
+    return scan_scheduler.stats()
+
+
+@app.delete(
+    "/scan/{job_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["security"],
+)
+def cancel_scan(job_id: str):
+    job = jobs_db.get(job_id, include_data=False)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    state = scan_scheduler.cancel(job_id)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Scan job already {job['status']}",
+        )
+
+    if state == "queued":
+        jobs_db.update(job_id, status=JOB_STATUS_CANCELLED, finished_at=datetime.utcnow())
+        scan_progress.publish(job_id, status=JOB_STATUS_CANCELLED, stage=None)
+        return {"job_id": job_id, "status": JOB_STATUS_CANCELLED}
+
+    return {"job_id": job_id, "status": "cancelling"}
+
+
+@app.get("/scan", tags=["security"])
+def list_scans(
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    return {"jobs": jobs_db.list_jobs(status=status_filter, limit=limit)}
+
+
 @app.get("/scan/{job_id}", tags=["security"])
-def get_scan_status(job_id: str):
-    with jobs_lock:
-        job = jobs_db.get(job_id)
+def get_scan_status(
+    job_id: str,
+    response: Response,
+    view: str = Query(default="full", pattern="^(status|full)$"),
+    offset: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1, le=SCAN_PAGE_MAX_LIMIT),
+    severity: Optional[List[str]] = Query(default=None),
+    min_risk_score: Optional[int] = Query(default=None, ge=0),
+    role_prefix: Optional[str] = None,
+    exclude_service_roles: bool = False,
+    fields: Optional[str] = Query(default=None, description="Comma-separated role keys"),
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    """
+    `view=status` returns job metadata and the severity summary only.
+    The full view can filter, paginate and project roles; without any
+    query parameters it returns the whole scan as before.
+    """
+    job = jobs_db.get(job_id, include_data=False)
 
     if not job:
         raise HTTPException(
@@ -139,17 +480,324 @@ def get_scan_status(job_id: str):
             detail="Scan job not found",
         )
 
+    params = {
+        "view": view,
+        "offset": offset,
+        "limit": limit,
+        "severity": severity,
+        "min_risk_score": min_risk_score,
+        "role_prefix": role_prefix,
+        "exclude_service_roles": exclude_service_roles,
+        "fields": fields,
+    }
+    etag = compute_etag(job_id, job, params)
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    if view == "status":
+        return job
+
+    if job["status"] != JOB_STATUS_COMPLETED:
+        return {**job, "data": None}
+
+    def build() -> Dict[str, Any]:
+        data = completed_results(jobs_db, job_id, job_revision(job))
+        filtered = any(value for key, value in params.items() if key != "view")
+
+        if filtered:
+            data = query_roles(
+                data,
+                severity=severity,
+                min_risk_score=min_risk_score,
+                role_prefix=role_prefix,
+                exclude_service_roles=exclude_service_roles,
+                fields=[field.strip() for field in fields.split(",")] if fields else None,
+                offset=offset,
+                limit=limit,
+            )
+        elif spilled_roles(data) is not None:
+            # The whole scan was asked for: read the spilled roles back
+            data = {**data, "roles": list(data["roles"])}
+
+        return {**job, "data": data}
+
+    return _cached_json_response(etag, build, accept_encoding)
+
+
+def _cached_json_response(etag: str, build, accept_encoding: Optional[str]) -> Response:
+    # Completed results never change: serialize once, serve cached bytes
+    body, encoding = cached_body(etag, build).variant(negotiate_encoding(accept_encoding))
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _completed_job(job_id: str) -> Dict[str, Any]:
+    job = jobs_db.get(job_id, include_data=False)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    if job["status"] != JOB_STATUS_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Scan not completed yet",
+        )
+
     return job
 
 
+def _completed_index(job_id: str):
+    _completed_job(job_id)
+    return get_index(jobs_db, job_id)
+
+
+def _profile_response(kind: str, job_id: str) -> FileResponse:
+    path = profile_path(kind, job_id)
+
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profile recorded for this job",
+        )
+
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
+
+
+@app.get("/scan/{job_id}/profile", tags=["security"])
+def download_scan_profile(job_id: str):
+    """
+    Collapsed stacks of a scan started with ?profile=true.
+    """
+    return _profile_response("scan", job_id)
+
+
+@app.get("/scan/{job_id}/events", tags=["security"])
+async def scan_events(job_id: str):
+    """
+    Server-Sent Events: a `status` event with stage and role counters on
+    every state change, ending with the final status. Replaces polling.
+    """
+    job = jobs_db.get(job_id, include_data=False)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    async def events():
+        last = None
+        async with aclosing(scan_progress.watch(job_id, SCAN_EVENTS_KEEPALIVE)) as states:
+            async for state in states:
+                if state is None:
+                    # No push for a while (or a scan run by another worker):
+                    # the store is the source of truth
+                    stored = jobs_db.get(job_id, include_data=False)
+                    if stored is None:
+                        return
+                    if stored["status"] in TERMINAL_STATUSES:
+                        state = job_state(job_id, stored)
+                    else:
+                        state = scan_progress.snapshot(job_id) or job_state(job_id, stored)
+
+                if state == last:
+                    yield ": keepalive\n\n"
+                    continue
+
+                last = state
+                yield format_sse("status", state)
+                if state["status"] in TERMINAL_STATUSES:
+                    return
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.get("/scan/{job_id}/table", tags=["security"])
+def scan_findings_table(
+    job_id: str,
+    exclude_service_roles: bool = False,
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    """
+    Columnar rows (one per policy) for dashboards: severity counts and
+    distinct finding titles, without the finding details.
+    """
+    job = _completed_job(job_id)
+    etag = compute_etag(job_id, job, {"view": "table", "exclude_service_roles": exclude_service_roles})
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    def build() -> Dict[str, Any]:
+        data = completed_results(jobs_db, job_id, job_revision(job))
+        return findings_table(data, exclude_service_roles=exclude_service_roles)
+
+    return _cached_json_response(etag, build, accept_encoding)
+
+
+def _export_tables(job_id: str):
+    if not export_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export requires pyarrow",
+        )
+
+    _completed_job(job_id)
+    return scan_tables(job_id, completed_results(jobs_db, job_id))
+
+
+@app.get("/scan/{job_id}/export/{table}", tags=["export"])
+def export_scan_table(
+    job_id: str,
+    table: str,
+    format: str = Query(default="arrow", pattern="^(arrow|parquet)$"),
+):
+    """
+    One flattened table (roles, policies or findings) of a completed
+    scan: an Arrow IPC stream sent batch by batch, or a Parquet file.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export table, expected one of {', '.join(EXPORT_TABLES)}",
+        )
+
+    arrow_table = _export_tables(job_id)[table]
+
+    if format == "parquet":
+        return Response(
+            content=parquet_bytes(arrow_table),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="{table}-{job_id}.parquet"'},
+        )
+
+    return StreamingResponse(
+        iter_arrow_stream(arrow_table),
+        media_type="application/vnd.apache.arrow.stream",
+    )
+
+
+@app.post("/scan/{job_id}/export", tags=["export"])
+def export_scan_history(job_id: str):
+    """
+    Add a completed scan to the Parquet history (hive-partitioned by
+    account_id and scan_date) for analytics jobs.
+    """
+    _export_tables(job_id)
+    files = write_parquet_dataset(job_id, completed_results(jobs_db, job_id))
+    return {"job_id": job_id, "files": files}
+
+
+@app.get("/scan/{job_id}/roles/top", tags=["security"])
+def top_risk_roles(
+    job_id: str,
+    k: int = Query(default=50, ge=1, le=SCAN_PAGE_MAX_LIMIT),
+    exclude_service_roles: bool = False,
+):
+    index = _completed_index(job_id)
+    return {"roles": index.top_roles(k, exclude_service_roles=exclude_service_roles)}
+
+
+@app.get("/scan/{job_id}/findings", tags=["security"])
+def query_findings(
+    job_id: str,
+    title: Optional[str] = Query(default=None, description="Finding title, e.g. Wildcard Resource"),
+    severity: Optional[str] = None,
+    exclude_service_roles: bool = False,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=SCAN_PAGE_MAX_LIMIT),
+):
+    """
+    With `title`: policies carrying that finding (optionally of one
+    severity). With only `severity`: roles having such a finding.
+    """
+    index = _completed_index(job_id)
+
+    if title:
+        return index.policies_with(
+            title,
+            severity=severity,
+            exclude_service_roles=exclude_service_roles,
+            offset=offset,
+            limit=limit,
+        )
+
+    if severity:
+        roles = index.roles_with_severity(severity, exclude_service_roles=exclude_service_roles)
+        return {
+            "roles": roles[offset:offset + limit],
+            "total": len(roles),
+            "offset": offset,
+        }
+
+    return {"titles": {name: len(postings) for name, postings in index.by_title.items()}, **index.stats}
+
+
+@app.get("/scan/{base_id}/diff/{target_id}", tags=["security"])
+def diff_scan_results(base_id: str, target_id: str, stream: bool = False):
+    """
+    New, resolved and changed findings between two completed scans.
+    With `stream=true` the diff is sent as NDJSON: one line per changed
+    role, then a summary line.
+    """
+    for job_id in (base_id, target_id):
+        _completed_job(job_id)
+
+    base = get_fingerprint(jobs_db, base_id)
+    target = get_fingerprint(jobs_db, target_id)
+    if not stream:
+        return {"base": base_id, "target": target_id, **diff_scans(base, target)}
+
+    meta = {"base": base_id, "target": target_id, "identical": base["scan_hash"] == target["scan_hash"]}
+
+    def lines():
+        summary = diff_summary([])
+        for record in iter_diff(base, target):
+            summary = diff_summary([record], summary)
+            yield dumps({"type": "role", **record}) + b"\n"
+        yield dumps({"type": "summary", **meta, "summary": summary}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/events/iam", status_code=status.HTTP_202_ACCEPTED, tags=["security"])
+def receive_iam_events(records: List[Dict[str, Any]]):
+    """
+    Queue CloudTrail records (raw or EventBridge envelopes) for
+    debounced re-analysis of the roles they touch.
+    """
+    if not isinstance(iam_event_consumer.source, QueueEventSource):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="IAM events are read from IAM_EVENTS_FILE",
+        )
+
+    for record in records:
+        iam_event_consumer.source.put(record)
+    return {"queued": len(records)}
+
+
 @app.post(
     "/explain",
-    response_model=ExplainResponse,
+    response_model=ExplainJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
     tags=["ai"],
 )
-def explain_scan(request: ExplainRequest):
-    with jobs_lock:
-        job = jobs_db.get(request.scan_id)
+async def explain_scan(request: ExplainRequest, response: Response):
+    # Store reads (and decoding the results) stay off the event loop
+    job = await asyncio.to_thread(jobs_db.get, request.scan_id, False)
 
     if not job:
         raise HTTPException(
@@ -163,6 +811,135 @@ def explain_scan(request: ExplainRequest):
             detail="Scan not completed yet",
         )
 
+    data = await asyncio.to_thread(completed_results, jobs_db, request.scan_id)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    # Reuse a running or completed explanation of the same scan
+    existing_id = explanations_by_scan.get(request.scan_id)
+    existing: Optional[Dict[str, Any]] = explain_jobs_db.get(existing_id)
+
+    if existing and not request.refresh and existing["status"] in (
+        JOB_STATUS_IN_PROGRESS,
+        JOB_STATUS_COMPLETED,
+    ):
+        if existing["status"] == JOB_STATUS_COMPLETED:
+            response.status_code = status.HTTP_200_OK
+
+        return {
+            "job_id": existing_id,
+            "scan_id": request.scan_id,
+            "status": existing["status"],
+            "message": "Existing explanation reused",
+            "created_at": existing["created_at"],
+        }
+
     logger.info(f"[AI EXPLAIN] scan_id={request.scan_id}")
 
-    return explain_scan_results(job["data"])
+    job_id = str(uuid.uuid4())
+    explain_jobs_db[job_id] = {
+        "job_id": job_id,
+        "scan_id": request.scan_id,
+        "status": JOB_STATUS_IN_PROGRESS,
+        "progress": {"policies_total": None, "policies_done": 0},
+        "partial": {},
+        "results": None,
+        "summary": None,
+        "created_at": datetime.utcnow(),
+    }
+    explanations_by_scan[request.scan_id] = job_id
+    if request.profile:
+        profiled_jobs.add(job_id)
+    explain_tasks[job_id] = asyncio.create_task(run_explain_task(job_id, data))
+
+    return {
+        "job_id": job_id,
+        "scan_id": request.scan_id,
+        "status": JOB_STATUS_IN_PROGRESS,
+        "message": "AI explanation initiated",
+        "created_at": explain_jobs_db[job_id]["created_at"],
+    }
+
+
+@app.get("/explain/stream/{scan_id}", tags=["ai"])
+async def stream_explanations(scan_id: str):
+    """
+    Server-Sent Events: explanation tokens per finding as they are
+    generated, multiplexed by finding stream id.
+    """
+    job = await asyncio.to_thread(jobs_db.get, scan_id, False)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    if job["status"] != JOB_STATUS_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Scan not completed yet",
+        )
+
+    data = await asyncio.to_thread(completed_results, jobs_db, scan_id)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found",
+        )
+
+    logger.info(f"[AI EXPLAIN STREAM] scan_id={scan_id}")
+
+    async def events():
+        async for event in stream_scan_explanations(data):
+            name = event.pop("event")
+            yield format_sse(name, event, event.get("id"))
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.get("/explain/{job_id}", tags=["ai"])
+async def get_explain_status(job_id: str):
+    job = explain_jobs_db.get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Explanation job not found",
+        )
+
+    return _explain_job_view(job)
+
+
+@app.get("/explain/{job_id}/profile", tags=["ai"])
+async def download_explain_profile(job_id: str):
+    return _profile_response("explain", job_id)
+
+
+@app.delete(
+    "/explain/{job_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["ai"],
+)
+async def cancel_explain(job_id: str):
+    job = explain_jobs_db.get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Explanation job not found",
+        )
+
+    task = explain_tasks.get(job_id)
+    if task is None or task.done():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Explanation job already {job['status']}",
+        )
+
+    task.cancel()
+
+    return {"job_id": job_id, "status": "cancelling"}
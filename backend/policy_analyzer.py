@@ -2,11 +2,6 @@ import logging
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +24,28 @@ class PolicyRiskAnalyzer:
         "iam:PassRole"
     }
 
+    SEVERITY_SCORES = {
+        Severity.LOW: 1,
+        Severity.MEDIUM: 3,
+        Severity.HIGH: 7,
+        Severity.CRITICAL: 10
+    }
+
+    # Every finding title this analyzer can emit (used to pre-warm RAG contexts)
+    FINDING_TITLES = (
+        "Empty Policy",
+        "NotAction Usage",
+        "NotResource Usage",
+        "Wildcard Action",
+        "Wildcard Resource",
+        "Privilege Escalation Risk",
+        "Missing Condition",
+        "Wildcard Trust Principal",
+        "Cross-Account Trust Without ExternalId",
+        "Federated Trust Without Audience",
+        "Unused Service Access",   # added from last-accessed reports (access_advisor)
+    )
+
     def analyze_policy(
         self,
         policy: Dict[str, Any],
@@ -142,6 +159,90 @@ class PolicyRiskAnalyzer:
 
         return findings
 
+    def analyze_trust_policy(
+        self,
+        policy: Dict[str, Any],
+        account_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze a role's trust policy (AssumeRolePolicyDocument).
+        `account_id` is the role's own account; other accounts are cross-account.
+        """
+        statements = policy.get("Statement", [])
+        if not isinstance(statements, list):
+            statements = [statements]
+
+        findings = []
+        for idx, statement in enumerate(statements):
+            findings.extend(self._analyze_trust_statement(statement, idx, account_id))
+
+        return {
+            "findings": findings,
+            "risk_score": self._calculate_risk_score(findings)
+        }
+
+    def _analyze_trust_statement(
+        self,
+        statement: Dict[str, Any],
+        index: int,
+        account_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        findings = []
+
+        if str(statement.get("Effect", "Allow")).lower() == "deny":
+            return findings
+
+        conditions = statement.get("Condition") or {}
+        condition_keys = {
+            key.lower()
+            for operator in conditions.values() if isinstance(operator, dict)
+            for key in operator
+        }
+        principal = statement.get("Principal", {})
+        if not isinstance(principal, dict):
+            principal = {"AWS": principal}
+
+        aws_principals = self._normalize(principal.get("AWS"))
+        federated = self._normalize(principal.get("Federated"))
+
+        # 🔴 Anyone can assume the role (NotPrincipal in an Allow is the same)
+        if "*" in aws_principals or statement.get("NotPrincipal"):
+            findings.append(self._finding(
+                "Wildcard Trust Principal",
+                Severity.CRITICAL if not conditions else Severity.MEDIUM,
+                "Trust policy lets any AWS principal assume the role",
+                index
+            ))
+
+        # 🔴 Other accounts trusted without an external id (confused deputy)
+        accounts = {self._principal_account(p) for p in aws_principals if p != "*"}
+        foreign = sorted(a for a in accounts if a and a != account_id)
+        if foreign and "sts:externalid" not in condition_keys:
+            findings.append(self._finding(
+                "Cross-Account Trust Without ExternalId",
+                Severity.HIGH,
+                f"Role can be assumed from account(s) {', '.join(foreign)} without an sts:ExternalId condition",
+                index
+            ))
+
+        # 🔴 Any token from the identity provider is accepted
+        if federated and not any(key.endswith(":aud") for key in condition_keys):
+            findings.append(self._finding(
+                "Federated Trust Without Audience",
+                Severity.HIGH,
+                f"Federated principal {', '.join(federated)} is trusted without an audience (aud) condition",
+                index
+            ))
+
+        return findings
+
+    def _principal_account(self, principal: str) -> Optional[str]:
+        # "123456789012" or "arn:aws:iam::123456789012:root|role/...|user/..."
+        if principal.isdigit():
+            return principal
+        parts = principal.split(":")
+        return parts[4] if len(parts) > 5 and parts[4] else None
+
     def _normalize(self, field) -> List[str]:
         if isinstance(field, list):
             return field
@@ -161,13 +262,7 @@ class PolicyRiskAnalyzer:
         )
 
     def _calculate_risk_score(self, findings: List[Dict[str, Any]]) -> int:
-        score_map = {
-            Severity.LOW: 1,
-            Severity.MEDIUM: 3,
-            Severity.HIGH: 7,
-            Severity.CRITICAL: 10
-        }
-        return sum(score_map[f["severity"]] for f in findings)
+        return sum(self.SEVERITY_SCORES[f["severity"]] for f in findings)
 
     def _finding(
         self,
@@ -1,23 +1,17 @@
 import os
+import json
+import hashlib
 import logging
-from typing import List
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from langchain_core.documents import Document
+from backend.knowledge_ingest import ingest_knowledge_base
+from backend.utils.metrics import RAG_RETRIEVAL_SECONDS
 
+# langchain and FAISS are imported when an engine is built, not with
+# the API (see explain_service.get_explainer)
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
 
-# --------------------------------------------------
-# Environment & Logging
-# --------------------------------------------------
-load_dotenv()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------
@@ -26,6 +20,7 @@ logger = logging.getLogger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 KNOWLEDGE_PATH = os.path.join(BASE_DIR, "knowledge_base")
 VECTOR_DB_PATH = os.path.join(BASE_DIR, "vector_store")
+INGEST_REPORT_FILE = "ingest_report.json"
 
 
 class SecurityRAGEngine:
@@ -33,48 +28,43 @@ class SecurityRAGEngine:
     Production-grade RAG engine for IAM security knowledge
     """
 
-    def __init__(self):
-        self._validate_env()
-        self.embeddings = OpenAIEmbeddings()
-        self.vector_store: FAISS | None = None
+    def __init__(self, embeddings=None, http_client=None, vector_db_path: str = VECTOR_DB_PATH):
+        self._validate_env(need_api_key=embeddings is None)
+        if embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
+            embeddings = OpenAIEmbeddings(http_client=http_client)
+        self.embeddings = embeddings
+        self.vector_db_path = vector_db_path
+        self.vector_store: Optional["FAISS"] = None
+
+        # Knowledge base is immutable once loaded, so contexts are memoized
+        self._context_cache: Dict[Tuple[str, int], List[str]] = {}
+        self.knowledge_version: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.vector_store is not None
+
+    def _fingerprint_store(self) -> str:
+        """
+        Cheap version id of the persisted index (file names, sizes, mtimes).
+        """
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(self.vector_db_path)):
+            stat = os.stat(os.path.join(self.vector_db_path, name))
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+        return digest.hexdigest()[:16]
 
     # --------------------------------------------------
     # Validation
     # --------------------------------------------------
-    def _validate_env(self):
-        if not os.getenv("OPENAI_API_KEY"):
+    def _validate_env(self, need_api_key: bool = True):
+        if need_api_key and not os.getenv("OPENAI_API_KEY"):
             raise EnvironmentError("OPENAI_API_KEY not set")
 
         if not os.path.exists(KNOWLEDGE_PATH):
             raise FileNotFoundError("knowledge_base directory not found")
 
-    # --------------------------------------------------
-    # Knowledge Loading
-    # --------------------------------------------------
-    def _load_documents(self) -> List[Document]:
-        documents = []
-
-        files = [
-            f for f in os.listdir(KNOWLEDGE_PATH)
-            if f.endswith((".md", ".txt"))
-        ]
-
-        if not files:
-            raise RuntimeError("No knowledge files found in knowledge_base")
-
-        for file in files:
-            file_path = os.path.join(KNOWLEDGE_PATH, file)
-            with open(file_path, "r", encoding="utf-8") as f:
-                documents.append(
-                    Document(
-                        page_content=f.read(),
-                        metadata={"source": file}
-                    )
-                )
-
-        logger.info(f"Loaded {len(documents)} knowledge documents")
-        return documents
-
     # --------------------------------------------------
     # Vector Store Build / Load
     # --------------------------------------------------
@@ -82,44 +72,66 @@ class SecurityRAGEngine:
         """
         Load vector DB from disk if exists, else build it
         """
-        if os.path.exists(VECTOR_DB_PATH):
+        if self.is_loaded:
+            return
+
+        if os.path.exists(self.vector_db_path):
+            from langchain_community.vectorstores import FAISS
+
             logger.info("Loading existing vector store")
+            # The docstore pickle is only ever written by this engine
             self.vector_store = FAISS.load_local(
-                VECTOR_DB_PATH,
+                self.vector_db_path,
                 self.embeddings,
-                allow_dangerous_deserialization=False
+                allow_dangerous_deserialization=True
             )
+            self.knowledge_version = self._fingerprint_store()
             return
 
         logger.info("Building new vector store")
 
-        documents = self._load_documents()
-
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=100
+        self.vector_store, report = ingest_knowledge_base(
+            KNOWLEDGE_PATH,
+            self.embeddings
         )
+        self.vector_store.save_local(self.vector_db_path)
 
-        chunks = splitter.split_documents(documents)
+        with open(os.path.join(self.vector_db_path, INGEST_REPORT_FILE), "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        self.knowledge_version = self._fingerprint_store()
 
-        self.vector_store = FAISS.from_documents(chunks, self.embeddings)
-        self.vector_store.save_local(VECTOR_DB_PATH)
-
-        logger.info("Vector store built and saved")
+        logger.info(
+            f"Vector store built and saved: {report.chunks_kept}/{report.chunks_total} chunks kept "
+            f"(dedup ratio {report.dedup_ratio:.1%})"
+        )
 
     # --------------------------------------------------
     # Retrieval
     # --------------------------------------------------
-    def retrieve_context(self, query: str, k: int = 3) -> str:
+    def retrieve_chunks(self, query: str, k: int = 3) -> List[str]:
+        """
+        Top-k chunks, each prefixed with its source, for a query.
+        """
         if not self.vector_store:
             raise RuntimeError("Vector store not initialized")
 
-        docs = self.vector_store.similarity_search(
-            query=query,
-            k=k
-        )
+        cached = self._context_cache.get((query, k))
+        if cached is not None:
+            RAG_RETRIEVAL_SECONDS.observe(0.0, cache="hit")
+            return cached
+
+        with RAG_RETRIEVAL_SECONDS.time(cache="miss"):
+            docs = self.vector_store.similarity_search(
+                query=query,
+                k=k
+            )
 
-        return "\n\n".join(
+        chunks = [
             f"[Source: {doc.metadata.get('source')}]\n{doc.page_content}"
             for doc in docs
-        )
+        ]
+        self._context_cache[(query, k)] = chunks
+        return chunks
+
+    def retrieve_context(self, query: str, k: int = 3) -> str:
+        return "\n\n".join(self.retrieve_chunks(query, k))
@@ -0,0 +1,214 @@
+"""
+Scan results that need not fit in memory.
+
+A ResultSink takes scanned roles one at a time, keeps at most
+RESULT_BUFFER_ROLES of them in memory and appends full buffers to a
+segment file: one zstd frame of JSON lines per spill, never rewritten
+in place. Summary counters are updated as roles arrive; iterating the
+sink streams the roles back in scan order.
+"""
+
+import io
+import os
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import zstandard
+
+from backend.services.scan_query import ScanSummary
+from backend.utils.serialization import dumps, loads
+from backend.utils.constants import (
+    RESULT_BUFFER_ROLES,
+    RESULT_READ_BUFFER_BYTES,
+    JOB_RESULT_COMPRESSION_LEVEL,
+)
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, "job_store", "results")
+
+SEGMENT_SUFFIX = ".jsonl.zst"
+
+
+def result_buffer_roles() -> int:
+    value = os.getenv("RESULT_BUFFER_ROLES")
+    return int(value) if value not in (None, "") else RESULT_BUFFER_ROLES
+
+
+def segment_path(name: str) -> str:
+    return os.path.join(os.getenv("RESULT_SPILL_DIR") or RESULTS_DIR, f"{name}{SEGMENT_SUFFIX}")
+
+
+class ResultSink:
+    """
+    Append-only role list with a bounded memory footprint.
+
+    Nothing touches the disk until the buffer first fills, so small
+    scans stay plain lists (see finish). A finished sink is read-only;
+    the job store keeps its path and reopens it with `ResultSink.open`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_roles: Optional[int] = None,
+        compression_level: int = JOB_RESULT_COMPRESSION_LEVEL
+    ):
+        self.path = path
+        self.buffer_roles = result_buffer_roles() if buffer_roles is None else buffer_roles
+        self.compression_level = compression_level
+        self.summary: Optional[ScanSummary] = ScanSummary()
+        self.spilled = 0          # roles in the segment file
+        self.spills = 0           # frames in the segment file
+        self.segment_bytes = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._finished = False
+
+    @classmethod
+    def open(cls, path: str, roles: int) -> "ResultSink":
+        """
+        Read-only view of a finished, fully spilled sink. Its summary is
+        not known here (the job store keeps the one computed at scan time).
+        """
+        sink = cls(path, buffer_roles=0)
+        sink.summary = None
+        sink.spilled = roles
+        sink._finished = True
+        return sink
+
+    # --------------------------------------------------
+    # Writing
+    # --------------------------------------------------
+    def append(self, role: Dict[str, Any]) -> None:
+        if self._finished:
+            raise ValueError("Result sink is finished")
+
+        self.summary.add(role)
+        self._buffer.append(role)
+        if self.buffer_roles and len(self._buffer) >= self.buffer_roles:
+            self.flush()
+
+    def extend(self, roles) -> None:
+        for role in roles:
+            self.append(role)
+
+    def flush(self) -> None:
+        """
+        Spill the buffered roles as one frame at the end of the segment.
+        """
+        if not self._buffer:
+            return
+
+        lines = b"".join(dumps(role) + b"\n" for role in self._buffer)
+        frame = zstandard.ZstdCompressor(level=self.compression_level).compress(lines)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(frame)
+
+        self.spilled += len(self._buffer)
+        self.spills += 1
+        self.segment_bytes += len(frame)
+        self._buffer = []
+
+    def finish(self) -> Union[List[Dict[str, Any]], "ResultSink"]:
+        """
+        Stop accepting roles. Returns the roles as a plain list when they
+        never left memory, otherwise the sink itself with everything spilled.
+        """
+        self._finished = True
+        if not self.spilled:
+            roles, self._buffer = self._buffer, []
+            return roles
+
+        self.flush()
+        logger.info(
+            f"Result sink {os.path.basename(self.path)}: {self.spilled} roles in "
+            f"{self.spills} frames, {self.segment_bytes} bytes"
+        )
+        return self
+
+    def delete(self) -> None:
+        self._buffer = []
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    # --------------------------------------------------
+    # Reading
+    # --------------------------------------------------
+    def __len__(self) -> int:
+        return self.spilled + len(self._buffer)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        buffered, spilled = list(self._buffer), self.spilled
+        if spilled:
+            yield from _read_segment(self.path, spilled)
+        yield from buffered
+
+    def rewrite(self, update: Callable[[List[Dict[str, Any]]], int]) -> int:
+        """
+        Let `update` modify the roles in place, a buffer-sized batch at a
+        time. Spilled roles go through a new segment that then replaces the
+        old one; the summary is rebuilt. Returns the sum of `update` results.
+        """
+        if self._finished:
+            raise ValueError("Result sink is finished")
+
+        if self.spilled:
+            rewritten = ResultSink(f"{self.path}.rewrite", self.buffer_roles, self.compression_level)
+            total, batch = 0, []
+
+            for role in _read_segment(self.path, self.spilled):
+                batch.append(role)
+                if len(batch) >= self.buffer_roles:
+                    total += update(batch)
+                    rewritten.extend(batch)
+                    batch = []
+            total += update(batch) if batch else 0
+            rewritten.extend(batch)
+            rewritten.flush()
+            os.replace(rewritten.path, self.path)
+
+            self.summary = rewritten.summary
+            self.spills, self.segment_bytes = rewritten.spills, rewritten.segment_bytes
+        else:
+            total = 0
+            self.summary = ScanSummary()
+
+        if self._buffer:
+            total += update(self._buffer)
+        for role in self._buffer:
+            self.summary.add(role)
+        return total
+
+
+def _read_segment(path: str, roles: int) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        lines = io.BufferedReader(reader, RESULT_READ_BUFFER_BYTES)
+        for _, line in zip(range(roles), lines):
+            yield loads(line)
+
+
+def open_result_sink(name: str, buffer_roles: Optional[int] = None) -> ResultSink:
+    """
+    A fresh sink spilling to `segment_path(name)`; a segment left by an
+    earlier attempt under the same name is discarded.
+    """
+    sink = ResultSink(segment_path(name), buffer_roles=buffer_roles)
+    sink.delete()
+    return sink
+
+
+def spilled_roles(scan_data: Optional[Dict[str, Any]]) -> Optional[ResultSink]:
+    """
+    The sink behind a scan's roles, or None when they are a plain list.
+    """
+    roles = scan_data.get("roles") if scan_data else None
+    return roles if isinstance(roles, ResultSink) else None
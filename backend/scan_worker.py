@@ -0,0 +1,127 @@
+"""
+Stateless scan worker for distributed mode (SCAN_MODE=distributed).
+Leases role shards from the work queue, scans them with the regular
+scanner helpers and posts each partial result back. Run as many as
+needed, on any node that can reach the queue:
+
+    python -m backend.scan_worker [--once]
+"""
+
+import os
+import sys
+import time
+import socket
+import threading
+from threading import Event
+from typing import Optional
+
+from backend.aws_scanner import ScanCancelled, get_iam_client, scan_role_list, validate_env
+from backend.utils.logger import get_logger, configure_logging
+from backend.utils.timing import StageTimings
+from backend.work_queue import Shard, WorkQueue, create_work_queue
+from backend.utils.constants import APP_NAME, SHARD_LEASE_SECONDS, WORKER_IDLE_SECONDS
+
+logger = get_logger(APP_NAME)
+
+
+class ScanWorker:
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        iam=None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = SHARD_LEASE_SECONDS,
+        idle_seconds: float = WORKER_IDLE_SECONDS
+    ):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.idle_seconds = idle_seconds
+        self.processed = 0
+        self._iam = iam
+
+    @property
+    def iam(self):
+        if self._iam is None:
+            validate_env()
+            self._iam = get_iam_client()
+        return self._iam
+
+    def _keep_lease(self, shard: Shard, done: Event, lost: Event) -> None:
+        # Renew at a third of the lease so one missed beat is survivable
+        while not done.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(shard, self.lease_seconds):
+                lost.set()
+                return
+
+    def run_once(self) -> bool:
+        """
+        Scan one shard if any is available; False when the queue is empty.
+        """
+        shard = self.queue.lease(self.worker_id, self.lease_seconds)
+        if shard is None:
+            return False
+
+        done, lost = Event(), Event()
+        heartbeat = threading.Thread(target=self._keep_lease, args=(shard, done, lost), daemon=True)
+        heartbeat.start()
+        started = time.perf_counter()
+
+        try:
+            timings = StageTimings()
+            # A lost lease cancels the shard: someone else has it now
+            roles, unused_access = scan_role_list(self.iam, shard.payload, timings, cancel_event=lost)
+            result = {
+                "roles": roles,
+                "timings": timings.to_dict(),
+                "unused_access": unused_access,
+                "worker": self.worker_id,
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+            if self.queue.complete(shard, result):
+                logger.info(
+                    f"[SHARD DONE] job_id={shard.job_id} shard={shard.index} "
+                    f"roles={len(roles)} attempt={shard.attempts} {result['seconds']}s"
+                )
+            else:
+                logger.info(f"[SHARD DROPPED] job_id={shard.job_id} shard={shard.index}: finished or cancelled elsewhere")
+        except ScanCancelled:
+            logger.warning(f"[SHARD ABANDONED] job_id={shard.job_id} shard={shard.index}: lease lost")
+        except Exception as exc:
+            logger.exception(f"[SHARD FAILED] job_id={shard.job_id} shard={shard.index}")
+            self.queue.fail(shard, f"{type(exc).__name__}: {exc}")
+        finally:
+            done.set()
+            heartbeat.join()
+
+        self.processed += 1
+        return True
+
+    def run(self, stop_event: Optional[Event] = None) -> None:
+        stop_event = stop_event or Event()
+        logger.info(f"[WORKER STARTED] worker_id={self.worker_id}")
+        while not stop_event.is_set():
+            if not self.run_once():
+                stop_event.wait(self.idle_seconds)
+
+
+def main(argv=None) -> None:
+    from dotenv import load_dotenv
+
+    argv = sys.argv[1:] if argv is None else argv
+    load_dotenv()
+    configure_logging()
+    worker = ScanWorker(create_work_queue())
+
+    if "--once" in argv:
+        worker.run_once()
+        return
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        logger.info(f"[WORKER STOPPED] worker_id={worker.worker_id} shards={worker.processed}")
+
+
+if __name__ == "__main__":
+    main()
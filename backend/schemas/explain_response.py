@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class ExplainResponse(BaseModel):
     results: List[Dict[str, Any]]
+    summary: Optional[Dict[str, Any]] = None
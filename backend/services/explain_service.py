@@ -1,56 +1,253 @@
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any
+from datetime import datetime
+from threading import Lock
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Dict, Any, Optional
 
 # 1. Absolute Imports for Production
-from backend.llm_explainer import SecurityLLMExplainer
+from backend.explanation_cache import CacheStats
+from backend.explain_scheduler import ExplainBudget
+from backend.utils.constants import (
+    EXPLAIN_CONCURRENCY,
+    EXPLAIN_BATCH_SIZE,
+    EXPLAIN_SCAN_TOKEN_BUDGET,
+    EXPLAIN_SCAN_TIME_BUDGET,
+)
+
+# The AI stack (llm_explainer -> langchain, OpenAI SDK, FAISS) loads with
+# the first explainer, during warm-up or on first use, so the API can
+# serve /health and /scan before it is imported
+if TYPE_CHECKING:
+    from backend.llm_explainer import SecurityLLMExplainer
 
 logger = logging.getLogger("cloud-security-copilot")
 
-def explain_scan_results(scan_data: Dict[str, Any]) -> Dict[str, Any]:
+# --------------------------------------------------
+# Shared Explainer (one per process)
+# --------------------------------------------------
+_explainer: Optional["SecurityLLMExplainer"] = None
+_explainer_lock = Lock()
+_warm_state: Dict[str, Any] = {
+    "status": "cold",
+    "error": None,
+    "warmed_at": None,
+    "warm_up_seconds": None,
+}
+
+
+def get_explainer() -> "SecurityLLMExplainer":
     """
-    Takes EXISTING scan data and generates AI explanations.
-    Does NOT run the scan again.
+    Return the process-wide explainer, building it on first use
+    if startup warm-up did not run or failed.
     """
-    explainer = SecurityLLMExplainer()
-    explanations = []
+    global _explainer
 
-    # Check if scan_data is empty or invalid
-    if not scan_data or "roles" not in scan_data:
-        logger.warning("No roles found in scan data to explain.")
-        return {"results": []}
+    with _explainer_lock:
+        if _explainer is None:
+            from backend.llm_explainer import SecurityLLMExplainer
+            _explainer = SecurityLLMExplainer()
+        return _explainer
+
+
+def warm_up_explainer(explainer: Optional["SecurityLLMExplainer"] = None) -> Dict[str, Any]:
+    """
+    Build (or adopt) the shared explainer and precompute its contexts.
+    Never raises: failures are recorded in the readiness state.
+    """
+    global _explainer
+
+    _warm_state.update({"status": "warming", "error": None})
+    started = time.perf_counter()
+
+    try:
+        if explainer is not None:
+            with _explainer_lock:
+                _explainer = explainer
+        warm = get_explainer().warm_up()
+
+        _warm_state.update({
+            "status": "warm",
+            "warmed_at": datetime.utcnow().isoformat(),
+            "warm_up_seconds": round(time.perf_counter() - started, 4),
+            "contexts_cached": warm["contexts_cached"],
+        })
+        logger.info(f"AI explainer warm in {_warm_state['warm_up_seconds']}s")
 
-    logger.info(f"Generating AI explanations for {len(scan_data['roles'])} roles")
+    except Exception as exc:
+        logger.warning(f"AI explainer warm-up failed: {exc}")
+        _warm_state.update({"status": "failed", "error": str(exc)})
+
+    return explainer_state()
+
+
+async def shutdown_explainer() -> None:
+    global _explainer
+
+    with _explainer_lock:
+        explainer, _explainer = _explainer, None
+
+    if explainer is not None:
+        await explainer.aclose()
+    _warm_state.update({"status": "cold", "warmed_at": None})
+
+
+def explainer_state() -> Dict[str, Any]:
+    return dict(_warm_state)
+
+
+def _policies_to_explain(scan_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten the scan into (role, policy, findings) work items in scan order.
+    """
+    items = []
 
-    # 2. Iterate through the data passed from the jobs_db
     for role in scan_data["roles"]:
         role_name = role.get("RoleName", "Unknown")
-        
+
         for policy in role.get("AttachedPolicies", []):
-            policy_name = policy.get("PolicyName", "Unknown")
             findings = policy.get("Findings", [])
 
             # Only explain if there are actual security findings
             if findings:
-                try:
-                    explanation = explainer.explain_findings(
-                        role_name=role_name,
-                        policy_name=policy_name,
-                        findings=findings
-                    )
-                    
-                    explanations.append({
-                        "Role": role_name,
-                        "Policy": policy_name,
-                        "Explanation": explanation
-                    })
-                except Exception as e:
-                    logger.error(f"LLM failed to explain {policy_name}: {str(e)}")
-                    continue
+                items.append({
+                    "role_name": role_name,
+                    "policy_name": policy.get("PolicyName", "Unknown"),
+                    "findings": findings,
+                })
+
+    return items
+
+
+async def explain_scan_results_async(
+    scan_data: Dict[str, Any],
+    explainer: Optional["SecurityLLMExplainer"] = None,
+    concurrency: int = EXPLAIN_CONCURRENCY,
+    batch_size: Optional[int] = EXPLAIN_BATCH_SIZE,
+    token_budget: Optional[int] = EXPLAIN_SCAN_TOKEN_BUDGET,
+    time_budget: Optional[float] = EXPLAIN_SCAN_TIME_BUDGET,
+    on_result: Optional[Callable[[int, int, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Takes EXISTING scan data and generates AI explanations.
+    Does NOT run the scan again.
+
+    All policies are explained concurrently with at most `concurrency`
+    RAG/LLM calls in flight; results keep scan order. `batch_size`
+    groups findings per LLM request (see aexplain_policies). Findings
+    that do not fit the token/time budget are listed as deferred.
+
+    `on_result(index, total, entry)` receives each policy's entry as
+    soon as it is ready (completion order, not scan order).
+    """
+
+    # Check if scan_data is empty or invalid
+    if not scan_data or "roles" not in scan_data:
+        logger.warning("No roles found in scan data to explain.")
+        return {"results": []}
+
+    explainer = explainer or await asyncio.to_thread(get_explainer)
+    items = _policies_to_explain(scan_data)
+    limiter = asyncio.Semaphore(concurrency)
+    cache_stats = CacheStats()
+    budget = ExplainBudget(max_tokens=token_budget, max_seconds=time_budget)
+
+    logger.info(
+        f"Generating AI explanations for {len(items)} policies across "
+        f"{len(scan_data['roles'])} roles (concurrency={concurrency})"
+    )
+
+    def entry(index: int, explanation: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "Role": items[index]["role_name"],
+            "Policy": items[index]["policy_name"],
+            "Explanation": explanation
+        }
+
+    explained = await explainer.aexplain_policies(
+        items,
+        limiter=limiter,
+        stats=cache_stats,
+        batch_size=batch_size,
+        budget=budget,
+        on_result=(
+            (lambda index, explanation: on_result(index, len(items), entry(index, explanation)))
+            if on_result else None
+        )
+    )
+
+    explanations = [entry(index, explanation) for index, explanation in enumerate(explained)]
+
+    deferred = [
+        {
+            "Role": item["role_name"],
+            "Policy": item["policy_name"],
+            "finding_id": finding["id"],
+            "severity": finding["severity"],
+            "title": finding["title"],
+        }
+        for item, explanation in zip(items, explained)
+        for finding in item["findings"]
+        if finding.get("id") in explanation.get("deferred", [])
+    ]
+    if deferred:
+        logger.warning(f"Explanation budget exhausted: {len(deferred)} findings deferred")
+
+    logger.info(
+        f"Explanation cache: {cache_stats.hits}/{cache_stats.lookups} hits, "
+        f"~{cache_stats.tokens_avoided} tokens avoided"
+    )
 
     return {
         "results": explanations,
         "summary": {
             "total_explained": len(explanations),
-            "timestamp": scan_data.get("finished_at")
+            "timestamp": scan_data.get("finished_at"),
+            "cache": cache_stats.to_dict(),
+            "budget": budget.to_dict(),
+            "deferred": deferred
         }
-    }
\ No newline at end of file
+    }
+
+
+async def stream_scan_explanations(
+    scan_data: Dict[str, Any],
+    explainer: Optional["SecurityLLMExplainer"] = None,
+    concurrency: int = EXPLAIN_CONCURRENCY,
+    token_budget: Optional[int] = EXPLAIN_SCAN_TOKEN_BUDGET,
+    time_budget: Optional[float] = EXPLAIN_SCAN_TIME_BUDGET
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Token-by-token explanation events for a completed scan
+    (see SecurityLLMExplainer.astream_policies).
+    """
+    if not scan_data or "roles" not in scan_data:
+        yield {"event": "done", "findings": 0}
+        return
+
+    explainer = explainer or await asyncio.to_thread(get_explainer)
+    items = _policies_to_explain(scan_data)
+    budget = ExplainBudget(max_tokens=token_budget, max_seconds=time_budget)
+
+    logger.info(f"Streaming AI explanations for {len(items)} policies")
+
+    async for event in explainer.astream_policies(
+        items,
+        limiter=asyncio.Semaphore(concurrency),
+        budget=budget
+    ):
+        if event["event"] == "done":
+            event["budget"] = budget.to_dict()
+        yield event
+
+
+def explain_scan_results(
+    scan_data: Dict[str, Any],
+    explainer: Optional["SecurityLLMExplainer"] = None,
+    **options
+) -> Dict[str, Any]:
+    """
+    Blocking wrapper for scripts and benchmarks.
+    The API awaits explain_scan_results_async directly.
+    """
+    return asyncio.run(explain_scan_results_async(scan_data, explainer, **options))
@@ -0,0 +1,194 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.explain_scheduler import severity_of
+from backend.services.scan_query import (
+    POLICY_KINDS,
+    completed_results,
+    current_revision,
+    data_revision,
+    is_service_role,
+    role_risk_score,
+)
+from backend.utils.constants import SCAN_RESULTS_CACHE_ENTRIES
+
+# (role index, policy kind index, policy index)
+Posting = Tuple[int, int, int]
+
+
+class FindingsIndex:
+    """
+    Secondary indexes over a completed scan:
+    finding title -> policies, severity -> roles, and roles ranked by
+    risk score. Built once; queries never walk the whole scan.
+    """
+
+    def __init__(self, scan_data: Dict[str, Any]):
+        started = time.perf_counter()
+
+        # A list even for spilled scans: queries index roles by position
+        self.roles: List[Dict[str, Any]] = list(scan_data.get("roles", []))
+        self.by_title: Dict[str, List[Posting]] = {}
+        self.by_title_severity: Dict[Tuple[str, str], List[Posting]] = {}
+        self.by_severity: Dict[str, List[int]] = {}
+        self.risk_scores: List[int] = []
+
+        postings = 0
+        for r, role in enumerate(self.roles):
+            self.risk_scores.append(role_risk_score(role))
+            role_severities = set()
+
+            for k, kind in enumerate(POLICY_KINDS):
+                for p, policy in enumerate(role.get(kind, [])):
+                    seen = set()
+                    for finding in policy.get("Findings", []):
+                        title, severity = finding["title"], severity_of(finding)
+                        role_severities.add(severity)
+                        if (title, severity) in seen:
+                            continue
+                        seen.add((title, severity))
+
+                        posting = (r, k, p)
+                        self.by_title.setdefault(title, [])
+                        if not self.by_title[title] or self.by_title[title][-1] != posting:
+                            self.by_title[title].append(posting)
+                        self.by_title_severity.setdefault((title, severity), []).append(posting)
+                        postings += 1
+
+            for severity in role_severities:
+                self.by_severity.setdefault(severity, []).append(r)
+
+        # Highest risk first; ties keep scan order
+        self.ranked: List[int] = sorted(
+            range(len(self.roles)), key=lambda r: -self.risk_scores[r]
+        )
+
+        self.stats = {
+            "roles": len(self.roles),
+            "postings": postings,
+            "titles": len(self.by_title),
+            "build_seconds": round(time.perf_counter() - started, 4),
+        }
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def top_roles(self, k: int = 50, exclude_service_roles: bool = False) -> List[Dict[str, Any]]:
+        top = []
+        for r in self.ranked:
+            if exclude_service_roles and is_service_role(self.roles[r]):
+                continue
+            top.append(self._role_view(r))
+            if len(top) >= k:
+                break
+        return top
+
+    def roles_with_severity(self, severity: str, exclude_service_roles: bool = False) -> List[Dict[str, Any]]:
+        return [
+            self._role_view(r)
+            for r in self.by_severity.get(severity.upper(), [])
+            if not (exclude_service_roles and is_service_role(self.roles[r]))
+        ]
+
+    def policies_with(
+        self,
+        title: str,
+        severity: Optional[str] = None,
+        exclude_service_roles: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Policies carrying a finding `title` (optionally of one severity),
+        in scan order.
+        """
+        if severity:
+            postings = self.by_title_severity.get((title, severity.upper()), [])
+        else:
+            postings = self.by_title.get(title, [])
+
+        if exclude_service_roles:
+            postings = [p for p in postings if not is_service_role(self.roles[p[0]])]
+
+        page = postings[offset:offset + limit] if limit is not None else postings[offset:]
+        return {
+            "policies": [self._policy_view(posting, title, severity) for posting in page],
+            "total": len(postings),
+            "offset": offset,
+            "returned": len(page),
+        }
+
+    def _role_view(self, r: int) -> Dict[str, Any]:
+        role = self.roles[r]
+        return {
+            "RoleName": role.get("RoleName"),
+            "Arn": role.get("Arn"),
+            "RiskScore": self.risk_scores[r],
+        }
+
+    def _policy_view(self, posting: Posting, title: str, severity: Optional[str]) -> Dict[str, Any]:
+        r, k, p = posting
+        role = self.roles[r]
+        policy = role[POLICY_KINDS[k]][p]
+        return {
+            "RoleName": role.get("RoleName"),
+            "PolicyName": policy.get("PolicyName"),
+            "PolicyArn": policy.get("PolicyArn"),
+            "PolicyType": POLICY_KINDS[k],
+            "RiskScore": policy.get("RiskScore", 0),
+            "Findings": [
+                finding for finding in policy.get("Findings", [])
+                if finding["title"] == title
+                and (not severity or severity_of(finding) == severity.upper())
+            ],
+        }
+
+
+# --------------------------------------------------
+# Per-Scan Index Cache
+# --------------------------------------------------
+_indexes: "OrderedDict[str, Tuple[int, FindingsIndex]]" = OrderedDict()
+_indexes_lock = Lock()
+
+
+def _remember(job_id: str, revision: int, index: FindingsIndex) -> None:
+    with _indexes_lock:
+        _indexes[job_id] = (revision, index)
+        _indexes.move_to_end(job_id)
+        while len(_indexes) > SCAN_RESULTS_CACHE_ENTRIES:
+            _indexes.popitem(last=False)
+
+
+def forget_index(job_id: str) -> None:
+    with _indexes_lock:
+        _indexes.pop(job_id, None)
+
+
+def build_index(job_id: str, scan_data: Dict[str, Any]) -> FindingsIndex:
+    index = FindingsIndex(scan_data)
+    _remember(job_id, data_revision(scan_data), index)
+    return index
+
+
+def get_index(store, job_id: str) -> Optional[FindingsIndex]:
+    """
+    Index of a completed scan, rebuilt from the job store when this
+    process has not built it for the stored revision yet (restart,
+    other worker, patched scan).
+    """
+    revision = current_revision(store, job_id)
+    if revision is None:
+        return None
+
+    with _indexes_lock:
+        cached = _indexes.get(job_id)
+        if cached is not None and cached[0] == revision:
+            _indexes.move_to_end(job_id)
+            return cached[1]
+
+    data = completed_results(store, job_id, revision)
+    if data is None:
+        return None
+    return build_index(job_id, data)
@@ -0,0 +1,437 @@
+"""
+Event-driven re-analysis: IAM change events (CloudTrail records, raw or
+in an EventBridge envelope) are mapped to the roles they affect,
+debounced per role, and only those roles are re-scanned and patched
+into the latest completed scan.
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.access_advisor import GrantedServices, unused_access_days, add_unused_access_findings
+from backend.aws_scanner import get_iam_client, get_role, get_roles_for_policy, scan_role
+from backend.policy_analyzer import PolicyRiskAnalyzer
+from backend.result_sink import open_result_sink, spilled_roles
+from backend.services.scan_query import summarize_scan, forget_results, job_revision
+from backend.services.findings_index import forget_index
+from backend.services.scan_diff import get_fingerprint, patch_fingerprint, store_fingerprint
+from backend.services.scan_export import forget_tables
+from backend.utils.metrics import IAM_EVENTS, IAM_EVENT_TO_PATCH_SECONDS
+from backend.utils.constants import (
+    JOB_STATUS_COMPLETED,
+    IAM_EVENT_DEBOUNCE_SECONDS,
+    IAM_EVENT_MAX_WAIT_SECONDS,
+    IAM_EVENT_POLL_SECONDS,
+    IAM_EVENT_LEASE_SECONDS,
+    IAM_EVENT_PATCH_ATTEMPTS,
+)
+
+logger = logging.getLogger("cloud-security-copilot")
+
+# Events naming the role in requestParameters.roleName
+ROLE_EVENTS = {
+    "CreateRole",
+    "UpdateAssumeRolePolicy",
+    "PutRolePolicy",
+    "DeleteRolePolicy",
+    "AttachRolePolicy",
+    "DetachRolePolicy",
+}
+# Managed policy changes affect every role the policy is attached to
+POLICY_EVENTS = {
+    "CreatePolicyVersion",
+    "SetDefaultPolicyVersion",
+}
+DELETE_EVENTS = {"DeleteRole"}
+
+
+def event_roles(
+    record: Dict[str, Any],
+    roles_for_policy: Callable[[str], List[str]]
+) -> Tuple[Set[str], bool]:
+    """
+    Roles affected by one event, and whether they were deleted.
+    """
+    event = record.get("detail", record)
+    name = event.get("eventName")
+    params = event.get("requestParameters") or {}
+
+    if event.get("errorCode"):
+        return set(), False  # the call failed, nothing changed
+    if name in ROLE_EVENTS or name in DELETE_EVENTS:
+        role_name = params.get("roleName")
+        return ({role_name} if role_name else set()), name in DELETE_EVENTS
+    if name in POLICY_EVENTS and params.get("policyArn"):
+        return set(roles_for_policy(params["policyArn"])), False
+    return set(), False
+
+
+# --------------------------------------------------
+# Event Sources (stand-ins for SQS / EventBridge)
+# --------------------------------------------------
+class QueueEventSource:
+    """
+    In-process queue; fed by POST /events/iam or directly in tests.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[float, Dict[str, Any]]]" = queue.Queue()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        self._queue.put((time.monotonic(), record))
+
+    def read(self, timeout: float) -> List[Tuple[float, Dict[str, Any]]]:
+        try:
+            records = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                return records
+
+
+class FileEventSource:
+    """
+    Tails a JSON-lines file of CloudTrail records, one per line.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+
+    def read(self, timeout: float) -> List[Tuple[float, Dict[str, Any]]]:
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partial write; read it next time
+                    self._offset += len(line)
+                    if line.strip():
+                        records.append((time.monotonic(), json.loads(line)))
+
+        if not records:
+            time.sleep(timeout)
+        return records
+
+
+# --------------------------------------------------
+# Debouncing
+# --------------------------------------------------
+@dataclass
+class PendingRole:
+    first_seen: float
+    last_seen: float
+    deleted: bool = False
+    events: int = 0
+    retry_at: float = 0.0  # set when a failed flush put the role back
+
+
+class RoleDebouncer:
+    """
+    Collects changed roles; a role is due once it has been quiet for
+    `debounce` seconds, or `max_wait` after its first event.
+    """
+
+    def __init__(
+        self,
+        debounce: float = IAM_EVENT_DEBOUNCE_SECONDS,
+        max_wait: float = IAM_EVENT_MAX_WAIT_SECONDS
+    ):
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.pending: Dict[str, PendingRole] = {}
+
+    def add(self, role_name: str, deleted: bool, received_at: float) -> None:
+        entry = self.pending.get(role_name)
+        if entry is None:
+            entry = self.pending[role_name] = PendingRole(first_seen=received_at, last_seen=received_at)
+        entry.last_seen = max(entry.last_seen, received_at)
+        entry.deleted = deleted  # the latest event wins (DeleteRole, then CreateRole)
+        entry.events += 1
+
+    def requeue(self, entries: Dict[str, PendingRole], now: float) -> None:
+        """
+        Put back roles whose re-scan or patch failed, merged with events
+        received since; they are due again after another `debounce`.
+        """
+        for name, entry in entries.items():
+            newer = self.pending.get(name)
+            if newer is not None:
+                entry.last_seen = max(entry.last_seen, newer.last_seen)
+                entry.deleted = newer.deleted
+                entry.events += newer.events
+            entry.retry_at = now + self.debounce
+            self.pending[name] = entry
+
+    def _deadline(self, entry: PendingRole) -> float:
+        return max(entry.retry_at, min(entry.last_seen + self.debounce, entry.first_seen + self.max_wait))
+
+    def due(self, now: float) -> Dict[str, PendingRole]:
+        ready = {name: entry for name, entry in self.pending.items() if self._deadline(entry) <= now}
+        for name in ready:
+            del self.pending[name]
+        return ready
+
+    def next_deadline(self) -> Optional[float]:
+        return min((self._deadline(entry) for entry in self.pending.values()), default=None)
+
+
+# --------------------------------------------------
+# Patching
+# --------------------------------------------------
+def latest_completed_scan(store) -> Optional[str]:
+    jobs = store.list_jobs(status=JOB_STATUS_COMPLETED, limit=1)
+    return jobs[0]["job_id"] if jobs else None
+
+
+def patch_scan(store, job_id: str, updates: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Replace, add or (for None) remove roles by name in a stored scan,
+    then refresh its summary and fingerprint. Readers holding the old
+    result keep an unmodified copy (for a spilled scan: the old segment
+    file, which the store removes after a grace period; the patched
+    roles stream into a new one).
+
+    The write is conditional on the revision that was read; a patch
+    that loses to one from another worker is re-applied on top of it.
+    """
+    for attempt in range(1, IAM_EVENT_PATCH_ATTEMPTS + 1):
+        summary = _patch_once(store, job_id, updates)
+        if summary is not None:
+            return summary
+        logger.info(f"[IAM EVENTS] scan {job_id} was patched concurrently; retrying ({attempt})")
+    raise RuntimeError(f"Scan {job_id} kept changing; patch not applied")
+
+
+def _patch_once(store, job_id: str, updates: Dict[str, Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    job = store.get(job_id)
+    revision = job_revision(job)
+    old = job["data"]
+    metadata = dict(old.get("scan_metadata", {}))
+    metadata["patched_at"] = datetime.utcnow().isoformat()
+    metadata["patches"] = revision + 1
+
+    spilled = spilled_roles(old)
+    # Unique per attempt: a concurrent patch may be writing the same revision
+    segment = f"{job_id}.{metadata['patches']}.{uuid.uuid4().hex[:8]}"
+    roles = open_result_sink(segment) if spilled is not None else []
+    pending = dict(updates)
+    removed, added = [], []
+
+    # Changed roles keep their position; new ones go last, in update order
+    for role in old.get("roles", []):
+        if role.get("RoleName") in pending:
+            removed.append(role)
+            role = pending.pop(role.get("RoleName"))
+            if role is None:
+                continue
+            added.append(role)
+        roles.append(role)
+
+    for role in pending.values():
+        if role is not None:
+            added.append(role)
+            roles.append(role)
+
+    if spilled is not None:
+        scan_summary = roles.summary.to_dict()
+        roles = roles.finish()
+    data = {**old, "scan_metadata": metadata, "roles": roles}
+
+    summary = {
+        **(scan_summary if spilled is not None else summarize_scan(data)),
+        "timings": (job.get("summary") or {}).get("timings", {}),
+        "patched_at": metadata["patched_at"],
+        "patches": metadata["patches"],
+    }
+
+    fingerprint = patch_fingerprint(get_fingerprint(store, job_id), removed, added)
+
+    # One write: the summary carries the revision (and so the ETag), and
+    # readers in every process compare it with their cached copies
+    if not store.update(job_id, expected_revision=revision, data=data, summary=summary):
+        return None
+    store_fingerprint(store, job_id, data, fingerprint)
+
+    forget_results(job_id)
+    forget_index(job_id)
+    forget_tables(job_id)
+    return summary
+
+
+# --------------------------------------------------
+# Consumer
+# --------------------------------------------------
+class IAMEventConsumer:
+    """
+    Background thread: read events, debounce per role, re-scan due roles
+    with the scanner helpers and patch the latest completed scan.
+
+    With `lease`, only the worker holding that job store lease reads the
+    source; the others stand by and take over once it expires.
+    """
+
+    def __init__(
+        self,
+        store,
+        source,
+        iam=None,
+        debouncer: Optional[RoleDebouncer] = None,
+        on_patched: Optional[Callable[[str, Dict[str, PendingRole]], None]] = None,
+        lease: Optional[str] = None
+    ):
+        self.store = store
+        self.source = source
+        self.debouncer = debouncer or RoleDebouncer()
+        self.on_patched = on_patched
+        self.lease = lease
+        self._owner = f"{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        self._iam = iam
+        self._analyzer = PolicyRiskAnalyzer()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def iam(self):
+        # Created on first use so the API starts without AWS configuration
+        if self._iam is None:
+            self._iam = get_iam_client()
+        return self._iam
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="iam-event-consumer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.lease is not None:
+            self.store.release_lease(self.lease, self._owner)
+
+    def holds_lease(self) -> bool:
+        """
+        Take or renew the lease; always True without one.
+        """
+        return self.lease is None or self.store.acquire_lease(self.lease, self._owner, IAM_EVENT_LEASE_SECONDS)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self.holds_lease():
+                    self._stop.wait(IAM_EVENT_POLL_SECONDS)
+                    continue
+            except Exception:
+                logger.exception("[IAM EVENTS] lease renewal failed")
+                self._stop.wait(IAM_EVENT_POLL_SECONDS)
+                continue
+
+            deadline = self.debouncer.next_deadline()
+            timeout = IAM_EVENT_POLL_SECONDS
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+
+            try:
+                self.ingest(self.source.read(timeout))
+                self.flush()
+            except Exception:
+                logger.exception("[IAM EVENTS] consumer iteration failed")
+
+    def ingest(self, records: Iterable[Tuple[float, Dict[str, Any]]]) -> None:
+        attachments: Dict[str, List[str]] = {}
+
+        def roles_for_policy(policy_arn: str) -> List[str]:
+            # One lookup per policy per read, however many versions were pushed
+            if policy_arn not in attachments:
+                attachments[policy_arn] = get_roles_for_policy(self.iam, policy_arn)
+            return attachments[policy_arn]
+
+        for received_at, record in records:
+            roles, deleted = event_roles(record, roles_for_policy)
+            IAM_EVENTS.inc(outcome="mapped" if roles else "ignored")
+            for role_name in roles:
+                self.debouncer.add(role_name, deleted, received_at)
+
+    def flush(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = now if now is not None else time.monotonic()
+        due = self.debouncer.due(now)
+        if not due:
+            return None
+
+        try:
+            patched = self._patch(due)
+        except Exception:
+            # Not lost: retried with the next flush after the debounce
+            self.debouncer.requeue(due, now)
+            raise
+        if patched is None:
+            return None
+        job_id, summary = patched
+
+        patched_at = time.monotonic()
+        for entry in due.values():
+            IAM_EVENT_TO_PATCH_SECONDS.observe(patched_at - entry.first_seen)
+        IAM_EVENTS.inc(len(due), outcome="roles_patched")
+        logger.info(
+            f"[IAM EVENTS] patched scan {job_id}: {len(due)} roles "
+            f"from {sum(entry.events for entry in due.values())} events"
+        )
+
+        if self.on_patched:
+            self.on_patched(job_id, due)
+        return summary
+
+    def _patch(self, due: Dict[str, PendingRole]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        from botocore.exceptions import ClientError
+
+        job_id = latest_completed_scan(self.store)
+        if job_id is None:
+            logger.info(f"[IAM EVENTS] no completed scan to patch; dropped {len(due)} roles")
+            return None
+
+        days = unused_access_days()
+        updates = {}
+        granted: Dict[str, GrantedServices] = {}
+        for role_name, entry in due.items():
+            self.holds_lease()  # renew through long re-scans
+            try:
+                role = None if entry.deleted else get_role(self.iam, role_name)
+                role_granted = granted.setdefault(role_name, {}) if days else None
+                updates[role_name] = scan_role(self.iam, self._analyzer, role, granted=role_granted) if role else None
+            except ClientError as e:
+                logger.warning(f"[IAM EVENTS] re-scan of {role_name} failed, keeping previous result: {e}")
+
+        if not updates:
+            return None
+
+        # Same unused-access check as a full scan, for the re-scanned roles only
+        rescanned = [role for role in updates.values() if role is not None]
+        if days and rescanned:
+            add_unused_access_findings(self.iam, {"roles": rescanned}, granted, days)
+
+        return job_id, patch_scan(self.store, job_id, updates)
+
+
+def create_event_consumer(store) -> IAMEventConsumer:
+    """
+    Consumer reading IAM_EVENTS_FILE (JSON lines) if set, otherwise the
+    in-process queue behind POST /events/iam. Every worker tails the file
+    otherwise, so a file consumer runs under a job store lease; queued
+    events reach only the worker that received the POST.
+    """
+    path = os.getenv("IAM_EVENTS_FILE")
+    if path:
+        return IAMEventConsumer(store, FileEventSource(path), lease=f"iam-events:{os.path.abspath(path)}")
+    return IAMEventConsumer(store, QueueEventSource())
@@ -0,0 +1,299 @@
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.explain_scheduler import severity_of
+from backend.services.scan_query import POLICY_KINDS, completed_results, current_revision, data_revision
+from backend.utils.serialization import dumps
+from backend.utils.constants import (
+    FINGERPRINT_VERSION,
+    FINGERPRINT_BUCKETS,
+    SCAN_RESULTS_CACHE_ENTRIES,
+)
+
+FINGERPRINT_ARTIFACT = "fingerprint"
+
+
+def _hash(data: bytes) -> str:
+    return blake2b(data, digest_size=16).hexdigest()
+
+
+def role_key(role: Dict[str, Any]) -> str:
+    return role.get("Arn") or role.get("RoleName") or ""
+
+
+def policy_key(kind: str, policy: Dict[str, Any]) -> str:
+    return f"{kind}:{policy.get('PolicyArn') or policy.get('PolicyName')}"
+
+
+def _bucket(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=4).digest(), "big") % FINGERPRINT_BUCKETS
+
+
+# --------------------------------------------------
+# Fingerprints
+# --------------------------------------------------
+def _finding_fingerprints(rkey: str, pkey: str, findings: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Stable identity per finding: role, policy, title and statement.
+    Severity is the value compared, so a re-rated finding is "changed".
+    """
+    fingerprints = {}
+    for finding in findings:
+        identity = f"{rkey}|{pkey}|{finding['title']}|{finding.get('statement_index')}"
+        fp = _hash(identity.encode())
+        n = 1
+        while fp in fingerprints:  # same title twice on one statement
+            fp = _hash(f"{identity}|{n}".encode())
+            n += 1
+        fingerprints[fp] = [finding["title"], severity_of(finding), finding.get("statement_index")]
+    return fingerprints
+
+
+def _fingerprint_role(role: Dict[str, Any]) -> Dict[str, Any]:
+    rkey = role_key(role)
+    policies = {}
+    for kind in POLICY_KINDS:
+        for policy in role.get(kind, []):
+            pkey = policy_key(kind, policy)
+            policies[pkey] = {
+                "hash": _hash(dumps(policy, sort_keys=True)),
+                "findings": _finding_fingerprints(rkey, pkey, policy.get("Findings", [])),
+            }
+
+    attributes = {key: value for key, value in role.items() if key not in POLICY_KINDS}
+    role_hash = _hash(dumps(
+        {**attributes, "policies": sorted((k, v["hash"]) for k, v in policies.items())},
+        sort_keys=True
+    ))
+    return {"RoleName": role.get("RoleName"), "hash": role_hash, "policies": policies}
+
+
+def _bucket_hash(members: Dict[str, str]) -> str:
+    return _hash(dumps(sorted(members.items())))
+
+
+def fingerprint_scan(scan_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Content hashes of a scan: per policy, per role and per bucket of
+    roles, plus a fingerprint for every finding.
+
+    Two scans whose bucket hashes match have identical roles in that
+    bucket, so a diff only descends into buckets that changed.
+    """
+    started = time.perf_counter()
+    roles: Dict[str, Dict[str, Any]] = {}
+    bucket_roles: List[Dict[str, str]] = [{} for _ in range(FINGERPRINT_BUCKETS)]
+
+    for role in scan_data.get("roles", []):
+        rkey = role_key(role)
+        roles[rkey] = _fingerprint_role(role)
+        bucket_roles[_bucket(rkey)][rkey] = roles[rkey]["hash"]
+
+    buckets = [_bucket_hash(members) for members in bucket_roles]
+
+    return {
+        "version": FINGERPRINT_VERSION,
+        "scan_hash": _hash("".join(buckets).encode()),
+        "buckets": buckets,
+        "bucket_roles": bucket_roles,
+        "roles": roles,
+        "build_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def patch_fingerprint(
+    fingerprint: Dict[str, Any],
+    removed: List[Dict[str, Any]],
+    added: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Fingerprint after replacing `removed` roles with `added` ones,
+    rehashing only the buckets they fall in. The input is not modified.
+    """
+    patched = {
+        **fingerprint,
+        "roles": dict(fingerprint["roles"]),
+        "buckets": list(fingerprint["buckets"]),
+        "bucket_roles": list(fingerprint["bucket_roles"]),
+    }
+    touched = set()
+
+    def members(rkey: str) -> Dict[str, str]:
+        b = _bucket(rkey)
+        if b not in touched:
+            patched["bucket_roles"][b] = dict(patched["bucket_roles"][b])
+            touched.add(b)
+        return patched["bucket_roles"][b]
+
+    for role in removed:
+        rkey = role_key(role)
+        patched["roles"].pop(rkey, None)
+        members(rkey).pop(rkey, None)
+
+    for role in added:
+        rkey = role_key(role)
+        patched["roles"][rkey] = _fingerprint_role(role)
+        members(rkey)[rkey] = patched["roles"][rkey]["hash"]
+
+    for b in touched:
+        patched["buckets"][b] = _bucket_hash(patched["bucket_roles"][b])
+    patched["scan_hash"] = _hash("".join(patched["buckets"]).encode())
+    return patched
+
+
+# --------------------------------------------------
+# Diff
+# --------------------------------------------------
+def _findings(pkey: str, findings: Dict[str, List[Any]], fps) -> List[Dict[str, Any]]:
+    return [
+        {
+            "fingerprint": fp,
+            "policy": pkey,
+            "title": findings[fp][0],
+            "severity": findings[fp][1],
+            "statement_index": findings[fp][2],
+        }
+        for fp in fps
+    ]
+
+
+def _role_diff(rkey: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    old_policies = old["policies"] if old else {}
+    new_policies = new["policies"] if new else {}
+
+    record = {
+        "role": rkey,
+        "RoleName": (new or old)["RoleName"],
+        "change": "added" if old is None else "removed" if new is None else "changed",
+        "policies_added": sorted(new_policies.keys() - old_policies.keys()),
+        "policies_removed": sorted(old_policies.keys() - new_policies.keys()),
+        "findings_new": [],
+        "findings_resolved": [],
+        "findings_changed": [],
+    }
+
+    for pkey in sorted(old_policies.keys() | new_policies.keys()):
+        before = old_policies.get(pkey)
+        after = new_policies.get(pkey)
+        if before and after and before["hash"] == after["hash"]:
+            continue
+
+        old_findings = before["findings"] if before else {}
+        new_findings = after["findings"] if after else {}
+
+        record["findings_new"] += _findings(pkey, new_findings, new_findings.keys() - old_findings.keys())
+        record["findings_resolved"] += _findings(pkey, old_findings, old_findings.keys() - new_findings.keys())
+        for fp in old_findings.keys() & new_findings.keys():
+            if old_findings[fp][1] != new_findings[fp][1]:
+                entry = _findings(pkey, new_findings, [fp])[0]
+                entry["previous_severity"] = old_findings[fp][1]
+                record["findings_changed"].append(entry)
+
+    return record
+
+
+def iter_diff(base: Dict[str, Any], target: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one record per added, removed or changed role. Only buckets
+    whose hashes differ are visited, so cost follows the number of
+    changed roles rather than the size of the account.
+    """
+    for b, (old_hash, new_hash) in enumerate(zip(base["buckets"], target["buckets"])):
+        if old_hash == new_hash:
+            continue
+
+        old_members = base["bucket_roles"][b]
+        new_members = target["bucket_roles"][b]
+        for rkey in sorted(old_members.keys() | new_members.keys()):
+            if old_members.get(rkey) == new_members.get(rkey):
+                continue
+            yield _role_diff(rkey, base["roles"].get(rkey), target["roles"].get(rkey))
+
+
+def diff_summary(records: List[Dict[str, Any]], summary: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Counts over diff records, optionally added onto a running summary.
+    """
+    summary = dict(summary) if summary else {
+        "roles_added": 0,
+        "roles_removed": 0,
+        "roles_changed": 0,
+        "findings_new": 0,
+        "findings_resolved": 0,
+        "findings_changed": 0,
+    }
+    for record in records:
+        summary[f"roles_{record['change']}"] += 1
+        for field in ("findings_new", "findings_resolved", "findings_changed"):
+            summary[field] += len(record[field])
+    return summary
+
+
+def diff_scans(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    records = list(iter_diff(base, target))
+    return {
+        "identical": base["scan_hash"] == target["scan_hash"],
+        "summary": diff_summary(records),
+        "roles": records,
+    }
+
+
+# --------------------------------------------------
+# Per-Scan Fingerprint Cache
+# --------------------------------------------------
+_fingerprints: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_fingerprints_lock = Lock()
+
+
+def _remember(job_id: str, fingerprint: Dict[str, Any]) -> None:
+    with _fingerprints_lock:
+        _fingerprints[job_id] = fingerprint
+        _fingerprints.move_to_end(job_id)
+        while len(_fingerprints) > SCAN_RESULTS_CACHE_ENTRIES:
+            _fingerprints.popitem(last=False)
+
+
+def store_fingerprint(
+    store,
+    job_id: str,
+    scan_data: Dict[str, Any],
+    fingerprint: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    fingerprint = {**(fingerprint or fingerprint_scan(scan_data)), "revision": data_revision(scan_data)}
+    store.put_artifact(job_id, FINGERPRINT_ARTIFACT, fingerprint)
+    _remember(job_id, fingerprint)
+    return fingerprint
+
+
+def get_fingerprint(store, job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint of a completed scan: from memory, then the job store,
+    and computed from the results for scans stored before fingerprints
+    existed. Only a fingerprint of the stored revision is used.
+    """
+    revision = current_revision(store, job_id)
+    if revision is None:
+        return None
+
+    with _fingerprints_lock:
+        cached = _fingerprints.get(job_id)
+        if cached is not None and cached.get("revision", 0) == revision:
+            _fingerprints.move_to_end(job_id)
+            return cached
+
+    fingerprint = store.get_artifact(job_id, FINGERPRINT_ARTIFACT)
+    if (
+        fingerprint is not None
+        and fingerprint.get("version") == FINGERPRINT_VERSION
+        and fingerprint.get("revision", 0) == revision
+    ):
+        _remember(job_id, fingerprint)
+        return fingerprint
+
+    data = completed_results(store, job_id, revision)
+    if data is None:
+        return None
+    return store_fingerprint(store, job_id, data)
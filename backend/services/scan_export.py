@@ -0,0 +1,270 @@
+"""
+Columnar export of completed scans: three flat tables (roles, policies,
+findings) as Arrow, written to Parquet or streamed as Arrow IPC.
+
+pyarrow is optional; without it `export_available()` is False and the
+export endpoints answer 501. It is imported on the first export (or
+availability check), not with the API.
+"""
+
+import os
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.explain_scheduler import severity_of
+from backend.services.scan_query import POLICY_KINDS, POLICY_TYPES, data_revision, is_service_role
+from backend.utils.constants import (
+    EXPORT_BATCH_ROWS,
+    EXPORT_PARQUET_COMPRESSION,
+    EXPORT_CACHE_ENTRIES,
+)
+
+logger = logging.getLogger("cloud-security-copilot")
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+EXPORT_DIR = os.path.join(BASE_DIR, "exports")
+
+EXPORT_TABLES = ("roles", "policies", "findings")
+PARTITION_COLUMNS = ["account_id", "scan_date"]
+
+# Repetitive strings are stored once per batch / row group; finding
+# descriptions come from a few templates, so they repeat too
+_DICTIONARY_COLUMNS = {
+    "scan_id", "account_id", "scan_date", "role_name", "policy_name",
+    "policy_type", "finding_id", "title", "severity", "description",
+}
+
+_SCHEMAS = {
+    "roles": [
+        ("scan_id", "string"), ("account_id", "string"), ("scan_date", "string"),
+        ("role_name", "string"), ("role_arn", "string"), ("is_service_role", "bool_"),
+        ("risk_score", "int32"), ("policies", "int32"),
+    ],
+    "policies": [
+        ("scan_id", "string"), ("account_id", "string"), ("scan_date", "string"),
+        ("role_name", "string"), ("policy_name", "string"), ("policy_arn", "string"),
+        ("policy_type", "string"), ("risk_score", "int32"), ("findings", "int32"),
+    ],
+    "findings": [
+        ("scan_id", "string"), ("account_id", "string"), ("scan_date", "string"),
+        ("role_name", "string"), ("policy_name", "string"), ("policy_type", "string"),
+        ("finding_id", "string"), ("title", "string"), ("severity", "string"),
+        ("statement_index", "int32"), ("description", "string"),
+    ],
+}
+
+
+pa = pq = None
+_pyarrow_checked = False
+_pyarrow_lock = Lock()
+
+
+def _load_pyarrow() -> bool:
+    global pa, pq, _pyarrow_checked
+
+    with _pyarrow_lock:
+        if not _pyarrow_checked:
+            try:
+                import pyarrow
+                import pyarrow.parquet
+                pa, pq = pyarrow, pyarrow.parquet
+            except ImportError:  # optional: export disabled
+                pass
+            _pyarrow_checked = True
+    return pa is not None
+
+
+def export_available() -> bool:
+    return _load_pyarrow()
+
+
+def account_of(arn: Optional[str]) -> str:
+    # arn:aws:iam::123456789012:role/name
+    parts = (arn or "").split(":")
+    return parts[4] if len(parts) > 5 and parts[4] else "unknown"
+
+
+# --------------------------------------------------
+# Flattening
+# --------------------------------------------------
+def flatten_scan(scan_id: str, scan_data: Dict[str, Any]) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Column lists for the roles, policies and findings tables.
+    Every row carries scan id, account and scan date for partitioning.
+    """
+    columns = {table: {name: [] for name, _ in schema} for table, schema in _SCHEMAS.items()}
+    roles, policies, findings = columns["roles"], columns["policies"], columns["findings"]
+    scan_date = (scan_data.get("scan_metadata", {}).get("scan_time") or "")[:10] or "unknown"
+
+    for role in scan_data.get("roles", []):
+        role_name = role.get("RoleName")
+        account = account_of(role.get("Arn"))
+        role_policies = role_risk = 0
+
+        for kind in POLICY_KINDS:
+            policy_type = POLICY_TYPES[kind]
+
+            for policy in role.get(kind, []):
+                role_policies += 1
+                role_risk += policy.get("RiskScore", 0)
+                policy_findings = policy.get("Findings", [])
+
+                for name, value in (
+                    ("scan_id", scan_id), ("account_id", account), ("scan_date", scan_date),
+                    ("role_name", role_name), ("policy_name", policy.get("PolicyName")),
+                    ("policy_arn", policy.get("PolicyArn")), ("policy_type", policy_type),
+                    ("risk_score", policy.get("RiskScore", 0)), ("findings", len(policy_findings)),
+                ):
+                    policies[name].append(value)
+
+                # Hottest loop: appends inlined
+                for finding in policy_findings:
+                    findings["scan_id"].append(scan_id)
+                    findings["account_id"].append(account)
+                    findings["scan_date"].append(scan_date)
+                    findings["role_name"].append(role_name)
+                    findings["policy_name"].append(policy.get("PolicyName"))
+                    findings["policy_type"].append(policy_type)
+                    findings["finding_id"].append(finding.get("id"))
+                    findings["title"].append(finding["title"])
+                    findings["severity"].append(severity_of(finding))
+                    findings["statement_index"].append(finding.get("statement_index"))
+                    findings["description"].append(finding.get("description"))
+
+        for name, value in (
+            ("scan_id", scan_id), ("account_id", account), ("scan_date", scan_date),
+            ("role_name", role_name), ("role_arn", role.get("Arn")),
+            ("is_service_role", is_service_role(role)), ("risk_score", role_risk),
+            ("policies", role_policies),
+        ):
+            roles[name].append(value)
+
+    return columns
+
+
+def to_arrow(columns: Dict[str, Dict[str, List[Any]]]) -> Dict[str, "pa.Table"]:
+    _load_pyarrow()
+    tables = {}
+    for table, schema in _SCHEMAS.items():
+        arrays, names = [], []
+        for name, type_name in schema:
+            array = pa.array(columns[table][name], type=getattr(pa, type_name)())
+            if name in _DICTIONARY_COLUMNS:
+                array = array.dictionary_encode()
+            arrays.append(array)
+            names.append(name)
+        tables[table] = pa.Table.from_arrays(arrays, names=names)
+    return tables
+
+
+# --------------------------------------------------
+# Per-Scan Table Cache
+# --------------------------------------------------
+_tables: "OrderedDict[str, Tuple[int, Dict[str, pa.Table]]]" = OrderedDict()
+_tables_lock = Lock()
+
+
+def scan_tables(scan_id: str, scan_data: Dict[str, Any]) -> Dict[str, "pa.Table"]:
+    """
+    Arrow tables of a completed scan, flattened once per revision and
+    kept in a small LRU (exports of one scan usually come in bursts).
+    """
+    revision = data_revision(scan_data)
+    with _tables_lock:
+        cached = _tables.get(scan_id)
+        if cached is not None and cached[0] == revision:
+            _tables.move_to_end(scan_id)
+            return cached[1]
+
+    tables = to_arrow(flatten_scan(scan_id, scan_data))
+
+    with _tables_lock:
+        _tables[scan_id] = (revision, tables)
+        _tables.move_to_end(scan_id)
+        while len(_tables) > EXPORT_CACHE_ENTRIES:
+            _tables.popitem(last=False)
+
+    return tables
+
+
+def forget_tables(scan_id: str) -> None:
+    with _tables_lock:
+        _tables.pop(scan_id, None)
+
+
+# --------------------------------------------------
+# Writers
+# --------------------------------------------------
+class _ChunkSink:
+    """
+    File-like sink collecting what the IPC writer emits, drained after
+    every record batch.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_arrow_stream(table: "pa.Table", batch_rows: int = EXPORT_BATCH_ROWS) -> Iterator[bytes]:
+    """
+    Arrow IPC stream format, yielded one record batch at a time.
+    """
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, table.schema)
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_bytes(table: "pa.Table") -> bytes:
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer, compression=EXPORT_PARQUET_COMPRESSION, use_dictionary=True)
+    return buffer.getvalue().to_pybytes()
+
+
+def write_parquet_dataset(scan_id: str, scan_data: Dict[str, Any], root: str = EXPORT_DIR) -> Dict[str, List[str]]:
+    """
+    Append a scan to the Parquet history under `root`, one dataset per
+    table, hive-partitioned by account_id and scan_date. Re-exporting a
+    scan replaces its own files only.
+    """
+    written: Dict[str, List[str]] = {}
+
+    for name, table in scan_tables(scan_id, scan_data).items():
+        paths: List[str] = []
+        pq.write_to_dataset(
+            table,
+            root_path=os.path.join(root, name),
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f"{scan_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            compression=EXPORT_PARQUET_COMPRESSION,
+            file_visitor=lambda written_file: paths.append(written_file.path),
+        )
+        written[name] = paths
+
+    logger.info(f"Exported scan {scan_id} to Parquet: {sum(len(p) for p in written.values())} files")
+    return written
@@ -0,0 +1,127 @@
+import time
+import asyncio
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from backend.utils.constants import (
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_CANCELLED,
+    SCAN_PROGRESS_MIN_INTERVAL,
+    SCAN_PROGRESS_MAX_JOBS,
+)
+
+TERMINAL_STATUSES = (JOB_STATUS_COMPLETED, JOB_STATUS_FAILED, JOB_STATUS_CANCELLED)
+
+_Subscriber = Tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+
+class ScanProgress:
+    """
+    Latest state of each scan (status, stage, role counters), published
+    from scan worker threads and pushed to async subscribers.
+
+    Subscribers are woken, not queued: they always read the newest
+    snapshot, so a fast scan never backs up a slow client. Counter
+    updates are throttled to `min_interval`; status and stage changes
+    are pushed immediately.
+    """
+
+    def __init__(self, min_interval: float = SCAN_PROGRESS_MIN_INTERVAL, max_jobs: int = SCAN_PROGRESS_MAX_JOBS):
+        self.min_interval = min_interval
+        self.max_jobs = max_jobs
+        self._states: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._last_push: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def publish(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            state = self._states.get(job_id)
+            if state is None:
+                state = self._states[job_id] = {
+                    "job_id": job_id,
+                    "status": None,
+                    "stage": None,
+                    "roles_total": None,
+                    "roles_done": None,
+                    "version": 0,
+                }
+            self._states.move_to_end(job_id)
+
+            transition = any(
+                name in fields and fields[name] != state[name] for name in ("status", "stage")
+            )
+            state.update(fields)
+            state["version"] += 1
+            state["updated_at"] = time.time()
+
+            now = time.monotonic()
+            if not transition and now - self._last_push.get(job_id, 0.0) < self.min_interval:
+                return
+            self._last_push[job_id] = now
+
+            subscribers = list(self._subscribers.get(job_id, ()))
+            self._evict()
+
+        for loop, event in subscribers:
+            loop.call_soon_threadsafe(event.set)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._states.get(job_id)
+            return dict(state) if state is not None else None
+
+    async def watch(self, job_id: str, timeout: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the current snapshot, then the newest one after every push.
+        Yields None after `timeout` seconds without a push.
+        """
+        subscriber = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscriber)
+
+        try:
+            yield self.snapshot(job_id)
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber[1].wait(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                subscriber[1].clear()
+                yield self.snapshot(job_id)
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+
+    def _evict(self) -> None:
+        # Oldest finished scans without listeners go first; the job
+        # store still has their final status
+        for job_id in list(self._states):
+            if len(self._states) <= self.max_jobs:
+                break
+            if job_id not in self._subscribers and self._states[job_id]["status"] in TERMINAL_STATUSES:
+                del self._states[job_id]
+                self._last_push.pop(job_id, None)
+
+
+def job_state(job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Progress-shaped state from a stored job, for scans this process is
+    not running (finished earlier, or running in another worker).
+    """
+    summary = job.get("summary") or {}
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "stage": None,
+        "roles_total": summary.get("roles_total"),
+        "roles_done": summary.get("roles_total"),
+        "error": job.get("error"),
+    }
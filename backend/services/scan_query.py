@@ -0,0 +1,266 @@
+import json
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from backend.explain_scheduler import severity_of
+from backend.utils.constants import (
+    SEVERITY_LOW,
+    SEVERITY_MEDIUM,
+    SEVERITY_HIGH,
+    SEVERITY_CRITICAL,
+    SERVICE_ROLE_PREFIX,
+    SCAN_RESULTS_CACHE_ENTRIES,
+)
+
+SEVERITIES = (SEVERITY_CRITICAL, SEVERITY_HIGH, SEVERITY_MEDIUM, SEVERITY_LOW)
+POLICY_KINDS = ("AttachedPolicies", "InlinePolicies", "TrustPolicies")
+POLICY_TYPES = {"AttachedPolicies": "managed", "InlinePolicies": "inline", "TrustPolicies": "trust"}
+
+
+# --------------------------------------------------
+# Role Helpers
+# --------------------------------------------------
+def iter_policies(role: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    for kind in POLICY_KINDS:
+        yield from role.get(kind, [])
+
+
+def role_risk_score(role: Dict[str, Any]) -> int:
+    return sum(policy.get("RiskScore", 0) for policy in iter_policies(role))
+
+
+def role_severities(role: Dict[str, Any]) -> set:
+    return {
+        severity_of(finding)
+        for policy in iter_policies(role)
+        for finding in policy.get("Findings", [])
+    }
+
+
+def is_service_role(role: Dict[str, Any]) -> bool:
+    return role.get("RoleName", "").startswith(SERVICE_ROLE_PREFIX)
+
+
+# --------------------------------------------------
+# Summary (computed once when a scan completes)
+# --------------------------------------------------
+class ScanSummary:
+    """
+    Severity counts and totals, updated one role at a time (a scan
+    streaming into a result sink is summarized as it goes).
+    Findings repeated within a policy (same title and severity) count once.
+    """
+
+    def __init__(self):
+        self.counts = {severity: 0 for severity in SEVERITIES}
+        self.counts_no_service = dict(self.counts)
+        self.roles = self.service_roles = self.policies = self.findings = self.max_risk = 0
+
+    def add(self, role: Dict[str, Any]) -> None:
+        service = is_service_role(role)
+        self.roles += 1
+        self.service_roles += service
+        self.max_risk = max(self.max_risk, role_risk_score(role))
+
+        for policy in iter_policies(role):
+            self.policies += 1
+            unique = {(f["title"], severity_of(f)) for f in policy.get("Findings", [])}
+            self.findings += len(unique)
+
+            for _, severity in unique:
+                self.counts[severity] = self.counts.get(severity, 0) + 1
+                if not service:
+                    self.counts_no_service[severity] = self.counts_no_service.get(severity, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "roles_total": self.roles,
+            "service_roles": self.service_roles,
+            "policies_total": self.policies,
+            "findings_total": self.findings,
+            "max_role_risk_score": self.max_risk,
+            "severity_counts": dict(self.counts),
+            "severity_counts_excluding_service_roles": dict(self.counts_no_service),
+        }
+
+
+def summarize_scan(scan_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Severity counts and totals for a completed scan.
+    """
+    summary = ScanSummary()
+    for role in scan_data.get("roles", []):
+        summary.add(role)
+    return summary.to_dict()
+
+
+# --------------------------------------------------
+# Role Queries
+# --------------------------------------------------
+def query_roles(
+    scan_data: Dict[str, Any],
+    severity: Optional[Sequence[str]] = None,
+    min_risk_score: Optional[int] = None,
+    role_prefix: Optional[str] = None,
+    exclude_service_roles: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Filter, paginate and project the roles of a scan (scan order kept).
+    `severity` keeps roles with at least one finding of those severities;
+    `fields` keeps only the listed role keys.
+    """
+    wanted = {s.upper() for s in severity} if severity else None
+
+    matches = [
+        role for role in scan_data.get("roles", [])
+        if not (exclude_service_roles and is_service_role(role))
+        and not (role_prefix and not role.get("RoleName", "").startswith(role_prefix))
+        and not (min_risk_score is not None and role_risk_score(role) < min_risk_score)
+        and not (wanted and not wanted & role_severities(role))
+    ]
+
+    page = matches[offset:offset + limit] if limit is not None else matches[offset:]
+    if fields:
+        page = [{key: role[key] for key in fields if key in role} for role in page]
+
+    next_offset = offset + len(page)
+    return {
+        "scan_metadata": scan_data.get("scan_metadata", {}),
+        "roles": page,
+        "page": {
+            "offset": offset,
+            "limit": limit,
+            "returned": len(page),
+            "total": len(matches),
+            "next_offset": next_offset if next_offset < len(matches) else None,
+        },
+    }
+
+
+# --------------------------------------------------
+# Tabular View (one row per policy)
+# --------------------------------------------------
+TABLE_COLUMNS = ("RoleName", "PolicyName", "PolicyType", "RiskScore", *SEVERITIES, "Findings")
+
+
+def findings_table(scan_data: Dict[str, Any], exclude_service_roles: bool = False) -> Dict[str, Any]:
+    """
+    Compact rows for a dataframe: per-severity counts and the distinct
+    finding titles of each policy, deduplicated like summarize_scan.
+    """
+    rows = []
+    for role in scan_data.get("roles", []):
+        if exclude_service_roles and is_service_role(role):
+            continue
+
+        for kind in POLICY_KINDS:
+            for policy in role.get(kind, []):
+                unique = {(f["title"], severity_of(f)) for f in policy.get("Findings", [])}
+                counts = {severity: 0 for severity in SEVERITIES}
+                for _, severity in unique:
+                    counts[severity] = counts.get(severity, 0) + 1
+
+                rows.append([
+                    role.get("RoleName"),
+                    policy.get("PolicyName"),
+                    POLICY_TYPES[kind],
+                    policy.get("RiskScore", 0),
+                    *(counts[severity] for severity in SEVERITIES),
+                    ", ".join(sorted({title for title, _ in unique})),
+                ])
+
+    return {"columns": list(TABLE_COLUMNS), "rows": rows}
+
+
+# --------------------------------------------------
+# Revisions (a completed scan only changes when patched)
+# --------------------------------------------------
+def job_revision(job_meta: Dict[str, Any]) -> int:
+    """
+    Revision of a stored scan from its metadata (the summary column,
+    no result decoding): the number of patches applied to it.
+    """
+    return (job_meta.get("summary") or {}).get("patches", 0)
+
+
+def data_revision(scan_data: Dict[str, Any]) -> int:
+    return scan_data.get("scan_metadata", {}).get("patches", 0)
+
+
+def current_revision(store, job_id: str) -> Optional[int]:
+    job = store.get(job_id, include_data=False)
+    return job_revision(job) if job else None
+
+
+# --------------------------------------------------
+# Completed Results (immutable per revision, decoded once)
+# --------------------------------------------------
+_results_cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+_results_lock = Lock()
+
+
+def completed_results(store, job_id: str, revision: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Scan data of a completed job, kept decoded in a small LRU so
+    paginated reads do not re-decode the stored blob. A cached copy is
+    used only while it matches the stored revision (`revision`, read
+    from the store if not given), so a patch made by any process is
+    seen by every other one.
+    """
+    if revision is None:
+        revision = current_revision(store, job_id)
+        if revision is None:
+            return None
+
+    with _results_lock:
+        cached = _results_cache.get(job_id)
+        if cached is not None and cached[0] == revision:
+            _results_cache.move_to_end(job_id)
+            return cached[1]
+
+    job = store.get(job_id)
+    data = job.get("data") if job else None
+    if data is None:
+        return None
+
+    with _results_lock:
+        _results_cache[job_id] = (data_revision(data), data)
+        _results_cache.move_to_end(job_id)
+        while len(_results_cache) > SCAN_RESULTS_CACHE_ENTRIES:
+            _results_cache.popitem(last=False)
+
+    return data
+
+
+def forget_results(job_id: str) -> None:
+    """
+    Drop a scan's decoded results after it was patched in the store
+    (frees memory early; stale copies are never served either way).
+    """
+    with _results_lock:
+        _results_cache.pop(job_id, None)
+
+
+# --------------------------------------------------
+# Conditional Requests
+# --------------------------------------------------
+def compute_etag(job_id: str, job_meta: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """
+    Strong ETag from job metadata and query parameters. Completed
+    results only change when patched, which also rewrites the summary,
+    so metadata identifies the representation.
+    """
+    payload = json.dumps([job_id, job_meta, params], sort_keys=True, default=str)
+    return f'"{hashlib.sha1(payload.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,210 @@
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.utils.metrics import SCAN_QUEUE_WAIT_SECONDS, SCAN_REQUESTS
+from backend.utils.constants import (
+    SCAN_WORKERS,
+    SCAN_QUEUE_MAX,
+    SCAN_DEFAULT_PRIORITY,
+)
+
+logger = logging.getLogger("cloud-security-copilot")
+
+# Worker callable: run(job_id, cancel_event, queue_wait_seconds)
+ScanRunner = Callable[[str, Event, float], None]
+
+_STOP = object()
+
+
+class QueueFull(Exception):
+    """
+    The scan queue is at capacity; retry after `retry_after` seconds.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Scan queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Entry:
+    job_id: str
+    key: str
+    priority: int
+    enqueued_at: float
+    cancel_event: Event = field(default_factory=Event)
+    running: bool = False
+
+
+class ScanScheduler:
+    """
+    Bounded pool of scan workers fed by a priority queue (lower value
+    runs first, FIFO within a priority).
+
+    Requests with the same key while a scan is queued or running
+    coalesce onto that job instead of starting another one.
+    """
+
+    def __init__(
+        self,
+        run: ScanRunner,
+        workers: int = SCAN_WORKERS,
+        max_queue: int = SCAN_QUEUE_MAX
+    ):
+        self.run = run
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Any]]" = queue.PriorityQueue()
+        self._seq = count()
+        self._lock = Lock()
+        self._entries: Dict[str, _Entry] = {}       # job_id -> queued/running entry
+        self._inflight: Dict[str, str] = {}         # key -> job_id
+        self._threads = []
+        self._waits = deque(maxlen=100)
+        self._durations = deque(maxlen=20)
+        self._counters = {"submitted": 0, "coalesced": 0, "rejected": 0, "cancelled": 0, "finished": 0}
+
+    # --------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------
+    def start(self) -> None:
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"scan-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry.cancel_event.set()
+
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._seq), _STOP))
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    # --------------------------------------------------
+    # Submission / Cancellation
+    # --------------------------------------------------
+    def submit(
+        self,
+        key: str,
+        job_id: str,
+        on_accept: Callable[[str], None],
+        priority: int = SCAN_DEFAULT_PRIORITY
+    ) -> Tuple[str, bool]:
+        """
+        Queue a scan. Returns (job_id, coalesced): an identical queued or
+        running scan is reused. `on_accept(job_id)` runs before a new job
+        becomes visible to workers. Raises QueueFull when at capacity.
+        """
+        with self._lock:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self._counters["coalesced"] += 1
+                SCAN_REQUESTS.inc(outcome="coalesced")
+                return existing, True
+
+            if self.queue_depth() >= self.max_queue:
+                self._counters["rejected"] += 1
+                SCAN_REQUESTS.inc(outcome="rejected")
+                raise QueueFull(self._retry_after())
+
+            on_accept(job_id)
+
+            entry = _Entry(job_id=job_id, key=key, priority=priority, enqueued_at=time.monotonic())
+            self._entries[job_id] = entry
+            self._inflight[key] = job_id
+            self._counters["submitted"] += 1
+            SCAN_REQUESTS.inc(outcome="queued")
+            self._queue.put((priority, next(self._seq), entry))
+
+        return job_id, False
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Returns "queued" (removed before starting), "running" (cancel
+        requested) or None if the job is not scheduled here.
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return None
+
+            entry.cancel_event.set()
+            self._counters["cancelled"] += 1
+            if entry.running:
+                return "running"
+
+            self._forget(entry)
+            return "queued"
+
+    # --------------------------------------------------
+    # Introspection
+    # --------------------------------------------------
+    def queue_depth(self) -> int:
+        return sum(1 for entry in self._entries.values() if not entry.running)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._waits)
+            running = sum(1 for entry in self._entries.values() if entry.running)
+            depth = len(self._entries) - running
+            counters = dict(self._counters)
+
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": depth,
+            "running": running,
+            "queue_wait_seconds": {
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "max": round(max(waits), 3) if waits else 0.0,
+            },
+            **counters,
+        }
+
+    def _retry_after(self) -> int:
+        avg = sum(self._durations) / len(self._durations) if self._durations else 30.0
+        return max(1, int(avg * max(1, self.queue_depth()) / self.workers))
+
+    # --------------------------------------------------
+    # Workers
+    # --------------------------------------------------
+    def _forget(self, entry: _Entry) -> None:
+        self._entries.pop(entry.job_id, None)
+        if self._inflight.get(entry.key) == entry.job_id:
+            del self._inflight[entry.key]
+
+    def _worker(self) -> None:
+        while True:
+            _, _, entry = self._queue.get()
+            if entry is _STOP:
+                return
+
+            with self._lock:
+                if entry.job_id not in self._entries:
+                    continue  # cancelled while queued
+                entry.running = True
+                wait = time.monotonic() - entry.enqueued_at
+                self._waits.append(wait)
+            SCAN_QUEUE_WAIT_SECONDS.observe(wait)
+
+            started = time.monotonic()
+            try:
+                self.run(entry.job_id, entry.cancel_event, wait)
+            except Exception:
+                logger.exception(f"[SCAN WORKER] job_id={entry.job_id} crashed")
+            finally:
+                with self._lock:
+                    self._forget(entry)
+                    self._durations.append(time.monotonic() - started)
+                    self._counters["finished"] += 1
@@ -1,19 +1,55 @@
+import os
 import logging
+from threading import Event
+from typing import Callable, Optional
 # Absolute Import: This tells Python to look inside the backend package
 
-from backend.aws_scanner import scan_roles_and_policies
+from backend.aws_scanner import scan_roles_and_policies, ScanCancelled
+from backend.services.scan_sharding import distributed_mode, run_sharded_scan
+from backend.result_sink import open_result_sink
 
 logger = logging.getLogger("cloud-security-copilot")
 
-def run_iam_scan():
+def scan_key() -> str:
+    """
+    Identity of a scan request: scans of the same account and region
+    are interchangeable while one is queued or running.
+    """
+    return f"iam:{os.getenv('AWS_PROFILE', 'default')}:{os.getenv('AWS_DEFAULT_REGION')}"
+
+
+def run_iam_scan(
+    cancel_event: Optional[Event] = None,
+    on_progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+    job_id: Optional[str] = None
+):
     """
     Orchestrates IAM scanning.
     This service connects the API to the low-level AWS scanner logic.
+    With SCAN_MODE=distributed the roles are scanned by scan_worker
+    processes instead (see scan_sharding).
+    Scans with a job_id collect roles in a result sink: past
+    RESULT_BUFFER_ROLES they are spilled to disk and `roles` is the sink.
     """
+    sink = open_result_sink(job_id) if job_id else None
     try:
-        logger.info("Service: Initiating AWS IAM scan roles and policies")
-        results = scan_roles_and_policies()
+        if job_id and distributed_mode():
+            logger.info(f"Service: Initiating distributed IAM scan job_id={job_id}")
+            results = run_sharded_scan(job_id, cancel_event=cancel_event, on_progress=on_progress, sink=sink)
+        else:
+            logger.info("Service: Initiating AWS IAM scan roles and policies")
+            results = scan_roles_and_policies(cancel_event=cancel_event, on_progress=on_progress, sink=sink)
+
+        if sink is not None:
+            results["roles"] = sink.finish()
         return results
+    except ScanCancelled:
+        logger.info("Service: IAM scan cancelled")
+        if sink is not None:
+            sink.delete()
+        raise
     except Exception as e:
         logger.error(f"Service: IAM scan failed in orchestration layer: {str(e)}")
+        if sink is not None:
+            sink.delete()
         raise e
\ No newline at end of file
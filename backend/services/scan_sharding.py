@@ -0,0 +1,146 @@
+"""
+Distributed scans: the coordinator lists roles, queues them as shards
+on the work queue and merges what the scan_worker processes post back
+into one result, shaped like a local scan's.
+"""
+
+import os
+import time
+import logging
+from datetime import datetime
+from threading import Event
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.aws_scanner import ScanCancelled, get_iam_client, list_iam_roles, validate_env
+from backend.result_sink import ResultSink
+from backend.utils.timing import StageTimings
+from backend.work_queue import WorkQueue, create_work_queue
+from backend.utils.constants import SCAN_MODE, SHARD_ROLES, SHARD_POLL_SECONDS, SHARD_STALL_SECONDS
+
+logger = logging.getLogger("cloud-security-copilot")
+
+_work_queue: Optional[WorkQueue] = None
+
+
+def distributed_mode() -> bool:
+    return (os.getenv("SCAN_MODE") or SCAN_MODE).lower() == "distributed"
+
+
+def get_work_queue() -> WorkQueue:
+    global _work_queue
+    if _work_queue is None:
+        _work_queue = create_work_queue()
+    return _work_queue
+
+
+def split_roles(roles: List[Dict[str, Any]], shard_roles: int = SHARD_ROLES) -> List[List[Dict[str, Any]]]:
+    return [roles[i:i + shard_roles] for i in range(0, len(roles), shard_roles)]
+
+
+def merge_shards(
+    results: Iterable[Dict[str, Any]],
+    scan_metadata: Dict[str, Any],
+    timings: StageTimings,
+    sink: Optional[ResultSink] = None
+) -> Dict[str, Any]:
+    """
+    One scan result from the shard results (already in shard order).
+    Worker timings add up into `timings`; so do unused-access counters.
+    Roles go to `sink` when given.
+    """
+    roles = sink if sink is not None else []
+    unused_access: Optional[Dict[str, Any]] = None
+    workers = set()
+
+    for result in results:
+        roles.extend(result["roles"])
+        workers.add(result.get("worker"))
+        timings.merge(result.get("timings", {}))
+
+        shard_unused = result.get("unused_access")
+        if shard_unused:
+            if unused_access is None:
+                unused_access = dict(shard_unused)
+            else:
+                for key, value in shard_unused.items():
+                    if key != "days":
+                        unused_access[key] = unused_access.get(key, 0) + value
+
+    metadata = dict(scan_metadata)
+    metadata["shards"] = {**metadata.get("shards", {}), "workers": len(workers)}
+    if unused_access is not None:
+        metadata["unused_access"] = unused_access
+    metadata["timings"] = timings.to_dict()
+    return {"scan_metadata": metadata, "roles": roles}
+
+
+def run_sharded_scan(
+    job_id: str,
+    cancel_event: Optional[Event] = None,
+    on_progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+    queue: Optional[WorkQueue] = None,
+    iam=None,
+    shard_roles: int = SHARD_ROLES,
+    poll_seconds: float = SHARD_POLL_SECONDS,
+    sink: Optional[ResultSink] = None,
+    stall_seconds: float = SHARD_STALL_SECONDS
+) -> Dict[str, Any]:
+    """
+    Coordinator side of a distributed scan. Shards whose worker dies are
+    re-leased by the queue; the scan fails once a shard runs out of attempts,
+    or when no shard is leased or finished for `stall_seconds` (no workers).
+    Shard results are read back one at a time (into `sink` if given).
+    """
+    queue = queue or get_work_queue()
+    if iam is None:
+        validate_env()
+        iam = get_iam_client()
+    timings = StageTimings()
+
+    scan_metadata = {
+        "region": os.getenv("AWS_DEFAULT_REGION"),
+        "scan_time": datetime.utcnow().isoformat(),
+    }
+
+    if on_progress:
+        on_progress("list_roles", 0, None)
+    with timings.measure("list_roles"):
+        roles = list_iam_roles(iam)
+
+    shards = split_roles(roles, shard_roles)
+    queue.put(job_id, shards, sizes=[len(shard) for shard in shards])
+    logger.info(f"[SHARDED SCAN] job_id={job_id} roles={len(roles)} shards={len(shards)}")
+
+    started = time.perf_counter()
+    active_at, done = time.monotonic(), 0
+    try:
+        while True:
+            status = queue.status(job_id)
+            if on_progress:
+                on_progress("scan_roles", status["items_done"], len(roles))
+            if status["failed"]:
+                raise RuntimeError(f"Scan shard failed: {status['errors'][0]}")
+            if status["done"] == len(shards):
+                break
+
+            if status["leased"] or status["done"] != done:
+                active_at, done = time.monotonic(), status["done"]
+            elif time.monotonic() - active_at > stall_seconds:
+                raise RuntimeError(f"No scan worker picked up a shard in {stall_seconds:.0f}s")
+
+            if cancel_event is not None:
+                if cancel_event.wait(poll_seconds):
+                    raise ScanCancelled()
+            else:
+                time.sleep(poll_seconds)
+
+        timings.add("shards_wait", time.perf_counter() - started)
+        scan_metadata["shards"] = {
+            "total": len(shards),
+            "roles_per_shard": shard_roles,
+            "leases": status["attempts"],
+        }
+        return merge_shards(queue.results(job_id), scan_metadata, timings, sink)
+    finally:
+        # Also on cancel/failure: leased shards then lose their heartbeat
+        queue.delete(job_id)
@@ -16,6 +16,22 @@ JOB_STATUS_PENDING = "pending"
 JOB_STATUS_IN_PROGRESS = "in_progress"
 JOB_STATUS_COMPLETED = "completed"
 JOB_STATUS_FAILED = "failed"
+JOB_STATUS_CANCELLED = "cancelled"
+
+# -----------------------------
+# Job Store
+# -----------------------------
+JOB_STORE_BACKEND = "sqlite"              # "sqlite" | "memory" (env: JOB_STORE_BACKEND)
+JOB_RETENTION_SECONDS = 7 * 24 * 3600     # finished jobs older than this are evicted
+JOB_STORE_MAX_JOBS = 500
+JOB_RESULT_COMPRESSION_LEVEL = 3          # zstd
+JOB_SEGMENT_GRACE_SECONDS = 600           # replaced/evicted result segments outlive their job this long (open readers)
+
+# -----------------------------
+# Result Spilling (large scans)
+# -----------------------------
+RESULT_BUFFER_ROLES = 500                 # scanned roles held in memory before spilling (env: RESULT_BUFFER_ROLES; 0 never spills)
+RESULT_READ_BUFFER_BYTES = 256 * 1024     # decompressed bytes read at a time from a segment
 
 # -----------------------------
 # Security Severity Levels
@@ -30,10 +46,115 @@ SEVERITY_CRITICAL = "CRITICAL"
 # -----------------------------
 MAX_POLICY_SIZE_KB = 100
 DEFAULT_REGION_ENV = "AWS_DEFAULT_REGION"
+SERVICE_ROLE_PREFIX = "AWSServiceRole"
+
+# -----------------------------
+# Scan Scheduling
+# -----------------------------
+SCAN_WORKERS = 2                          # concurrent scans per API process
+SCAN_QUEUE_MAX = 10                       # queued scans before 429
+SCAN_DEFAULT_PRIORITY = 5                 # 0 (first) .. 9
+SCAN_PROGRESS_MIN_INTERVAL = 0.25         # seconds between pushed counter updates
+SCAN_PROGRESS_MAX_JOBS = 200              # finished scans kept in the progress hub
+SCAN_EVENTS_KEEPALIVE = 15                # seconds; idle SSE streams re-check the store
+
+# -----------------------------
+# Distributed Scans (coordinator + scan_worker processes)
+# -----------------------------
+SCAN_MODE = "local"                       # "local" | "distributed" (env: SCAN_MODE)
+WORK_QUEUE_BACKEND = "sqlite"             # "sqlite" | "file" (env: WORK_QUEUE_BACKEND)
+SHARD_ROLES = 50                          # roles per shard
+SHARD_LEASE_SECONDS = 60                  # a worker silent this long loses its shard
+SHARD_MAX_ATTEMPTS = 3                    # leases per shard before the scan fails
+SHARD_POLL_SECONDS = 1.0                  # coordinator progress checks
+SHARD_STALL_SECONDS = 5 * SHARD_LEASE_SECONDS   # no live lease and no finished shard this long fails the scan
+WORKER_IDLE_SECONDS = 1.0                 # worker wait when the queue is empty
+
+# -----------------------------
+# IAM Change Events
+# -----------------------------
+IAM_EVENT_DEBOUNCE_SECONDS = 2.0          # quiet time before a role is re-analyzed
+IAM_EVENT_MAX_WAIT_SECONDS = 10.0         # upper bound for a role under constant change
+IAM_EVENT_POLL_SECONDS = 1.0
+IAM_EVENT_LEASE_SECONDS = 10.0            # a file consumer's hold on IAM_EVENTS_FILE, renewed every poll
+IAM_EVENT_PATCH_ATTEMPTS = 3              # re-applies of a patch that lost to a concurrent one
+
+# -----------------------------
+# Unused Access (service last accessed reports)
+# -----------------------------
+UNUSED_ACCESS_DAYS = 90                   # env: UNUSED_ACCESS_DAYS; 0 disables the check
+ACCESS_ADVISOR_MAX_JOBS = 20              # report jobs in flight (halved on throttling)
+ACCESS_ADVISOR_CALLS_PER_SECOND = 10      # generate + get calls, across all jobs
+ACCESS_ADVISOR_FIRST_POLL = 2.0           # seconds; then tracks observed completion time
+ACCESS_ADVISOR_MAX_POLL = 15.0            # seconds between polls of one job
+ACCESS_ADVISOR_BACKOFF = 1.5
+ACCESS_ADVISOR_TIMEOUT = 300              # seconds for all jobs of one scan
+
+# -----------------------------
+# Profiling
+# -----------------------------
+PROFILE_SAMPLE_INTERVAL = 0.005           # seconds between stack samples
+PROFILE_MAX_ARTIFACTS = 50
+
+# -----------------------------
+# Scan Queries
+# -----------------------------
+SCAN_PAGE_MAX_LIMIT = 1000
+SCAN_RESULTS_CACHE_ENTRIES = 8            # decoded completed scans kept in memory
+
+# -----------------------------
+# Scan Diff
+# -----------------------------
+FINGERPRINT_VERSION = 1
+FINGERPRINT_BUCKETS = 256                 # role hash buckets compared before roles
+
+# -----------------------------
+# Columnar Export
+# -----------------------------
+EXPORT_BATCH_ROWS = 65536                 # rows per Arrow IPC record batch
+EXPORT_PARQUET_COMPRESSION = "zstd"
+EXPORT_CACHE_ENTRIES = 4                  # flattened scans kept as Arrow tables
+
+# -----------------------------
+# Response Encoding
+# -----------------------------
+RESPONSE_CACHE_ENTRIES = 32               # serialized completed-scan bodies
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
 
 # -----------------------------
 # AI / RAG
 # -----------------------------
 DEFAULT_RAG_TOP_K = 3
+LLM_MODEL = "gpt-4o-mini"
+LLM_MODEL_ECONOMY = "gpt-4.1-nano"      # routed to LOW/MEDIUM findings
+ECONOMY_TIER_SEVERITIES = (SEVERITY_LOW, SEVERITY_MEDIUM)
 LLM_MAX_TOKENS = 800
 LLM_TEMPERATURE = 0
+LLM_HTTP_MAX_CONNECTIONS = 20
+LLM_HTTP_TIMEOUT = 60
+LLM_CALL_TIMEOUT = 30             # seconds per LLM attempt
+LLM_MAX_RETRIES = 4               # retries on rate limiting only
+LLM_RETRY_BASE_DELAY = 0.5
+LLM_RETRY_MAX_DELAY = 8.0
+EXPLAIN_CONCURRENCY = 8           # max in-flight RAG/LLM calls per explanation
+EXPLAIN_BATCH_SIZE = 8            # unique findings per LLM request (1 = unbatched)
+EXPLAIN_CONTEXT_TOKEN_BUDGET = 600      # retrieved context per LLM call
+EXPLAIN_SCAN_TOKEN_BUDGET = 200_000     # prompt + completion tokens per explanation job
+EXPLAIN_SCAN_TIME_BUDGET = 50           # seconds; stays under the UI's 60s timeout
+EXPLAIN_CACHE_MEMORY_ENTRIES = 5_000
+EXPLAIN_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# -----------------------------
+# Knowledge Base Ingestion
+# -----------------------------
+KB_FILE_EXTENSIONS = (".md", ".txt")
+KB_CHUNK_SIZE = 800
+KB_CHUNK_OVERLAP = 100
+KB_SEGMENT_BYTES = 1_000_000      # max bytes a worker reads per task
+KB_INGEST_WORKERS = 0             # 0 = os.cpu_count()
+KB_EMBED_BATCH_SIZE = 64
+KB_MINHASH_PERMUTATIONS = 64
+KB_LSH_BANDS = 16
+KB_DEDUP_THRESHOLD = 0.85         # estimated Jaccard above which chunks are duplicates
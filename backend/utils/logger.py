@@ -30,3 +30,15 @@ def get_logger(
 
     logger.propagate = False
     return logger
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Root handler for the module loggers (logging.getLogger(__name__)).
+    Called once by entry points (API app, scan worker, scripts) rather
+    than on import; does nothing if the root logger is already set up.
+    """
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s [%(levelname)s] %(message)s"
+    )
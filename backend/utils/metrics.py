@@ -0,0 +1,235 @@
+"""
+Minimal in-process metrics: counters and fixed-bucket histograms with
+labels, rendered in the Prometheus text exposition format.
+
+Observations are a bisect plus two additions under the metric's lock,
+cheap enough for per-policy and per-API-call hot loops.
+"""
+
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}_total{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class _Series:
+    """
+    One label combination of a histogram: bucket counts and sum.
+    """
+    __slots__ = ("_histogram", "counts", "total")
+
+    def __init__(self, histogram: "Histogram"):
+        self._histogram = histogram
+        self.counts = [0] * (len(histogram.buckets) + 1)   # last slot: +Inf
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._histogram.buckets, value)
+        with self._histogram._lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_series", "_started")
+
+    def __init__(self, series: _Series):
+        self._series = series
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._series.observe(time.perf_counter() - self._started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _Series] = {}
+        self._unlabelled = self.labels() if not self.labelnames else None
+
+    def labels(self, **labels: str) -> _Series:
+        """
+        Bound series for a label combination; hold on to it in hot loops.
+        """
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, _Series(self))
+        return series
+
+    def observe(self, value: float, **labels: str) -> None:
+        (self._unlabelled or self.labels(**labels)).observe(value)
+
+    def time(self, **labels: str) -> _Timer:
+        return _Timer(self._unlabelled or self.labels(**labels))
+
+    def snapshot(self, **labels: str) -> Optional[Dict[str, float]]:
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return None
+        with self._lock:
+            return {"count": sum(series.counts), "sum": series.total}
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    bucket = _labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series.total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# --------------------------------------------------
+# Application Metrics
+# --------------------------------------------------
+IAM_API_SECONDS = histogram(
+    "iam_api_call_seconds", "IAM API call latency by operation",
+    ("operation", "outcome"),
+)
+ANALYZER_POLICY_SECONDS = histogram(
+    "analyzer_policy_seconds", "PolicyRiskAnalyzer time per policy document",
+    buckets=FAST_BUCKETS,
+)
+SCAN_QUEUE_WAIT_SECONDS = histogram(
+    "scan_queue_wait_seconds", "Time scan jobs wait for a worker",
+    buckets=SLOW_BUCKETS,
+)
+SCAN_JOB_SECONDS = histogram(
+    "scan_job_seconds", "Scan job run time by final status",
+    ("status",), buckets=SLOW_BUCKETS,
+)
+RAG_RETRIEVAL_SECONDS = histogram(
+    "rag_retrieval_seconds", "Knowledge base retrieval latency",
+    ("cache",),
+)
+EMBEDDING_SECONDS = histogram(
+    "embedding_batch_seconds", "Embedding call latency during knowledge ingest",
+)
+LLM_CALL_SECONDS = histogram(
+    "llm_call_seconds", "LLM request latency by model and outcome",
+    ("model", "outcome"),
+)
+SCAN_REQUESTS = counter(
+    "scan_requests", "POST /scan outcomes",
+    ("outcome",),
+)
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_seconds", "HTTP handler latency by route",
+    ("method", "route", "status"),
+)
+IAM_EVENTS = counter(
+    "iam_events", "IAM change events by outcome",
+    ("outcome",),
+)
+IAM_EVENT_TO_PATCH_SECONDS = histogram(
+    "iam_event_to_patch_seconds", "Time from receiving an IAM change event to the patched scan",
+)
@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Optional
+
+from backend.utils.constants import (
+    PROFILE_SAMPLE_INTERVAL,
+    PROFILE_MAX_ARTIFACTS,
+)
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and aggregates them as collapsed stacks
+    ("outer;inner count" lines, readable by flamegraph.pl / speedscope).
+
+    Sampling never touches the profiled thread, so overhead stays at
+    one sys._current_frames() call per interval.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        header = (
+            f"# samples={sum(self.samples.values())} "
+            f"interval={self.interval}s elapsed={self.elapsed:.3f}s\n"
+        )
+        return header + "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+# --------------------------------------------------
+# Artifacts
+# --------------------------------------------------
+def profile_path(kind: str, job_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{kind}-{job_id}.folded")
+
+
+def save_profile(profiler: SamplingProfiler, kind: str, job_id: str) -> str:
+    """
+    Write the collapsed stacks for a job and drop the oldest artifacts
+    beyond PROFILE_MAX_ARTIFACTS.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = profile_path(kind, job_id)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profiler.collapsed())
+
+    artifacts = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR)),
+        key=os.path.getmtime
+    )
+    for old in artifacts[:-PROFILE_MAX_ARTIFACTS]:
+        os.remove(old)
+
+    logger.info(f"Profile for {kind} {job_id}: {sum(profiler.samples.values())} samples -> {path}")
+    return path
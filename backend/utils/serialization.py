@@ -0,0 +1,124 @@
+import gzip
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+from backend.utils.constants import (
+    RESPONSE_CACHE_ENTRIES,
+    RESPONSE_COMPRESSION_MIN_BYTES,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+)
+
+ENCODING_IDENTITY = "identity"
+ENCODING_GZIP = "gzip"
+ENCODING_BROTLI = "br"
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    return str(value)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes. Enums and datetimes are encoded natively
+    (datetimes as ISO 8601, like FastAPI's default encoder).
+    `sort_keys` gives a canonical encoding suitable for hashing.
+    """
+    option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+    return orjson.dumps(obj, default=_default, option=option)
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+# --------------------------------------------------
+# Content Negotiation
+# --------------------------------------------------
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Pick br, then gzip, from an Accept-Encoding header (q=0 excluded).
+    """
+    if not accept_encoding:
+        return ENCODING_IDENTITY
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    if brotli is not None and accepted.get(ENCODING_BROTLI, 0) > 0:
+        return ENCODING_BROTLI
+    if accepted.get(ENCODING_GZIP, 0) > 0 or accepted.get("*", 0) > 0:
+        return ENCODING_GZIP
+    return ENCODING_IDENTITY
+
+
+class EncodedBody:
+    """
+    A response body serialized once, with compressed variants built on
+    first request and kept alongside.
+    """
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._variants: Dict[str, bytes] = {ENCODING_IDENTITY: raw}
+        self._lock = Lock()
+
+    def variant(self, encoding: str) -> Tuple[bytes, str]:
+        if len(self.raw) < RESPONSE_COMPRESSION_MIN_BYTES:
+            return self.raw, ENCODING_IDENTITY
+
+        with self._lock:
+            if encoding not in self._variants:
+                if encoding == ENCODING_BROTLI:
+                    self._variants[encoding] = brotli.compress(self.raw, quality=BROTLI_QUALITY)
+                elif encoding == ENCODING_GZIP:
+                    self._variants[encoding] = gzip.compress(self.raw, compresslevel=GZIP_LEVEL, mtime=0)
+                else:
+                    return self.raw, ENCODING_IDENTITY
+            return self._variants[encoding], encoding
+
+
+# --------------------------------------------------
+# Body Cache (keyed by ETag)
+# --------------------------------------------------
+_bodies: "OrderedDict[str, EncodedBody]" = OrderedDict()
+_bodies_lock = Lock()
+
+
+def cached_body(key: str, build) -> EncodedBody:
+    """
+    Return the encoded body for `key`, serializing `build()` on a miss.
+    Only immutable representations (completed scans) should be cached.
+    """
+    with _bodies_lock:
+        body = _bodies.get(key)
+        if body is not None:
+            _bodies.move_to_end(key)
+            return body
+
+    body = EncodedBody(dumps(build()))
+
+    with _bodies_lock:
+        _bodies[key] = body
+        while len(_bodies) > RESPONSE_CACHE_ENTRIES:
+            _bodies.popitem(last=False)
+
+    return body
@@ -0,0 +1,19 @@
+import json
+from typing import Any, Optional
+
+
+def format_sse(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """
+    Encode one Server-Sent Events frame.
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+}
@@ -0,0 +1,60 @@
+import time
+from typing import Any, Dict
+
+
+class StageTimings:
+    """
+    Wall-clock totals per job stage.
+    Repeated stages (one per role, one per policy) also keep count and max.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = {"seconds": 0.0, "count": 0, "max": 0.0}
+        entry["seconds"] += seconds
+        entry["count"] += 1
+        entry["max"] = max(entry["max"], seconds)
+
+    def merge(self, stages: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Add timings reported elsewhere (a `to_dict()` from another process).
+        """
+        for stage, other in stages.items():
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"seconds": 0.0, "count": 0, "max": 0.0}
+            entry["seconds"] += other["seconds"]
+            entry["count"] += other["count"]
+            entry["max"] = max(entry["max"], other["max"])
+
+    def measure(self, stage: str) -> "_StageTimer":
+        return _StageTimer(self, stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            stage: {
+                "seconds": round(entry["seconds"], 4),
+                "count": entry["count"],
+                "max": round(entry["max"], 4),
+            }
+            for stage, entry in self._stages.items()
+        }
+
+
+class _StageTimer:
+    __slots__ = ("_timings", "_stage", "_started")
+
+    def __init__(self, timings: StageTimings, stage: str):
+        self._timings = timings
+        self._stage = stage
+
+    def __enter__(self) -> "_StageTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._timings.add(self._stage, time.perf_counter() - self._started)
@@ -0,0 +1,48 @@
+import logging
+from functools import lru_cache
+
+from backend.utils.constants import LLM_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    # Encodings are downloaded on first use; offline (air-gapped) hosts
+    # get the estimate, cached like an encoding so this is logged once
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding for {model!r} unavailable, estimating tokens as chars/4: {e!r}")
+        return None
+
+
+def count_tokens(text: str, model: str = LLM_MODEL) -> int:
+    """
+    Local prompt token count. Falls back to ~4 characters per token
+    when tiktoken or its encoding files are unavailable.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = LLM_MODEL) -> str:
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
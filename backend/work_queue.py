@@ -0,0 +1,453 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import zstandard
+
+from backend.utils.serialization import dumps, loads
+from backend.utils.constants import (
+    WORK_QUEUE_BACKEND,
+    SHARD_MAX_ATTEMPTS,
+    JOB_RESULT_COMPRESSION_LEVEL,
+)
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_QUEUE_DB_PATH = os.path.join(BASE_DIR, "job_store", "work_queue.db")
+WORK_QUEUE_DIR = os.path.join(BASE_DIR, "job_store", "work_queue")
+
+SHARD_STATES = ("queued", "leased", "done", "failed")
+
+
+def _pack(value: Any) -> bytes:
+    return zstandard.ZstdCompressor(level=JOB_RESULT_COMPRESSION_LEVEL).compress(dumps(value))
+
+
+def _unpack(blob: bytes) -> Any:
+    return loads(zstandard.ZstdDecompressor().decompress(blob))
+
+
+@dataclass
+class Shard:
+    job_id: str
+    index: int
+    payload: Any
+    attempts: int
+    lease_token: str
+
+
+class WorkQueue(ABC):
+    """
+    Shards of a job, leased to workers in any process or node.
+
+    A lease expires unless renewed with `heartbeat`; an expired shard is
+    handed to the next worker that asks, up to `max_attempts` leases,
+    after which it is failed (`status` reports it failed as soon as the
+    last lease expires, worker or not). The first `complete` of a shard wins.
+    """
+
+    def __init__(self, max_attempts: int = SHARD_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, job_id: str, payloads: List[Any], sizes: Optional[List[int]] = None) -> None:
+        """
+        Queue one shard per payload; `sizes` (items per shard) feed progress.
+        """
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, shard: Shard, lease_seconds: float) -> bool:
+        """
+        Extend the lease; False if the shard was re-leased, finished or deleted.
+        """
+
+    @abstractmethod
+    def complete(self, shard: Shard, result: Any) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, shard: Shard, error: str) -> None:
+        """
+        Give the shard back (it is re-queued until attempts run out).
+        """
+
+    @abstractmethod
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Shard counts per state, items done/total, lease attempts and errors.
+        `leased` counts live leases only; expired ones are queued again,
+        or failed once their attempts are used up.
+        """
+
+    @abstractmethod
+    def results(self, job_id: str) -> Iterator[Any]:
+        """
+        Results of the finished shards, in shard order, decoded one at a time.
+        """
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        ...
+
+
+# --------------------------------------------------
+# SQLite (one file shared by every process on the host)
+# --------------------------------------------------
+class SQLiteWorkQueue(WorkQueue):
+
+    def __init__(self, db_path: str = WORK_QUEUE_DB_PATH, max_attempts: int = SHARD_MAX_ATTEMPTS):
+        super().__init__(max_attempts)
+        self.db_path = db_path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS scan_shards ("
+            "job_id TEXT NOT NULL, shard INTEGER NOT NULL, state TEXT NOT NULL, "
+            "size INTEGER NOT NULL, payload BLOB NOT NULL, result BLOB, "
+            "attempts INTEGER NOT NULL DEFAULT 0, lease_token TEXT, lease_expires REAL, "
+            "worker TEXT, error TEXT, created_at REAL NOT NULL, "
+            "PRIMARY KEY (job_id, shard))"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS idx_scan_shards_state ON scan_shards (state, created_at)")
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA busy_timeout=5000")
+            self._local.db = db
+        return db
+
+    def put(self, job_id: str, payloads: List[Any], sizes: Optional[List[int]] = None) -> None:
+        now = time.time()
+        sizes = sizes or [1] * len(payloads)
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO scan_shards (job_id, shard, state, size, payload, created_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                [(job_id, i, size, _pack(payload), now) for i, (payload, size) in enumerate(zip(payloads, sizes))]
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        now = time.time()
+        token = uuid.uuid4().hex
+        db = self._db()
+
+        # BEGIN IMMEDIATE takes the write lock: no two workers pick the same row
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "UPDATE scan_shards SET state = 'failed', lease_token = NULL, "
+                "error = coalesce(error, 'lease expired') || ' (attempts exhausted)' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = db.execute(
+                "SELECT job_id, shard, payload, attempts FROM scan_shards "
+                "WHERE state = 'queued' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY created_at, shard LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE scan_shards SET state = 'leased', attempts = attempts + 1, "
+                    "lease_token = ?, lease_expires = ?, worker = ? WHERE job_id = ? AND shard = ?",
+                    (token, now + lease_seconds, worker_id, row[0], row[1])
+                )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return Shard(row[0], row[1], _unpack(row[2]), row[3] + 1, token)
+
+    def heartbeat(self, shard: Shard, lease_seconds: float) -> bool:
+        return self._db().execute(
+            "UPDATE scan_shards SET lease_expires = ? "
+            "WHERE job_id = ? AND shard = ? AND state = 'leased' AND lease_token = ?",
+            (time.time() + lease_seconds, shard.job_id, shard.index, shard.lease_token)
+        ).rowcount == 1
+
+    def complete(self, shard: Shard, result: Any) -> bool:
+        return self._db().execute(
+            "UPDATE scan_shards SET state = 'done', result = ?, lease_token = NULL, error = NULL "
+            "WHERE job_id = ? AND shard = ? AND state IN ('queued', 'leased')",
+            (_pack(result), shard.job_id, shard.index)
+        ).rowcount == 1
+
+    def fail(self, shard: Shard, error: str) -> None:
+        self._db().execute(
+            "UPDATE scan_shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "lease_token = NULL, error = ? "
+            "WHERE job_id = ? AND shard = ? AND state = 'leased' AND lease_token = ?",
+            (self.max_attempts, error, shard.job_id, shard.index, shard.lease_token)
+        )
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        status = {state: 0 for state in SHARD_STATES}
+        status.update(items_done=0, items_total=0, attempts=0, errors=[])
+        now = time.time()
+
+        for state, size, attempts, error, lease_expires in self._db().execute(
+            "SELECT state, size, attempts, error, lease_expires FROM scan_shards WHERE job_id = ? ORDER BY shard",
+            (job_id,)
+        ):
+            if state == "leased" and lease_expires < now:
+                # Marked failed by the next lease(); reported now so the
+                # coordinator does not wait for a worker to come by
+                if attempts >= self.max_attempts:
+                    state, error = "failed", f"{error or 'lease expired'} (attempts exhausted)"
+                else:
+                    state = "queued"
+            status[state] += 1
+            status["items_total"] += size
+            status["attempts"] += attempts
+            if state == "done":
+                status["items_done"] += size
+            elif state == "failed":
+                status["errors"].append(error)
+        return status
+
+    def results(self, job_id: str) -> Iterator[Any]:
+        rows = self._db().execute(
+            "SELECT result FROM scan_shards WHERE job_id = ? AND state = 'done' ORDER BY shard",
+            (job_id,)
+        )
+        for (blob,) in rows:
+            yield _unpack(blob)
+
+    def delete(self, job_id: str) -> None:
+        self._db().execute("DELETE FROM scan_shards WHERE job_id = ?", (job_id,))
+
+
+# --------------------------------------------------
+# Directory (local stand-in; any filesystem with atomic rename/link)
+# --------------------------------------------------
+class FileWorkQueue(WorkQueue):
+    """
+    One directory per job; per shard a payload file, a lease file
+    (created exclusively, taken over by renaming it once expired) and a
+    result file (hard-linked into place, so only the first one lands).
+    Attempt counts are best effort when two workers race for one
+    expired lease.
+    """
+
+    def __init__(self, root: str = WORK_QUEUE_DIR, max_attempts: int = SHARD_MAX_ATTEMPTS):
+        super().__init__(max_attempts)
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, job_id: str, index: int, suffix: str) -> str:
+        return os.path.join(self.root, job_id, f"{index:06d}.{suffix}")
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_lease(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None   # missing, or caught mid-write
+
+    def _shards(self, job_id: str) -> List[int]:
+        try:
+            names = os.listdir(os.path.join(self.root, job_id))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name.split(".")[0]) for name in names if name.endswith(".payload"))
+
+    def put(self, job_id: str, payloads: List[Any], sizes: Optional[List[int]] = None) -> None:
+        sizes = sizes or [1] * len(payloads)
+        staging = os.path.join(self.root, f".{job_id}.{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        for i, (payload, size) in enumerate(zip(payloads, sizes)):
+            with open(os.path.join(staging, f"{i:06d}.payload"), "wb") as f:
+                f.write(_pack({"size": size, "payload": payload}))
+        # Workers only see the job once every shard is written
+        os.rename(staging, os.path.join(self.root, job_id))
+
+    def _try_lease(self, job_id: str, index: int, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        lease_path = self._path(job_id, index, "lease")
+        if os.path.exists(self._path(job_id, index, "result")) or os.path.exists(self._path(job_id, index, "failed")):
+            return None
+
+        attempts, stale = 0, None
+        current = self._read_lease(lease_path)
+        if current is not None:
+            if current["expires"] >= time.time():
+                return None
+            attempts = current["attempts"]
+            if attempts >= self.max_attempts:
+                self._write(self._path(job_id, index, "failed"), (current.get("error") or "lease expired").encode())
+                return None
+            stale = f"{lease_path}.{uuid.uuid4().hex}.stale"
+            try:
+                # Only one worker wins the rename of an expired lease
+                os.rename(lease_path, stale)
+            except FileNotFoundError:
+                return None
+
+        token = uuid.uuid4().hex
+        lease = {"token": token, "worker": worker_id, "expires": time.time() + lease_seconds, "attempts": attempts + 1}
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except (FileExistsError, FileNotFoundError):
+            return None
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(lease).encode())
+        if stale:
+            os.remove(stale)
+
+        with open(self._path(job_id, index, "payload"), "rb") as f:
+            payload = _unpack(f.read())["payload"]
+        return Shard(job_id, index, payload, attempts + 1, token)
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        try:
+            jobs = sorted(
+                (name for name in os.listdir(self.root) if not name.startswith(".")),
+                key=lambda name: os.stat(os.path.join(self.root, name)).st_mtime
+            )
+        except FileNotFoundError:
+            return None
+
+        for job_id in jobs:
+            for index in self._shards(job_id):
+                shard = self._try_lease(job_id, index, worker_id, lease_seconds)
+                if shard is not None:
+                    return shard
+        return None
+
+    def heartbeat(self, shard: Shard, lease_seconds: float) -> bool:
+        path = self._path(shard.job_id, shard.index, "lease")
+        lease = self._read_lease(path)
+        # An expired lease may be taken over at any moment: don't rewrite it
+        if lease is None or lease["token"] != shard.lease_token or lease["expires"] < time.time():
+            return False
+        lease["expires"] = time.time() + lease_seconds
+        try:
+            self._write(path, json.dumps(lease).encode())
+        except FileNotFoundError:
+            return False
+        return True
+
+    def complete(self, shard: Shard, result: Any) -> bool:
+        path = self._path(shard.job_id, shard.index, "result")
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_pack(result))
+            os.link(tmp, path)
+            return True
+        except (FileExistsError, FileNotFoundError):
+            return False
+        finally:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+
+    def fail(self, shard: Shard, error: str) -> None:
+        path = self._path(shard.job_id, shard.index, "lease")
+        lease = self._read_lease(path)
+        if lease is None or lease["token"] != shard.lease_token:
+            return
+        if lease["attempts"] >= self.max_attempts:
+            self._write(self._path(shard.job_id, shard.index, "failed"), error.encode())
+            return
+        # Expire it now so the next lease() picks it up
+        lease.update(expires=0, error=error)
+        self._write(path, json.dumps(lease).encode())
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        status = {state: 0 for state in SHARD_STATES}
+        status.update(items_done=0, items_total=0, attempts=0, errors=[])
+        now = time.time()
+
+        for index in self._shards(job_id):
+            try:
+                with open(self._path(job_id, index, "payload"), "rb") as f:
+                    size = _unpack(f.read())["size"]
+            except FileNotFoundError:
+                continue   # job deleted meanwhile
+            lease = self._read_lease(self._path(job_id, index, "lease"))
+            status["items_total"] += size
+            status["attempts"] += lease["attempts"] if lease else 0
+
+            if os.path.exists(self._path(job_id, index, "result")):
+                status["done"] += 1
+                status["items_done"] += size
+            elif os.path.exists(self._path(job_id, index, "failed")):
+                status["failed"] += 1
+                with open(self._path(job_id, index, "failed"), "rb") as f:
+                    status["errors"].append(f.read().decode())
+            elif lease and lease["expires"] >= now:
+                status["leased"] += 1
+            elif lease and lease["attempts"] >= self.max_attempts:
+                status["failed"] += 1
+                status["errors"].append(f"{lease.get('error') or 'lease expired'} (attempts exhausted)")
+            else:
+                status["queued"] += 1
+        return status
+
+    def results(self, job_id: str) -> Iterator[Any]:
+        for index in self._shards(job_id):
+            try:
+                with open(self._path(job_id, index, "result"), "rb") as f:
+                    blob = f.read()
+            except FileNotFoundError:
+                continue
+            yield _unpack(blob)
+
+    def delete(self, job_id: str) -> None:
+        shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+
+
+def create_work_queue(backend: Optional[str] = None) -> WorkQueue:
+    """
+    Build the configured work queue ("sqlite" or "file"). Another
+    backend (e.g. Redis) only has to implement WorkQueue.
+    """
+    backend = (backend or os.getenv("WORK_QUEUE_BACKEND") or WORK_QUEUE_BACKEND).lower()
+
+    if backend == "sqlite":
+        return SQLiteWorkQueue(db_path=os.getenv("WORK_QUEUE_PATH") or WORK_QUEUE_DB_PATH)
+    if backend == "file":
+        return FileWorkQueue(root=os.getenv("WORK_QUEUE_PATH") or WORK_QUEUE_DIR)
+
+    raise ValueError(f"Unknown work queue backend: {backend}")
@@ -0,0 +1,115 @@
+"""
+Render time of the findings dashboard for completed scans of 100, 1k and
+5k roles: the previous version (full download, one expander per role)
+against the cached table + paged role details.
+
+    python -m benchmarks.dashboard_render [roles ...]
+
+Runs the API with uvicorn on a local port and the dashboard through
+Streamlit's AppTest; the second (rerun) timing is what a user pays on
+every widget interaction.
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+
+import uvicorn
+from streamlit.testing.v1 import AppTest
+
+from backend import main
+from backend.job_store import MemoryJobStore
+from backend.services.scan_query import summarize_scan
+from benchmarks.fakes import synthetic_scan
+
+PORT = 8000   # the dashboard components talk to BACKEND_URL
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+
+
+def legacy_dashboard():
+    from collections import defaultdict
+
+    import requests
+    import streamlit as st
+
+    job = requests.get(f"http://localhost:8000/scan/{st.session_state.scan_id}", timeout=60).json()
+    severity_count = defaultdict(int)
+
+    for role in job["data"]["roles"]:
+        if role["RoleName"].startswith("AWSServiceRole"):
+            continue
+        with st.expander(f"👤 Role: {role['RoleName']}", expanded=False):
+            for policy in role.get("AttachedPolicies", []):
+                st.markdown(f"**Policy:** `{policy['PolicyName']}`")
+                st.markdown(f"**Risk Score:** `{policy['RiskScore']}`")
+                seen = set()
+                for finding in policy.get("Findings", []):
+                    key = (finding["title"], finding["severity"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    severity_count[finding["severity"]] += 1
+                    st.markdown(f"- **{finding['title']}** (`{finding['severity']}`)")
+
+    for column, severity in zip(st.columns(4), ("CRITICAL", "HIGH", "MEDIUM", "LOW")):
+        column.metric(severity, severity_count.get(severity, 0))
+
+
+def current_dashboard():
+    from components.findings_view import findings_dashboard
+
+    findings_dashboard(hide_service_roles=True)
+
+
+def seed(job_id: str, roles: int) -> None:
+    scan = synthetic_scan(num_roles=roles)
+    main.jobs_db.create(job_id, {"status": "in_progress", "created_at": datetime.utcnow()})
+    main.jobs_db.update(
+        job_id,
+        status="completed",
+        data=scan,
+        summary=summarize_scan(scan),
+        finished_at=datetime.utcnow(),
+    )
+
+
+def render_times(script, job_id: str):
+    app = AppTest.from_function(script, default_timeout=300)
+    app.session_state["scan_id"] = job_id
+    app.session_state["scan_status"] = "completed"
+
+    timings = []
+    for _ in range(2):
+        started = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - started) * 1000)
+        assert not app.exception, app.exception
+    return timings
+
+
+def main_(sizes=(100, 1000, 5000)):
+    sys.path.insert(0, FRONTEND_DIR)
+    main.jobs_db = MemoryJobStore()
+
+    server = uvicorn.Server(uvicorn.Config(main.app, port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        for roles in sizes:
+            seed(f"bench-{roles}", roles)
+            for name, script in (("legacy", legacy_dashboard), ("current", current_dashboard)):
+                first, rerun = render_times(script, f"bench-{roles}")
+                print(f"roles={roles:>5}  {name:>7}  first={first:9.1f}ms  rerun={rerun:9.1f}ms")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main_(tuple(int(arg) for arg in args) if args else (100, 1000, 5000))
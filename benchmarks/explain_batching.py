@@ -0,0 +1,54 @@
+"""
+Round trips, tokens and latency of per-finding vs. batched explanation
+prompts, against a recording fake LLM.
+
+    python -m benchmarks.explain_batching [roles] [latency_seconds]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from backend.explanation_cache import ExplanationCache
+from backend.llm_explainer import SecurityLLMExplainer
+from backend.rag_engine import SecurityRAGEngine
+from backend.services.explain_service import explain_scan_results
+from benchmarks.fakes import fake_embeddings, recording_chat_model, synthetic_scan
+
+# batch_size: 1 = one request per finding, None = one per policy, N = N findings per request
+MODES = ((1, "per-finding"), (None, "per-policy"), (8, "groups of 8"), (32, "groups of 32"))
+
+
+def main(roles: int = 200, latency: float = 0.05):
+    # Unique descriptions per role defeat in-job dedup so batching is measured alone
+    scan = synthetic_scan(num_roles=roles)
+    for role in scan["roles"]:
+        for policy in role["AttachedPolicies"]:
+            for finding in policy["Findings"]:
+                finding["description"] = f"{finding['description']} ({role['RoleName']})"
+
+    rag = SecurityRAGEngine(
+        embeddings=fake_embeddings(),
+        vector_db_path=os.path.join(tempfile.mkdtemp(), "vector_store")
+    )
+    rag.build_or_load_knowledge_base()
+
+    print(f"roles={roles} llm_latency={latency}s")
+    for batch_size, label in MODES:
+        llm = recording_chat_model(latency=latency)
+        cache = ExplanationCache(db_path=None, max_entries=0)
+        explainer = SecurityLLMExplainer(llm=llm, rag=rag, cache=cache)
+
+        started = time.perf_counter()
+        explain_scan_results(
+            scan, explainer, batch_size=batch_size, token_budget=None, time_budget=None
+        )
+        wall = time.perf_counter() - started
+
+        print(f"{label:<14} round_trips={llm.calls:>5}  ~tokens={llm.approx_tokens:>8}  wall={wall:6.2f}s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.05)
@@ -0,0 +1,68 @@
+"""
+Wall time of a full-scan explanation as concurrency grows, against the
+local fake chat-completions server.
+
+    python -m benchmarks.explain_concurrency [roles] [latency_seconds]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from backend.explanation_cache import ExplanationCache
+from backend.llm_explainer import SecurityLLMExplainer
+from backend.rag_engine import SecurityRAGEngine
+from backend.services.explain_service import explain_scan_results_async
+from backend.utils.constants import LLM_MODEL
+from benchmarks.fake_openai_server import create_app, serve_in_background
+from benchmarks.fakes import fake_embeddings, synthetic_scan
+
+CONCURRENCY_LEVELS = (1, 4, 16, 32, 64)
+
+
+async def run_once(scan, base_url: str, rag: SecurityRAGEngine, concurrency: int) -> float:
+    async with httpx.AsyncClient() as http_async_client:
+        llm = ChatOpenAI(
+            model=LLM_MODEL,
+            api_key="sk-fake",
+            base_url=base_url,
+            max_retries=0,
+            http_async_client=http_async_client,
+        )
+        # Caching disabled: every finding must reach the fake server
+        cache = ExplanationCache(db_path=None, max_entries=0)
+        explainer = SecurityLLMExplainer(llm=llm, rag=rag, cache=cache)
+
+        started = time.perf_counter()
+        await explain_scan_results_async(
+            scan, explainer,
+            concurrency=concurrency, batch_size=1, token_budget=None, time_budget=None
+        )
+        return time.perf_counter() - started
+
+
+def main(roles: int = 40, latency: float = 0.2):
+    base_url = serve_in_background(create_app(latency=latency, rate_limit_every=25))
+    scan = synthetic_scan(num_roles=roles)
+    findings = sum(len(p["Findings"]) for r in scan["roles"] for p in r["AttachedPolicies"])
+
+    rag = SecurityRAGEngine(
+        embeddings=fake_embeddings(),
+        vector_db_path=os.path.join(tempfile.mkdtemp(), "vector_store")
+    )
+    rag.build_or_load_knowledge_base()
+
+    print(f"findings={findings} latency={latency}s (every 25th call rate limited)")
+    for concurrency in CONCURRENCY_LEVELS:
+        wall = asyncio.run(run_once(scan, base_url, rag, concurrency))
+        print(f"concurrency={concurrency:>3}  wall={wall:7.2f}s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 40, float(args[1]) if len(args) > 1 else 0.2)
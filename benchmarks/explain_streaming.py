@@ -0,0 +1,90 @@
+"""
+Time to first token of a streamed scan explanation versus the time until
+the first explanation is available without streaming, against the local
+fake chat-completions server.
+
+    python -m benchmarks.explain_streaming [roles] [latency_seconds]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from backend.explanation_cache import ExplanationCache
+from backend.llm_explainer import SecurityLLMExplainer
+from backend.rag_engine import SecurityRAGEngine
+from backend.services.explain_service import (
+    explain_scan_results_async,
+    stream_scan_explanations,
+)
+from backend.utils.constants import LLM_MODEL
+from benchmarks.fake_openai_server import create_app, serve_in_background
+from benchmarks.fakes import fake_embeddings, synthetic_scan
+
+
+def _explainer(base_url: str, rag: SecurityRAGEngine, http_async_client) -> SecurityLLMExplainer:
+    llm = ChatOpenAI(
+        model=LLM_MODEL,
+        api_key="sk-fake",
+        base_url=base_url,
+        max_retries=0,
+        http_async_client=http_async_client,
+    )
+    # Caching disabled: every finding must reach the fake server
+    cache = ExplanationCache(db_path=None, max_entries=0)
+    return SecurityLLMExplainer(llm=llm, rag=rag, cache=cache)
+
+
+async def run_blocking(scan, base_url: str, rag: SecurityRAGEngine):
+    first = None
+
+    def on_result(index, total, entry):
+        nonlocal first
+        first = first or time.perf_counter() - started
+
+    async with httpx.AsyncClient() as client:
+        started = time.perf_counter()
+        await explain_scan_results_async(
+            scan, _explainer(base_url, rag, client),
+            batch_size=1, token_budget=None, time_budget=None, on_result=on_result
+        )
+        return first, time.perf_counter() - started
+
+
+async def run_streaming(scan, base_url: str, rag: SecurityRAGEngine):
+    first = None
+
+    async with httpx.AsyncClient() as client:
+        started = time.perf_counter()
+        async for event in stream_scan_explanations(
+            scan, _explainer(base_url, rag, client), token_budget=None, time_budget=None
+        ):
+            if event["event"] == "token" and first is None:
+                first = time.perf_counter() - started
+        return first, time.perf_counter() - started
+
+
+def main(roles: int = 5, latency: float = 0.3):
+    base_url = serve_in_background(create_app(latency=latency))
+    scan = synthetic_scan(num_roles=roles)
+
+    rag = SecurityRAGEngine(
+        embeddings=fake_embeddings(),
+        vector_db_path=os.path.join(tempfile.mkdtemp(), "vector_store")
+    )
+    rag.build_or_load_knowledge_base()
+
+    print(f"roles={roles} first-token latency={latency}s")
+    for name, run in (("blocking", run_blocking), ("streaming", run_streaming)):
+        first, wall = asyncio.run(run(scan, base_url, rag))
+        print(f"{name:>9}  first output={first:6.2f}s  wall={wall:6.2f}s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 5, float(args[1]) if len(args) > 1 else 0.3)
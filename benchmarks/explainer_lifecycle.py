@@ -0,0 +1,65 @@
+"""
+Per-request explainer construction vs. the shared, warmed explainer:
+construction and the first request on a new explainer are reported
+apart from the steady-state time per request on the shared one.
+
+    python -m benchmarks.explainer_lifecycle [requests]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+from backend.explanation_cache import ExplanationCache
+from backend.llm_explainer import SecurityLLMExplainer
+from backend.rag_engine import SecurityRAGEngine
+from backend.services.explain_service import explain_scan_results
+from benchmarks.fakes import recording_chat_model, fake_embeddings, synthetic_scan
+
+
+def build_explainer(vector_db_path: str) -> SecurityLLMExplainer:
+    rag = SecurityRAGEngine(embeddings=fake_embeddings(), vector_db_path=vector_db_path)
+    cache = ExplanationCache(db_path=None, max_entries=0)
+    return SecurityLLMExplainer(llm=recording_chat_model(), rag=rag, cache=cache)
+
+
+def main(requests: int = 20):
+    scan = synthetic_scan(num_roles=5)
+    vector_db_path = os.path.join(tempfile.mkdtemp(), "vector_store")
+    build_explainer(vector_db_path)  # build the index once so cold runs only load it
+
+    # Per-request lifecycle: construct, then serve one request on it
+    construct, first = [], []
+    for _ in range(requests):
+        started = time.perf_counter()
+        explainer = build_explainer(vector_db_path)
+        built = time.perf_counter()
+        explain_scan_results(scan, explainer)
+        construct.append(built - started)
+        first.append(time.perf_counter() - built)
+
+    started = time.perf_counter()
+    shared = build_explainer(vector_db_path)
+    shared.warm_up()
+    startup = time.perf_counter() - started
+
+    warm = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        explain_scan_results(scan, shared)
+        warm.append(time.perf_counter() - started)
+
+    cold = statistics.median(c + f for c, f in zip(construct, first))
+    steady = statistics.median(warm)
+    print(f"requests={requests}")
+    print(f"construction:                median {statistics.median(construct) * 1000:.2f} ms")
+    print(f"first request (new object):  median {statistics.median(first) * 1000:.2f} ms")
+    print(f"shared warm explainer:       median {steady * 1000:.2f} ms per request "
+          f"(startup + warm-up once: {startup * 1000:.2f} ms)")
+    print(f"saved per request:           {(cold - steady) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,138 @@
+"""
+Local stand-in for the OpenAI chat-completions API with injected latency
+and optional rate limiting. Streaming requests ("stream": true) get the
+first token after `latency` and one word every `token_delay`.
+
+    python -m benchmarks.fake_openai_server --latency 0.5 --port 8100
+"""
+
+import time
+import json
+import socket
+import asyncio
+import argparse
+import threading
+from itertools import count
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FAKE_COMPLETION = (
+    "This configuration grants more access than the workload needs. "
+    "An attacker with these credentials could escalate privileges. "
+    "Scope actions and resources to the minimum required set."
+)
+
+
+def _stream_chunks(n: int, model: str, latency: float, token_delay: float):
+    words = FAKE_COMPLETION.split(" ")
+
+    def chunk(delta, finish_reason=None) -> str:
+        payload = {
+            "id": f"chatcmpl-fake-{n}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def body():
+        await asyncio.sleep(latency)
+        yield chunk({"role": "assistant", "content": ""})
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(token_delay)
+            yield chunk({"content": word if i == 0 else f" {word}"})
+        yield chunk({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return body()
+
+
+def create_app(latency: float = 0.5, rate_limit_every: int = 0, token_delay: float = 0.02) -> FastAPI:
+    """
+    `rate_limit_every=n` answers every n-th request with HTTP 429.
+    """
+    app = FastAPI()
+    counter = count(1)
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        n = next(counter)
+        app.state.requests = n
+
+        if rate_limit_every and n % rate_limit_every == 0:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            )
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(n, body.get("model", "fake"), latency, token_delay),
+                media_type="text/event-stream",
+            )
+
+        # Non-streaming answers arrive after the whole completion is generated
+        await asyncio.sleep(latency + token_delay * (len(FAKE_COMPLETION.split(" ")) - 1))
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        completion_tokens = len(FAKE_COMPLETION) // 4
+
+        return {
+            "id": f"chatcmpl-fake-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": FAKE_COMPLETION},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_in_background(app: FastAPI, port: int = 0) -> str:
+    """
+    Start the fake server on a daemon thread and return its /v1 base URL.
+    """
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    return f"http://127.0.0.1:{port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency, args.rate_limit_every, args.token_delay),
+        host="127.0.0.1",
+        port=args.port,
+    )
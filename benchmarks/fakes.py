@@ -0,0 +1,403 @@
+"""
+Offline stand-ins shared by the benchmarks.
+No AWS or OpenAI credentials are needed to run them.
+"""
+
+import re
+import json
+import time
+import random
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from backend.policy_analyzer import PolicyRiskAnalyzer
+
+EMBEDDING_SIZE = 256
+
+SAMPLE_POLICIES: List[Dict[str, Any]] = [
+    {"Statement": [{"Effect": "Allow", "Action": "*", "Resource": "*"}]},
+    {"Statement": [{"Effect": "Allow", "Action": ["iam:PassRole", "ec2:RunInstances"], "Resource": "*"}]},
+    {"Statement": [{"Effect": "Allow", "Action": ["s3:GetObject"], "Resource": "arn:aws:s3:::bucket/*"}]},
+    {"Statement": [{"Effect": "Allow", "NotAction": ["iam:*"], "Resource": "*"}]},
+    {"Statement": [{
+        "Effect": "Allow",
+        "Action": ["sts:AssumeRole"],
+        "Resource": "*",
+        "Condition": {"Bool": {"aws:MultiFactorAuthPresent": "true"}}
+    }]},
+    {"Statement": []},
+]
+
+SAMPLE_TRUST_POLICIES: List[Dict[str, Any]] = [
+    {"Statement": [{"Effect": "Allow", "Principal": {"Service": "ec2.amazonaws.com"}, "Action": "sts:AssumeRole"}]},
+    {"Statement": [{"Effect": "Allow", "Principal": {"Service": "lambda.amazonaws.com"}, "Action": "sts:AssumeRole"}]},
+    {"Statement": [{"Effect": "Allow", "Principal": {"AWS": "*"}, "Action": "sts:AssumeRole"}]},
+    {"Statement": [{
+        "Effect": "Allow",
+        "Principal": {"AWS": "arn:aws:iam::210987654321:root"},
+        "Action": "sts:AssumeRole",
+    }]},
+    {"Statement": [{
+        "Effect": "Allow",
+        "Principal": {"AWS": "arn:aws:iam::210987654321:root"},
+        "Action": "sts:AssumeRole",
+        "Condition": {"StringEquals": {"sts:ExternalId": "partner-7"}},
+    }]},
+    {"Statement": [{
+        "Effect": "Allow",
+        "Principal": {"Federated": "arn:aws:iam::123456789012:oidc-provider/token.actions.githubusercontent.com"},
+        "Action": "sts:AssumeRoleWithWebIdentity",
+        "Condition": {"StringLike": {"token.actions.githubusercontent.com:sub": "repo:org/*"}},
+    }]},
+    {"Statement": [{
+        "Effect": "Allow",
+        "Principal": {"Federated": "arn:aws:iam::123456789012:oidc-provider/token.actions.githubusercontent.com"},
+        "Action": "sts:AssumeRoleWithWebIdentity",
+        "Condition": {"StringEquals": {"token.actions.githubusercontent.com:aud": "sts.amazonaws.com"}},
+    }]},
+]
+
+
+def fake_embeddings():
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    return DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+
+def fake_chat_model(response: str = "Explanation generated by the fake model."):
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    return FakeListChatModel(responses=[response])
+
+
+FAKE_EXPLANATION = (
+    "This configuration grants more access than <ROLE_NAME> needs. "
+    "Scope <POLICY_NAME> down to the minimum required actions."
+)
+
+
+def recording_chat_model(latency: float = 0.0):
+    """
+    Fake chat model that answers batched prompts with valid JSON and
+    records round trips and prompt/completion sizes.
+    """
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class RecordingChatModel(BaseChatModel):
+        latency: float = 0.0
+        calls: int = 0
+        prompt_chars: int = 0
+        completion_chars: int = 0
+
+        @property
+        def _llm_type(self) -> str:
+            return "recording-fake"
+
+        @property
+        def approx_tokens(self) -> int:
+            return (self.prompt_chars + self.completion_chars) // 4
+
+        def _respond(self, messages) -> ChatResult:
+            prompt = str(messages[-1].content)
+            ids = re.findall(r"^\[(F\d+)\]", prompt, re.MULTILINE)
+            if ids:
+                content = json.dumps({"explanations": [
+                    {"id": finding_id, "explanation": FAKE_EXPLANATION} for finding_id in ids
+                ]})
+            else:
+                content = FAKE_EXPLANATION
+
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            self.completion_chars += len(content)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            time.sleep(self.latency)
+            return self._respond(messages)
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            await asyncio.sleep(self.latency)
+            return self._respond(messages)
+
+    return RecordingChatModel(latency=latency)
+
+
+def synthetic_scan(num_roles: int, policies_per_role: int = 3, seed: int = 7) -> Dict[str, Any]:
+    """
+    Scan result shaped exactly like scan_roles_and_policies() output.
+    """
+    rng = random.Random(seed)
+    analyzer = PolicyRiskAnalyzer()
+    roles = []
+
+    for r in range(num_roles):
+        role_name = f"AWSServiceRoleForBench{r}" if r % 10 == 0 else f"bench-role-{r}"
+        attached = []
+
+        for p in range(policies_per_role):
+            doc = rng.choice(SAMPLE_POLICIES)
+            name = f"bench-policy-{r}-{p}"
+            analysis = analyzer.analyze_policy(policy=doc, policy_name=name)
+            attached.append({
+                "PolicyName": name,
+                "PolicyArn": f"arn:aws:iam::123456789012:policy/{name}",
+                "RiskScore": analysis["risk_score"],
+                "Findings": analysis["findings"],
+            })
+
+        roles.append({
+            "RoleName": role_name,
+            "Arn": f"arn:aws:iam::123456789012:role/{role_name}",
+            "AttachedPolicies": attached,
+            "InlinePolicies": [],
+        })
+
+    return {
+        "scan_metadata": {"region": "us-east-1", "scan_time": "2026-01-01T00:00:00"},
+        "roles": roles,
+    }
+
+
+# --------------------------------------------------
+# Stub IAM client
+# --------------------------------------------------
+ACCOUNT_ID = "123456789012"
+PAGE_SIZE = 100
+# What a last-accessed report lists for a role allowed "*"
+REPORTED_SERVICES = ("ec2", "iam", "kms", "lambda", "logs", "s3", "sqs", "sts")
+
+
+class _Paginator:
+
+    def __init__(self, items, key: str):
+        self._items = items
+        self._key = key
+
+    def paginate(self, **kwargs):
+        items = self._items(**kwargs)
+        for start in range(0, max(len(items), 1), PAGE_SIZE):
+            yield {self._key: items[start:start + PAGE_SIZE]}
+
+
+class _Events:
+
+    def register(self, *args, **kwargs):
+        pass
+
+
+class _Meta:
+    events = _Events()
+
+
+def _no_such_entity(operation: str, message: str):
+    from botocore.exceptions import ClientError
+    return ClientError({"Error": {"Code": "NoSuchEntity", "Message": message}}, operation)
+
+
+def cloudtrail_record(event_name: str, **request_parameters) -> Dict[str, Any]:
+    return {
+        "eventSource": "iam.amazonaws.com",
+        "eventName": event_name,
+        "eventTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "awsRegion": "us-east-1",
+        "requestParameters": request_parameters,
+    }
+
+
+class FakeIAMClient:
+    """
+    In-memory IAM account implementing the calls the scanner makes,
+    with optional per-call latency. Mutations return the CloudTrail
+    record AWS would emit for them.
+    """
+
+    meta = _Meta()
+
+    def __init__(
+        self,
+        num_roles: int = 100,
+        policies_per_role: int = 2,
+        latency: float = 0.0,
+        seed: int = 7,
+        report_delay=(1.0, 4.0),
+        max_running_reports: int = 0
+    ):
+        rng = random.Random(seed)
+        self.latency = latency
+        self.calls = 0
+        self.rng = rng
+        # Service last accessed jobs: seconds until complete, and how many
+        # may run before generate answers LimitExceeded (0 = no limit)
+        self.report_delay = report_delay
+        self.max_running_reports = max_running_reports
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.last_used: Dict[str, Dict[str, Any]] = {}
+        self.roles: Dict[str, Dict[str, Any]] = {}
+        self.attached: Dict[str, List[str]] = {}
+        self.inline: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.policies: Dict[str, Dict[str, Any]] = {}
+
+        # A few shared managed policies, attached across many roles
+        for p in range(10):
+            arn = f"arn:aws:iam::{ACCOUNT_ID}:policy/shared-{p}"
+            self.policies[arn] = {"name": f"shared-{p}", "default": "v1", "versions": {"v1": rng.choice(SAMPLE_POLICIES)}}
+
+        for r in range(num_roles):
+            name = f"AWSServiceRoleForBench{r}" if r % 10 == 0 else f"bench-role-{r}"
+            self.create_role(name, rng.choice(SAMPLE_TRUST_POLICIES))
+            self.attached[name] = rng.sample(sorted(self.policies), k=min(policies_per_role, len(self.policies)))
+            self.inline[name] = {"inline-0": rng.choice(SAMPLE_POLICIES)}
+
+    def _call(self) -> None:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # -----------------------------
+    # Read API (what the scanner uses)
+    # -----------------------------
+    def get_paginator(self, operation: str) -> _Paginator:
+        def list_roles(**kwargs):
+            self._call()
+            return list(self.roles.values())
+
+        def list_attached_role_policies(RoleName, **kwargs):
+            self._call()
+            return [{"PolicyName": self.policies[arn]["name"], "PolicyArn": arn} for arn in self.attached.get(RoleName, [])]
+
+        def list_role_policies(RoleName, **kwargs):
+            self._call()
+            return list(self.inline.get(RoleName, {}))
+
+        def list_entities_for_policy(PolicyArn, **kwargs):
+            self._call()
+            return [{"RoleName": name} for name, arns in self.attached.items() if PolicyArn in arns]
+
+        return {
+            "list_roles": lambda: _Paginator(list_roles, "Roles"),
+            "list_attached_role_policies": lambda: _Paginator(list_attached_role_policies, "AttachedPolicies"),
+            "list_role_policies": lambda: _Paginator(list_role_policies, "PolicyNames"),
+            "list_entities_for_policy": lambda: _Paginator(list_entities_for_policy, "PolicyRoles"),
+        }[operation]()
+
+    def get_role(self, RoleName):
+        self._call()
+        if RoleName not in self.roles:
+            raise _no_such_entity("GetRole", f"The role with name {RoleName} cannot be found.")
+        return {"Role": self.roles[RoleName]}
+
+    def get_policy(self, PolicyArn):
+        self._call()
+        return {"Policy": {"Arn": PolicyArn, "DefaultVersionId": self.policies[PolicyArn]["default"]}}
+
+    def get_policy_version(self, PolicyArn, VersionId):
+        self._call()
+        return {"PolicyVersion": {"Document": self.policies[PolicyArn]["versions"][VersionId], "VersionId": VersionId}}
+
+    def get_role_policy(self, RoleName, PolicyName):
+        self._call()
+        return {"RoleName": RoleName, "PolicyName": PolicyName, "PolicyDocument": self.inline[RoleName][PolicyName]}
+
+    # -----------------------------
+    # Service last accessed (asynchronous jobs)
+    # -----------------------------
+    def _granted_services(self, role_name: str) -> List[str]:
+        from backend.access_advisor import ALL_SERVICES, policy_services
+
+        documents = [self.policies[arn]["versions"][self.policies[arn]["default"]] for arn in self.attached[role_name]]
+        documents += list(self.inline[role_name].values())
+        services = set().union(*(policy_services(doc) for doc in documents)) if documents else set()
+        if ALL_SERVICES in services:
+            services = set(REPORTED_SERVICES)
+        return sorted(services)
+
+    def _last_authenticated(self, role_name: str, namespace: str):
+        # Fixed per role and service: recently used, long unused or never used
+        key = (role_name, namespace)
+        if key not in self.last_used:
+            roll = self.rng.random()
+            days = self.rng.randint(1, 30) if roll < 0.5 else self.rng.randint(120, 400) if roll < 0.8 else None
+            self.last_used[key] = None if days is None else datetime.now(timezone.utc) - timedelta(days=days)
+        return self.last_used[key]
+
+    def _running_reports(self) -> int:
+        now = time.monotonic()
+        return sum(report["ready_at"] > now for report in self.reports.values())
+
+    def generate_service_last_accessed_details(self, Arn, Granularity="SERVICE_LEVEL"):
+        self._call()
+        if self.max_running_reports and self._running_reports() >= self.max_running_reports:
+            from botocore.exceptions import ClientError
+            raise ClientError(
+                {"Error": {"Code": "LimitExceeded", "Message": "Too many running reports"}},
+                "GenerateServiceLastAccessedDetails",
+            )
+        job_id = f"job-{len(self.reports)}"
+        self.reports[job_id] = {
+            "role_name": Arn.rsplit("/", 1)[-1],
+            "created": datetime.now(timezone.utc),
+            "ready_at": time.monotonic() + self.rng.uniform(*self.report_delay),
+        }
+        return {"JobId": job_id}
+
+    def get_service_last_accessed_details(self, JobId, Marker=None, MaxItems=None):
+        self._call()
+        report = self.reports[JobId]
+        if time.monotonic() < report["ready_at"]:
+            return {"JobStatus": "IN_PROGRESS", "JobCreationDate": report["created"], "ServicesLastAccessed": []}
+
+        services = []
+        for namespace in self._granted_services(report["role_name"]):
+            entry = {"ServiceName": namespace, "ServiceNamespace": namespace, "TotalAuthenticatedEntities": 0}
+            last = self._last_authenticated(report["role_name"], namespace)
+            if last is not None:
+                entry.update(LastAuthenticated=last, TotalAuthenticatedEntities=1)
+            services.append(entry)
+
+        return {
+            "JobStatus": "COMPLETED",
+            "JobCreationDate": report["created"],
+            "JobCompletionDate": datetime.now(timezone.utc),
+            "ServicesLastAccessed": services,
+            "IsTruncated": False,
+        }
+
+    # -----------------------------
+    # Mutations (return CloudTrail records)
+    # -----------------------------
+    def create_role(self, role_name: str, trust: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.roles[role_name] = {
+            "RoleName": role_name,
+            "RoleId": f"AROA{abs(hash(role_name)) % 10 ** 12:012d}",
+            "Arn": f"arn:aws:iam::{ACCOUNT_ID}:role/{role_name}",
+            "Path": "/",
+            "AssumeRolePolicyDocument": trust or SAMPLE_TRUST_POLICIES[0],
+        }
+        self.attached.setdefault(role_name, [])
+        self.inline.setdefault(role_name, {})
+        return cloudtrail_record("CreateRole", roleName=role_name)
+
+    def delete_role(self, role_name: str) -> Dict[str, Any]:
+        for store in (self.roles, self.attached, self.inline):
+            store.pop(role_name, None)
+        return cloudtrail_record("DeleteRole", roleName=role_name)
+
+    def put_role_policy(self, role_name: str, policy_name: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        self.inline[role_name][policy_name] = document
+        return cloudtrail_record("PutRolePolicy", roleName=role_name, policyName=policy_name,
+                                 policyDocument=json.dumps(document))
+
+    def attach_role_policy(self, role_name: str, policy_arn: str) -> Dict[str, Any]:
+        if policy_arn not in self.attached[role_name]:
+            self.attached[role_name].append(policy_arn)
+        return cloudtrail_record("AttachRolePolicy", roleName=role_name, policyArn=policy_arn)
+
+    def create_policy_version(self, policy_arn: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        policy = self.policies[policy_arn]
+        version = f"v{len(policy['versions']) + 1}"
+        policy["versions"][version] = document
+        policy["default"] = version
+        return cloudtrail_record("CreatePolicyVersion", policyArn=policy_arn,
+                                 policyDocument=json.dumps(document), setAsDefault=True)
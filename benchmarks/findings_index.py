@@ -0,0 +1,59 @@
+"""
+Build time of the findings indexes and query latency against a linear
+scan of the results, on a large synthetic scan.
+
+    python -m benchmarks.findings_index [roles]
+"""
+
+import sys
+import time
+import heapq
+
+from backend.explain_scheduler import severity_of
+from backend.services.findings_index import FindingsIndex
+from backend.services.scan_query import iter_policies, role_risk_score
+from benchmarks.fakes import synthetic_scan
+
+REPEATS = 50
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+def main(roles: int = 10_000):
+    scan = synthetic_scan(num_roles=roles)
+    index = FindingsIndex(scan)
+    print(f"roles={roles} index build={index.stats['build_seconds'] * 1000:.1f}ms postings={index.stats['postings']}")
+
+    queries = {
+        "top 50 riskiest roles": (
+            lambda: index.top_roles(50),
+            lambda: heapq.nlargest(50, scan["roles"], key=role_risk_score),
+        ),
+        "roles with CRITICAL": (
+            lambda: index.roles_with_severity("CRITICAL"),
+            lambda: [
+                role for role in scan["roles"]
+                if any(severity_of(f) == "CRITICAL" for p in iter_policies(role) for f in p["Findings"])
+            ],
+        ),
+        "wildcard resource, no conditions": (
+            lambda: index.policies_with("Wildcard Resource", severity="HIGH", limit=100),
+            lambda: [
+                p for role in scan["roles"] for p in iter_policies(role)
+                if any(f["title"] == "Wildcard Resource" and severity_of(f) == "HIGH" for f in p["Findings"])
+            ][:100],
+        ),
+    }
+
+    for name, (indexed, linear) in queries.items():
+        print(f"{name:>34}  indexed={timed(indexed):8.3f}ms  linear={timed(linear):8.3f}ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 10_000)
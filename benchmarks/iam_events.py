@@ -0,0 +1,122 @@
+"""
+Event-driven re-analysis against a full rescan: bursts of IAM changes
+on a few roles (plus one managed policy shared by many) are debounced,
+re-scanned and patched into the latest completed scan.
+
+    python -m benchmarks.iam_events [roles] [latency_ms]
+
+Uses the in-memory IAM client from benchmarks.fakes with a fixed
+per-call latency standing in for the IAM API round trip.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from datetime import datetime
+
+os.environ["UNUSED_ACCESS_DAYS"] = "0"   # the full rescan runs without report jobs too
+
+from backend.aws_scanner import scan_role
+from backend.job_store import SQLiteJobStore
+from backend.policy_analyzer import PolicyRiskAnalyzer
+from backend.services.iam_events import IAMEventConsumer, QueueEventSource, RoleDebouncer
+from backend.services.scan_diff import store_fingerprint
+from backend.services.scan_query import summarize_scan
+from benchmarks.fakes import SAMPLE_POLICIES, FakeIAMClient
+
+DEBOUNCE = 0.2
+
+
+def full_scan(iam: FakeIAMClient):
+    analyzer = PolicyRiskAnalyzer()
+    started = time.perf_counter()
+    roles = [scan_role(iam, analyzer, role) for role in iam.roles.values()]
+    return {
+        "scan_metadata": {"scan_time": datetime.utcnow().isoformat(), "total_roles": len(roles)},
+        "roles": roles,
+    }, time.perf_counter() - started
+
+
+def seed(store, scan) -> str:
+    job_id = "bench-baseline"
+    store.create(job_id, {"status": "in_progress", "created_at": datetime.utcnow()})
+    store.update(job_id, status="completed", data=scan, summary=summarize_scan(scan), finished_at=datetime.utcnow())
+    store_fingerprint(store, job_id, scan)
+    return job_id
+
+
+def main(roles: int = 2000, latency_ms: float = 2.0):
+    iam = FakeIAMClient(num_roles=roles, latency=latency_ms / 1000)
+    scan, rescan_seconds = full_scan(iam)
+    rescan_calls, iam.calls = iam.calls, 0
+
+    store = SQLiteJobStore(tempfile.mktemp(suffix=".db"))
+    job_id = seed(store, scan)
+
+    patched = threading.Event()
+    patches = []
+
+    def on_patched(patched_job, due):
+        patches.append((time.monotonic(), due))
+        patched.set()
+
+    source = QueueEventSource()
+    consumer = IAMEventConsumer(
+        store, source, iam=iam,
+        debouncer=RoleDebouncer(debounce=DEBOUNCE, max_wait=5.0),
+        on_patched=on_patched,
+    )
+    consumer.start()
+
+    wildcard = SAMPLE_POLICIES[0]
+    shared = iam.attached["bench-role-3"][0]
+
+    def burst(name, records):
+        patched.clear()
+        iam.calls = 0
+        started = time.monotonic()
+        for record in records():
+            source.put(record)
+        if not patched.wait(60):
+            raise RuntimeError(f"{name}: no patch applied within 60s")
+        finished_at, due = patches[-1]
+        print(f"{name:>18}  roles={len(due):>6}  iam calls={iam.calls:>7}  "
+              f"event->patch={finished_at - started:8.2f}s")
+
+    def role_edits():
+        # What an engineer produces in a minute: repeated edits to two
+        # roles, a new role and a deletion
+        for i in range(5):
+            for role_name in ("bench-role-1", "bench-role-2"):
+                yield iam.put_role_policy(role_name, f"edited-{i}", wildcard)
+        yield iam.create_role("bench-role-new")
+        yield iam.attach_role_policy("bench-role-new", shared)
+        yield iam.delete_role("bench-role-4")
+
+    def policy_version():
+        # Fans out to every role the policy is attached to
+        yield iam.create_policy_version(shared, wildcard)
+
+    print(f"roles={roles} iam latency={latency_ms}ms debounce={DEBOUNCE * 1000:.0f}ms")
+    print(f"{'full rescan':>18}  roles={roles:>6}  iam calls={rescan_calls:>7}  time={rescan_seconds:8.2f}s")
+    try:
+        burst("role edits", role_edits)
+        burst("policy version", policy_version)
+    finally:
+        consumer.stop()
+
+    job = store.get(job_id)
+    patched_roles = {role["RoleName"]: role for role in job["data"]["roles"]}
+    edited = patched_roles["bench-role-1"]["InlinePolicies"]
+
+    assert "bench-role-4" not in patched_roles
+    assert "bench-role-new" in patched_roles
+    assert any(policy["PolicyName"] == "edited-4" and policy["Findings"] for policy in edited)
+    print(f"scan patches={job['summary']['patches']} roles now={job['summary']['roles_total']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 2000, float(args[1]) if len(args) > 1 else 2.0)
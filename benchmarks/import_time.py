@@ -0,0 +1,96 @@
+"""
+API cold start: time to import backend.main, which heavy modules that
+import pulls in, and time from process spawn to the first /health 200.
+
+    python -m benchmarks.import_time [runs]
+
+The AI stack, boto3/botocore and pyarrow load on first use (or explainer
+warm-up, after startup). Exits non-zero if any of them is imported
+with the app again.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import statistics
+import subprocess
+import tempfile
+import urllib.request
+
+# Loaded on first use, never by `import backend.main`
+DEFERRED_MODULES = (
+    "langchain_openai", "langchain_community", "langchain_core",
+    "openai", "tiktoken", "faiss", "numpy", "boto3", "botocore", "pyarrow",
+)
+
+_IMPORT = f"""
+import sys, json, time
+started = time.perf_counter()
+import backend.main
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {DEFERRED_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def child_env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("JOB_STORE_PATH", os.path.join(workdir, "jobs.db"))
+    env.setdefault("WORK_QUEUE_PATH", os.path.join(workdir, "work_queue.db"))
+    return env
+
+
+def import_run(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def health_run(env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health not ready after {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(runs: int = 5):
+    env = child_env(tempfile.mkdtemp())
+
+    imports = [import_run(env) for _ in range(runs)]
+    health = [health_run(env) for _ in range(runs)]
+    loaded = sorted({m for run in imports for m in run["loaded"]})
+
+    print(f"runs={runs}")
+    print(f"import backend.main: median {statistics.median(r['seconds'] for r in imports) * 1000:7.1f} ms")
+    print(f"spawn -> /health:    median {statistics.median(health) * 1000:7.1f} ms")
+    print(f"deferred modules loaded on import: {', '.join(loaded) or 'none'}")
+
+    if loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
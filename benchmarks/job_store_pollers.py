@@ -0,0 +1,82 @@
+"""
+Read throughput of the scan job stores under many concurrent pollers,
+compared with the original lock-guarded dict.
+
+    python -m benchmarks.job_store_pollers [pollers] [roles]
+
+Status polls read metadata only; result reads include the scan data
+(decompressed and decoded for SQLite, a reference for the dict).
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.job_store import MemoryJobStore, SQLiteJobStore
+from benchmarks.fakes import synthetic_scan
+
+READS_PER_POLLER = 200
+
+
+class LockedDict:
+    """
+    The previous jobs_db: a dict behind a single lock.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = Lock()
+
+    def create(self, job_id, job):
+        with self.lock:
+            self.jobs[job_id] = {"data": None, **job}
+
+    def update(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+
+    def get(self, job_id, include_data=True):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def close(self):
+        pass
+
+
+def measure(store, pollers: int, include_data: bool) -> float:
+    def poll(_):
+        for _ in range(READS_PER_POLLER):
+            store.get("scan", include_data=include_data)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=pollers) as executor:
+        list(executor.map(poll, range(pollers)))
+    return pollers * READS_PER_POLLER / (time.perf_counter() - started)
+
+
+def main(pollers: int = 50, roles: int = 500):
+    scan = synthetic_scan(num_roles=roles)
+    stores = {
+        "dict+lock": LockedDict(),
+        "memory": MemoryJobStore(),
+        "sqlite": SQLiteJobStore(db_path=os.path.join(tempfile.mkdtemp(), "jobs.db")),
+    }
+
+    print(f"pollers={pollers} roles={roles} reads/poller={READS_PER_POLLER}")
+    for name, store in stores.items():
+        store.create("scan", {"status": "in_progress", "created_at": datetime.utcnow()})
+        store.update("scan", status="completed", data=scan, finished_at=datetime.utcnow())
+
+        status_rate = measure(store, pollers, include_data=False)
+        result_rate = measure(store, pollers, include_data=True)
+        print(f"{name:>10}  status polls/s={status_rate:10.0f}  result reads/s={result_rate:10.0f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 500)
@@ -0,0 +1,68 @@
+"""
+Cost of the metrics layer on the scanner's hottest loop: analyzing
+policy documents bare and with a histogram observation per policy
+(what the scanner does), against the IAM fetch each document needs.
+
+    python -m benchmarks.metrics_overhead [policies]
+"""
+
+import sys
+import time
+
+from backend.policy_analyzer import PolicyRiskAnalyzer
+from backend.utils.metrics import REGISTRY, Histogram, FAST_BUCKETS
+from benchmarks.fakes import SAMPLE_POLICIES
+
+# Two IAM round trips (get_policy + get_policy_version) per managed policy
+IAM_SECONDS_PER_POLICY = 0.1
+
+
+def main(policies: int = 200_000, rounds: int = 5):
+    analyzer = PolicyRiskAnalyzer()
+    documents = [SAMPLE_POLICIES[i % len(SAMPLE_POLICIES)] for i in range(policies)]
+    histogram = Histogram("bench_policy_seconds", "benchmark only", buckets=FAST_BUCKETS)
+
+    def bare():
+        for doc in documents:
+            analyzer.analyze_policy(policy=doc)
+
+    def per_policy():
+        # Same pattern as the scanner
+        for doc in documents:
+            policy_started = time.perf_counter()
+            analyzer.analyze_policy(policy=doc)
+            histogram.observe(time.perf_counter() - policy_started)
+
+    # Interleaved rounds, best of each: the variants differ by a few percent
+    best = {run: float("inf") for run in (bare, per_policy)}
+    for _ in range(rounds):
+        for run in best:
+            started = time.perf_counter()
+            run()
+            best[run] = min(best[run], time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(policies):
+        histogram.observe(0.0001)
+    observe = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rendered = REGISTRY.render()
+    render = time.perf_counter() - started
+
+    baseline = best[bare]
+    extra = best[per_policy] - baseline
+    print(f"policies={policies} best of {rounds}")
+    print(f"  analyze bare    {baseline:7.3f}s  ({baseline / policies * 1e6:6.2f}us/policy)")
+    print(
+        f"  observe/policy  {best[per_policy]:7.3f}s  overhead={extra / baseline * 100:5.1f}% of analysis, "
+        f"{extra / policies / IAM_SECONDS_PER_POLICY * 100:.4f}% of a "
+        f"{IAM_SECONDS_PER_POLICY * 1000:.0f}ms IAM fetch per policy"
+    )
+    print(f"  observe()       {observe / policies * 1e6:6.2f}us/call")
+    print(f"  /metrics render {render * 1000:6.2f}ms ({len(rendered):,} bytes)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 200_000)
@@ -0,0 +1,57 @@
+"""
+CPU time and bytes on the wire for a completed scan response: FastAPI's
+default encoding path versus orjson bytes serialized once, with gzip and
+brotli variants.
+
+    python -m benchmarks.result_serialization [roles ...]
+"""
+
+import sys
+import json
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.utils.serialization import (
+    ENCODING_BROTLI,
+    ENCODING_GZIP,
+    ENCODING_IDENTITY,
+    EncodedBody,
+    brotli,
+    dumps,
+)
+from benchmarks.fakes import synthetic_scan
+
+
+def cpu_ms(fn, repeats: int = 5) -> float:
+    started = time.process_time()
+    for _ in range(repeats):
+        fn()
+    return (time.process_time() - started) / repeats * 1000
+
+
+def main(role_counts=(1000, 10_000)):
+    for roles in role_counts:
+        job = {
+            "status": "completed",
+            "created_at": datetime.utcnow(),
+            "finished_at": datetime.utcnow(),
+            "data": synthetic_scan(num_roles=roles),
+        }
+
+        default = cpu_ms(lambda: json.dumps(jsonable_encoder(job)).encode("utf-8"))
+        fast = cpu_ms(lambda: dumps(job))
+        print(f"roles={roles}  jsonable_encoder+json={default:8.1f}ms  orjson={fast:7.1f}ms  cached=0ms")
+
+        encodings = [ENCODING_IDENTITY, ENCODING_GZIP] + ([ENCODING_BROTLI] if brotli else [])
+        for encoding in encodings:
+            body = EncodedBody(dumps(job))
+            compress = cpu_ms(lambda: body.variant(encoding), repeats=1)
+            payload, _ = body.variant(encoding)
+            print(f"    {encoding:>8}  bytes={len(payload):>12,}  first compression={compress:7.1f}ms")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]]
+    main(counts or (1000, 10_000))
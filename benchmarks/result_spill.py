@@ -0,0 +1,92 @@
+"""
+Peak memory of a scan against role count: roles kept in a list (as
+before) versus a result sink spilling to a segment file, each through
+summary and job-store write like a scan job.
+
+    python -m benchmarks.result_spill [roles ...]
+
+Every run is a fresh process, so ru_maxrss is its own peak. The IAM
+stub and the role listing are created before the baseline is taken;
+the reported growth is what the scan itself holds.
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+from datetime import datetime
+
+os.environ["UNUSED_ACCESS_DAYS"] = "0"   # report jobs would dominate the run time
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # KiB on Linux
+
+
+def child(roles: int, mode: str) -> None:
+    import logging
+    logging.disable(logging.INFO)
+
+    from backend.aws_scanner import list_iam_roles, scan_role_list
+    from backend.job_store import SQLiteJobStore
+    from backend.result_sink import open_result_sink
+    from backend.services.scan_query import summarize_scan
+    from backend.utils.timing import StageTimings
+    from benchmarks.fakes import FakeIAMClient
+
+    workdir = tempfile.mkdtemp()
+    os.environ["RESULT_SPILL_DIR"] = workdir
+    store = SQLiteJobStore(os.path.join(workdir, "jobs.db"))
+    store.create("bench", {"status": "in_progress", "created_at": datetime.utcnow()})
+
+    iam = FakeIAMClient(num_roles=roles)
+    listed = list_iam_roles(iam)
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+
+    sink = open_result_sink("bench") if mode == "sink" else None
+    scanned, _ = scan_role_list(iam, listed, StageTimings(), sink=sink)
+    results = {"scan_metadata": {}, "roles": scanned.finish() if sink is not None else scanned}
+    summary = sink.summary.to_dict() if sink is not None else summarize_scan(results)
+    store.update("bench", data=results, summary=summary)
+
+    print(json.dumps({
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "seconds": time.perf_counter() - started,
+        "stored_bytes": store.list_jobs()[0]["result_bytes"],
+        "roles_total": summary["roles_total"],
+    }))
+
+
+def run(roles: int, mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.result_spill", "--child", str(roles), mode],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(role_counts=(1000, 5000, 10000, 20000)):
+    from backend.result_sink import result_buffer_roles
+
+    print(f"buffer={result_buffer_roles()} roles")
+    for roles in role_counts:
+        plain, spilled = run(roles, "list"), run(roles, "sink")
+        assert plain["roles_total"] == spilled["roles_total"] == roles
+
+        grown = [r["peak_mb"] - r["baseline_mb"] for r in (plain, spilled)]
+        print(f"roles={roles:>6}  list: +{grown[0]:7.1f} MB peak {plain['peak_mb']:7.1f} MB "
+              f"{plain['seconds']:6.2f}s   sink: +{grown[1]:6.1f} MB peak {spilled['peak_mb']:7.1f} MB "
+              f"{spilled['seconds']:6.2f}s  stored={spilled['stored_bytes'] / 1e6:5.1f} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--child"]:
+        child(int(args[1]), args[2])
+    else:
+        main(tuple(int(a) for a in args) or (1000, 5000, 10000, 20000))
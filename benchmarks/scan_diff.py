@@ -0,0 +1,86 @@
+"""
+Fingerprint build time and diff latency for two large scans that differ
+in a handful of roles, against a naive diff over the full results.
+
+    python -m benchmarks.scan_diff [roles] [changed_roles]
+"""
+
+import sys
+import copy
+import time
+
+from backend.services.scan_diff import fingerprint_scan, diff_scans
+from backend.services.scan_query import POLICY_KINDS
+from benchmarks.fakes import synthetic_scan, SAMPLE_POLICIES
+from backend.policy_analyzer import PolicyRiskAnalyzer
+
+REPEATS = 20
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+def mutate(scan, changed: int):
+    """
+    Copy of `scan` with `changed` roles touched: re-analyzed policies,
+    one role removed and one added.
+    """
+    scan = copy.deepcopy(scan)
+    analyzer = PolicyRiskAnalyzer()
+    roles = scan["roles"]
+    step = max(1, len(roles) // changed)
+
+    for n, role in enumerate(roles[::step][:changed - 2]):
+        policy = role["AttachedPolicies"][0]
+        analysis = analyzer.analyze_policy(SAMPLE_POLICIES[n % len(SAMPLE_POLICIES)], policy["PolicyName"])
+        policy["Findings"] = analysis["findings"]
+        policy["RiskScore"] = analysis["risk_score"]
+
+    roles.pop()
+    roles.append({**copy.deepcopy(roles[1]), "RoleName": "bench-role-new", "Arn": "arn:aws:iam::123456789012:role/bench-role-new"})
+    return scan
+
+
+def naive_diff(base, target):
+    """
+    What a client does today: index both result sets and compare every
+    finding of every role.
+    """
+    def findings(scan):
+        return {
+            (role["Arn"], policy.get("PolicyArn") or policy["PolicyName"], f["title"], f["statement_index"]): str(f["severity"])
+            for role in scan["roles"] for kind in POLICY_KINDS for policy in role.get(kind, []) for f in policy["Findings"]
+        }
+
+    old, new = findings(base), findings(target)
+    return (
+        new.keys() - old.keys(),
+        old.keys() - new.keys(),
+        [key for key in old.keys() & new.keys() if old[key] != new[key]],
+    )
+
+
+def main(roles: int = 10_000, changed: int = 10):
+    base = synthetic_scan(num_roles=roles)
+    target = mutate(base, changed)
+
+    base_fp, target_fp = fingerprint_scan(base), fingerprint_scan(target)
+    print(f"roles={roles} fingerprint build={base_fp['build_seconds'] * 1000:.1f}ms")
+
+    diff = diff_scans(base_fp, target_fp)
+    print(f"diff summary: {diff['summary']}")
+
+    print(f"fingerprint diff: {timed(lambda: diff_scans(base_fp, target_fp)):8.3f}ms")
+    print(f"naive diff:       {timed(lambda: naive_diff(base, target)):8.3f}ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 10_000,
+        int(args[1]) if len(args) > 1 else 10,
+    )
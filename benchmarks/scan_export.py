@@ -0,0 +1,67 @@
+"""
+Export throughput and size of the columnar formats against the nested
+JSON a client downloads and flattens itself today.
+
+    python -m benchmarks.scan_export [roles]
+
+Requires pyarrow.
+"""
+
+import io
+import sys
+import gzip
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.services.scan_export import flatten_scan, to_arrow, iter_arrow_stream, parquet_bytes
+from backend.utils.serialization import dumps, loads
+from benchmarks.fakes import synthetic_scan
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def client_flatten(body: bytes):
+    """
+    The data team's current path: parse the nested JSON and build
+    finding rows in Python.
+    """
+    rows = []
+    for role in loads(body)["roles"]:
+        for policy in role["AttachedPolicies"] + role["InlinePolicies"]:
+            for finding in policy["Findings"]:
+                rows.append((role["RoleName"], policy["PolicyName"], finding["title"], finding["severity"]))
+    return rows
+
+
+def main(roles: int = 10_000):
+    scan = synthetic_scan(num_roles=roles)
+
+    body, json_ms = timed(lambda: dumps(scan))
+    gzipped = gzip.compress(body, compresslevel=6)
+    rows, client_ms = timed(lambda: client_flatten(body))
+
+    tables, flatten_ms = timed(lambda: to_arrow(flatten_scan("bench", scan)))
+    findings = tables["findings"]
+    ipc, ipc_ms = timed(lambda: b"".join(iter_arrow_stream(findings)))
+    parquet, parquet_ms = timed(lambda: parquet_bytes(findings))
+
+    _, read_ipc_ms = timed(lambda: pa.ipc.open_stream(ipc).read_all())
+    _, read_parquet_ms = timed(lambda: pq.read_table(io.BytesIO(parquet)))
+
+    print(f"roles={roles} finding rows={len(rows):,}")
+    print(f"{'json (whole scan)':>24}  bytes={len(body):>11,}  gzip={len(gzipped):>10,}  "
+          f"write={json_ms:8.1f}ms  client flatten={client_ms:8.1f}ms")
+    print(f"{'flatten -> arrow':>24}  {'':>17}  {'':>15}  build={flatten_ms:8.1f}ms (all 3 tables)")
+    print(f"{'arrow ipc (findings)':>24}  bytes={len(ipc):>11,}  {'':>15}  write={ipc_ms:8.1f}ms  read={read_ipc_ms:8.1f}ms")
+    print(f"{'parquet (findings)':>24}  bytes={len(parquet):>11,}  {'':>15}  write={parquet_ms:8.1f}ms  read={read_parquet_ms:8.1f}ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 10_000)
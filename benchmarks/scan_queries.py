@@ -0,0 +1,70 @@
+"""
+Payload size and latency of GET /scan/{job_id} variants on a large
+synthetic scan, including conditional (If-None-Match) polls.
+
+    python -m benchmarks.scan_queries [roles]
+"""
+
+import sys
+import time
+import logging
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.job_store import MemoryJobStore
+from backend.services.scan_query import summarize_scan
+from benchmarks.fakes import synthetic_scan
+
+REPEATS = 20
+
+QUERIES = {
+    "full (legacy)": {},
+    "status only": {"view": "status"},
+    "page of 50": {"limit": 50},
+    "CRITICAL, no service roles": {"severity": "CRITICAL", "exclude_service_roles": "true", "limit": 50},
+    "min risk 20, names only": {"min_risk_score": 20, "fields": "RoleName,Arn"},
+}
+
+
+def main_(roles: int = 5000):
+    scan = synthetic_scan(num_roles=roles)
+    main.jobs_db = MemoryJobStore()
+    main.jobs_db.create("bench", {"status": "in_progress", "created_at": datetime.utcnow()})
+    main.jobs_db.update(
+        "bench",
+        status="completed",
+        data=scan,
+        summary=summarize_scan(scan),
+        finished_at=datetime.utcnow(),
+    )
+
+    # configure_logging() is at INFO; httpx would log every request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(main.app)
+    print(f"roles={roles} repeats={REPEATS}")
+
+    for name, params in QUERIES.items():
+        response = client.get("/scan/bench", params=params)
+        etag = response.headers["etag"]
+
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            client.get("/scan/bench", params=params)
+        fresh = (time.perf_counter() - started) / REPEATS * 1000
+
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            cached = client.get("/scan/bench", params=params, headers={"If-None-Match": etag})
+        not_modified = (time.perf_counter() - started) / REPEATS * 1000
+
+        print(
+            f"{name:>28}  bytes={len(response.content):>11,}  "
+            f"200={fresh:8.2f}ms  {cached.status_code}={not_modified:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main_(int(args[0]) if args else 5000)
@@ -0,0 +1,111 @@
+"""
+Distributed scan throughput: one process scanning every role against
+the coordinator with N worker processes pulling shards, and a run in
+which one worker is killed mid-shard (its lease expires and the shard
+is re-queued).
+
+    python -m benchmarks.scan_sharding [roles] [latency_ms] [sqlite|file]
+
+Every process talks to its own copy of the in-memory IAM stub, with a
+fixed per-call latency standing in for the IAM API round trip.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import multiprocessing as mp
+
+os.environ["UNUSED_ACCESS_DAYS"] = "0"   # report jobs would dominate both columns
+
+from backend.aws_scanner import list_iam_roles, scan_role_list
+from backend.scan_worker import ScanWorker
+from backend.services.scan_sharding import run_sharded_scan
+from backend.utils.timing import StageTimings
+from backend.work_queue import create_work_queue
+from benchmarks.fakes import FakeIAMClient
+
+SHARD_ROLES = 25
+LEASE_SECONDS = 2.0
+
+
+def fake_iam(roles: int, latency_ms: float) -> FakeIAMClient:
+    return FakeIAMClient(num_roles=roles, latency=latency_ms / 1000)
+
+
+def worker_process(backend: str, path: str, roles: int, latency_ms: float) -> None:
+    import logging
+    logging.disable(logging.INFO)
+    os.environ["WORK_QUEUE_PATH"] = path
+    worker = ScanWorker(
+        create_work_queue(backend), iam=fake_iam(roles, latency_ms),
+        lease_seconds=LEASE_SECONDS, idle_seconds=0.05
+    )
+    worker.run()
+
+
+def distributed(backend: str, roles: int, latency_ms: float, workers: int, kill_after: float = 0.0):
+    path = tempfile.mktemp(suffix=".db" if backend == "sqlite" else "")
+    os.environ["WORK_QUEUE_PATH"] = path
+    queue = create_work_queue(backend)
+
+    # Workers are terminated at the end rather than signalled through a
+    # shared Event: a killed worker could die holding the Event's lock
+    processes = [
+        mp.Process(target=worker_process, args=(backend, path, roles, latency_ms), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    if kill_after:
+        def kill_one(stage, done, total):
+            if stage == "scan_roles" and time.perf_counter() - started > kill_after and processes[0].is_alive():
+                processes[0].kill()
+        on_progress = kill_one
+    else:
+        on_progress = None
+
+    started = time.perf_counter()
+    try:
+        result = run_sharded_scan(
+            f"bench-{workers}", queue=queue, iam=fake_iam(roles, latency_ms),
+            shard_roles=SHARD_ROLES, poll_seconds=0.05, on_progress=on_progress
+        )
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(5)
+    return result, time.perf_counter() - started
+
+
+def main(roles: int = 600, latency_ms: float = 2.0, backend: str = "sqlite"):
+    iam = fake_iam(roles, latency_ms)
+    started = time.perf_counter()
+    local_roles, _ = scan_role_list(iam, list_iam_roles(iam), StageTimings())
+    local_seconds = time.perf_counter() - started
+    expected = [role["RoleName"] for role in local_roles]
+
+    print(f"roles={roles} iam latency={latency_ms}ms shard={SHARD_ROLES} roles queue={backend}")
+    print(f"{'local':>22}  time={local_seconds:7.2f}s")
+
+    for workers in (1, 2, 4, 8):
+        result, seconds = distributed(backend, roles, latency_ms, workers)
+        assert [role["RoleName"] for role in result["roles"]] == expected
+        print(f"{f'{workers} workers':>22}  time={seconds:7.2f}s  speedup={local_seconds / seconds:5.2f}x  "
+              f"leases={result['scan_metadata']['shards']['leases']}")
+
+    result, seconds = distributed(backend, roles, latency_ms, 4, kill_after=1.0)
+    assert [role["RoleName"] for role in result["roles"]] == expected
+    shards = result["scan_metadata"]["shards"]
+    print(f"{'4 workers, 1 killed':>22}  time={seconds:7.2f}s  leases={shards['leases']} "
+          f"for {shards['total']} shards (lease {LEASE_SECONDS}s)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 600,
+        float(args[1]) if len(args) > 1 else 2.0,
+        args[2] if len(args) > 2 else "sqlite",
+    )
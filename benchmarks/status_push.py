@@ -0,0 +1,115 @@
+"""
+Backend load of many dashboard sessions following one scan: rerun
+polling (GET /scan/{id}?view=status every few seconds) against one
+/scan/{id}/events stream per session.
+
+    python -m benchmarks.status_push [sessions] [scan_seconds] [poll_interval]
+
+Runs the API with uvicorn on a local port; the IAM scan is replaced by
+a synthetic one that takes `scan_seconds`.
+"""
+
+import sys
+import copy
+import json
+import time
+import asyncio
+import threading
+
+import httpx
+import uvicorn
+
+from backend import main
+from backend.job_store import MemoryJobStore
+from backend.utils.metrics import HTTP_REQUEST_SECONDS
+from benchmarks.fakes import synthetic_scan
+
+PORT = 8765
+ROLES = 200
+ACTIVE = ("pending", "in_progress")
+
+
+def install_fake_scan(scan_seconds: float, finished: dict):
+    scan = synthetic_scan(num_roles=ROLES)
+
+    def run_iam_scan(cancel_event=None, on_progress=None, **_):
+        for done in range(ROLES):
+            if on_progress:
+                on_progress("scan_roles", done, ROLES)
+            time.sleep(scan_seconds / ROLES)
+        if on_progress:
+            on_progress("scan_roles", ROLES, ROLES)
+        finished["at"] = time.monotonic()
+        return copy.deepcopy(scan)
+
+    main.run_iam_scan = run_iam_scan
+
+
+def requests_served(route: str) -> int:
+    snapshot = HTTP_REQUEST_SECONDS.snapshot(method="GET", route=route, status="200")
+    return int(snapshot["count"]) if snapshot else 0
+
+
+async def poll_session(client: httpx.AsyncClient, job_id: str, interval: float) -> float:
+    while True:
+        response = await client.get(f"/scan/{job_id}", params={"view": "status"})
+        if response.json()["status"] not in ACTIVE:
+            return time.monotonic()
+        await asyncio.sleep(interval)
+
+
+async def push_session(client: httpx.AsyncClient, job_id: str) -> float:
+    async with client.stream("GET", f"/scan/{job_id}/events") as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data:") and json.loads(line[5:])["status"] not in ACTIVE:
+                return time.monotonic()
+    return time.monotonic()
+
+
+async def run_mode(mode: str, sessions: int, interval: float, finished: dict):
+    route = "/scan/{job_id}" if mode == "poll" else "/scan/{job_id}/events"
+    before = requests_served(route)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=60) as client:
+        job_id = (await client.post("/scan")).json()["job_id"]
+
+        if mode == "poll":
+            sessions_done = [poll_session(client, job_id, interval) for _ in range(sessions)]
+        else:
+            sessions_done = [push_session(client, job_id) for _ in range(sessions)]
+        noticed = await asyncio.gather(*sessions_done)
+
+    lags = [at - finished["at"] for at in noticed]
+    print(
+        f"{mode:>5}: requests={requests_served(route) - before:>5}  "
+        f"completion noticed after avg={sum(lags) / len(lags):6.2f}s max={max(lags):6.2f}s"
+    )
+
+
+def main_(sessions: int = 50, scan_seconds: float = 30.0, interval: float = 3.0):
+    finished = {}
+    install_fake_scan(scan_seconds, finished)
+    main.jobs_db = MemoryJobStore()
+
+    server = uvicorn.Server(uvicorn.Config(main.app, port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    print(f"sessions={sessions} scan={scan_seconds}s poll interval={interval}s")
+    try:
+        asyncio.run(run_mode("poll", sessions, interval, finished))
+        asyncio.run(run_mode("push", sessions, interval, finished))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main_(
+        int(args[0]) if args else 50,
+        float(args[1]) if len(args) > 1 else 30.0,
+        float(args[2]) if len(args) > 2 else 3.0,
+    )
@@ -0,0 +1,71 @@
+"""
+Cost of trust-policy analysis inside the role scan: the same account
+scanned with and without AssumeRolePolicyDocument in the role listing.
+
+    python -m benchmarks.trust_policies [roles] [latency_ms ...]
+
+IAM call counts must match (the document comes with list_roles). The
+analysis is timed on its own and reported as a share of the scan at
+each per-call latency; 0 is the CPU-only worst case.
+"""
+
+import sys
+import time
+from collections import Counter
+
+from backend.aws_scanner import list_iam_roles, scan_role
+from backend.policy_analyzer import PolicyRiskAnalyzer
+from benchmarks.fakes import ACCOUNT_ID, FakeIAMClient
+
+
+def scan(iam, roles):
+    analyzer = PolicyRiskAnalyzer()
+    iam.calls = 0
+    started = time.perf_counter()
+    results = [scan_role(iam, analyzer, role) for role in roles]
+    return results, time.perf_counter() - started, iam.calls
+
+
+def trust_seconds_per_role(documents, repeat: int = 20) -> float:
+    """
+    The analysis on its own (best of `repeat`), free of call-latency noise.
+    """
+    analyzer = PolicyRiskAnalyzer()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for document in documents:
+            analyzer.analyze_trust_policy(document, ACCOUNT_ID)
+        best = min(best, time.perf_counter() - started)
+    return best / len(documents)
+
+
+def main(roles: int = 1000, latencies=(0.0, 1.0, 5.0)):
+    import logging
+    logging.getLogger("backend.aws_scanner").setLevel(logging.WARNING)
+
+    for latency_ms in latencies:
+        iam = FakeIAMClient(num_roles=roles, latency=latency_ms / 1000)
+        listed = list_iam_roles(iam)
+        untrusted = [{k: v for k, v in role.items() if k != "AssumeRolePolicyDocument"} for role in listed]
+
+        _, base_seconds, base_calls = scan(iam, untrusted)
+        results, _, trust_calls = scan(iam, listed)
+        assert base_calls == trust_calls, "trust analysis must not call IAM"
+
+        per_role = trust_seconds_per_role([role["AssumeRolePolicyDocument"] for role in listed])
+        overhead = per_role * roles / base_seconds * 100
+        print(f"latency={latency_ms:5.1f}ms  roles={roles}  iam calls={trust_calls:>6} (unchanged)  "
+              f"scan={base_seconds:8.3f}s  trust analysis={per_role * roles * 1000:7.2f}ms "
+              f"({per_role * 1e6:.1f}us/role)  overhead={overhead:6.2f}%")
+
+    titles = Counter(
+        finding["title"]
+        for role in results for policy in role["TrustPolicies"] for finding in policy["Findings"]
+    )
+    print(f"trust findings: {dict(titles)}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000, tuple(float(a) for a in args[1:]) or (0.0, 1.0, 5.0))
@@ -0,0 +1,61 @@
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+BACKEND_URL = "http://localhost:8000"
+ROLE_PAGE_SIZE = 25
+
+
+@st.cache_resource
+def api_session() -> requests.Session:
+    """
+    One pooled HTTP session for the Streamlit server, shared by every
+    browser session, so reruns reuse keep-alive connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_json(path, timeout=30, **params):
+    response = api_session().get(f"{BACKEND_URL}{path}", params=params or None, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+# --------------------------------------------------
+# Completed results only change when IAM change events patch them:
+# cache them per id and revision (the summary's patched_at)
+# --------------------------------------------------
+STATUS_TTL = 30   # how soon a patched scan shows up
+
+
+@st.cache_data(max_entries=32, ttl=STATUS_TTL, show_spinner=False)
+def completed_scan_status(scan_id):
+    return _get_json(f"/scan/{scan_id}", view="status")
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def completed_scan_table(scan_id, exclude_service_roles, revision=None):
+    return _get_json(
+        f"/scan/{scan_id}/table",
+        timeout=60,
+        exclude_service_roles=str(exclude_service_roles).lower(),
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def completed_roles_page(scan_id, page, exclude_service_roles, revision=None):
+    return _get_json(
+        f"/scan/{scan_id}",
+        offset=page * ROLE_PAGE_SIZE,
+        limit=ROLE_PAGE_SIZE,
+        exclude_service_roles=str(exclude_service_roles).lower(),
+    )["data"]
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def completed_explanations(job_id):
+    return _get_json(f"/explain/{job_id}")
@@ -1,7 +1,80 @@
+import time
+
 import streamlit as st
-import requests
 
-BACKEND_URL = "http://localhost:8000"
+from components.sse_client import iter_sse
+from components.api_client import BACKEND_URL, api_session, completed_explanations
+
+POLL_INTERVAL = 2
+RESULTS_PAGE_SIZE = 20
+
+
+def _render_results(results, job_id=None):
+    """
+    Render one page of explanations; long result lists are paginated so
+    a rerun only builds RESULTS_PAGE_SIZE expanders.
+    """
+    pages = max(1, -(-len(results) // RESULTS_PAGE_SIZE))
+    page = 0
+    if pages > 1:
+        page = st.number_input(
+            f"Explanations page (of {pages})",
+            min_value=1,
+            max_value=pages,
+            value=1,
+            key=f"explain_page_{job_id}"
+        ) - 1
+
+    for item in results[page * RESULTS_PAGE_SIZE:(page + 1) * RESULTS_PAGE_SIZE]:
+        with st.expander(
+            f"📄 {item['Role']} → {item['Policy']}",
+            expanded=False
+        ):
+            explanation = item["Explanation"]
+
+            st.markdown(explanation["summary"])
+
+            for detail in explanation["details"]:
+                st.markdown(
+                    f"**{detail['severity']}** — {detail['explanation']}"
+                )
+
+            st.markdown("**🔐 Secure Policy Template:**")
+            st.json(explanation["recommended_policy"])
+
+
+def _stream_explanations(scan_id):
+    """
+    Render explanation tokens as they arrive, one placeholder per finding.
+    """
+    placeholders, texts = {}, {}
+
+    with api_session().get(
+        f"{BACKEND_URL}/explain/stream/{scan_id}",
+        stream=True,
+        timeout=(10, 120)
+    ) as response:
+        response.raise_for_status()
+
+        for event, data in iter_sse(response):
+            stream_id = data.get("id")
+
+            if event == "finding_start":
+                st.markdown(
+                    f"**{data['severity']}** · {data['role']} → {data['policy']} — {data['title']}"
+                )
+                placeholders[stream_id] = st.empty()
+                texts[stream_id] = ""
+
+            elif event == "token":
+                texts[stream_id] += data["delta"]
+                placeholders[stream_id].markdown(texts[stream_id] + " ▌")
+
+            elif event == "finding_end":
+                placeholders[stream_id].markdown(texts[stream_id])
+
+            elif event == "done":
+                st.success(f"Explained {data['findings']} findings")
 
 
 def ai_chat_section():
@@ -9,38 +82,79 @@ def ai_chat_section():
         st.info("Complete a scan to enable AI explanations")
         return
 
-    if st.button("🧠 Explain Findings", use_container_width=True):
-        with st.spinner("AI analyzing security risks..."):
+    if st.toggle("Stream explanations live", value=False):
+        if st.button("🧠 Explain Findings", use_container_width=True):
             try:
-                response = requests.post(
-                    f"{BACKEND_URL}/explain",
-                    json={"scan_id": st.session_state.scan_id},
-                    timeout=60
-                )
-                response.raise_for_status()
+                _stream_explanations(st.session_state.scan_id)
+            except Exception as exc:
+                st.error(f"AI explanation failed: {exc}")
+        return
+
+    if st.button("🧠 Explain Findings", use_container_width=True):
+        try:
+            response = api_session().post(
+                f"{BACKEND_URL}/explain",
+                json={"scan_id": st.session_state.scan_id},
+                timeout=10
+            )
+            response.raise_for_status()
+            st.session_state.explain_job_id = response.json()["job_id"]
 
-                results = response.json().get("results", [])
+        except Exception as exc:
+            st.error(f"AI explanation failed: {exc}")
+            return
 
-                if not results:
-                    st.info("No findings to explain")
-                    return
+    job_id = st.session_state.get("explain_job_id")
+    if not job_id:
+        return
 
-                for item in results:
-                    with st.expander(
-                        f"📄 {item['Role']} → {item['Policy']}",
-                        expanded=False
-                    ):
-                        explanation = item["Explanation"]
+    try:
+        # Finished explanation jobs never change: fetch them once
+        if st.session_state.get("explain_status") == (job_id, "completed"):
+            job = completed_explanations(job_id)
+        else:
+            response = api_session().get(f"{BACKEND_URL}/explain/{job_id}", timeout=10)
+            response.raise_for_status()
+            job = response.json()
+            st.session_state.explain_status = (job_id, job["status"])
+    except Exception as exc:
+        st.error(f"Failed to fetch explanation status: {exc}")
+        return
 
-                        st.markdown(explanation["summary"])
+    results = job.get("results") or []
 
-                        for detail in explanation["details"]:
-                            st.markdown(
-                                f"**{detail['severity']}** — {detail['explanation']}"
-                            )
+    if job["status"] == "in_progress":
+        progress = job.get("progress", {})
+        total = progress.get("policies_total")
+        done = progress.get("policies_done", 0)
 
-                        st.markdown("**🔐 Secure Policy Template:**")
-                        st.json(explanation["recommended_policy"])
+        st.progress(
+            done / total if total else 0.0,
+            text=f"AI analyzing security risks... {done}/{total or '?'} policies"
+        )
 
-            except Exception as exc:
-                st.error(f"AI explanation failed: {exc}")
+        if st.button("✖ Cancel", use_container_width=True):
+            api_session().delete(f"{BACKEND_URL}/explain/{job_id}", timeout=10)
+
+        _render_results(results, job_id)
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
+
+    if job["status"] == "failed":
+        st.error(f"AI explanation failed: {job.get('error', 'Unknown error')}")
+        return
+
+    if job["status"] == "cancelled":
+        st.warning("AI explanation cancelled")
+        _render_results(results, job_id)
+        return
+
+    if not results:
+        st.info("No findings to explain")
+        return
+
+    deferred = (job.get("summary") or {}).get("deferred") or []
+    if deferred:
+        st.warning(f"{len(deferred)} findings deferred: AI budget exhausted")
+
+    _render_results(results, job_id)
@@ -1,10 +1,99 @@
 import streamlit as st
 import requests
 import time
-from collections import defaultdict
 
-BACKEND_URL = "http://localhost:8000"
-POLL_INTERVAL = 3
+from components.sse_client import iter_sse
+from components.api_client import (
+    BACKEND_URL,
+    ROLE_PAGE_SIZE,
+    api_session,
+    completed_scan_status,
+    completed_scan_table,
+    completed_roles_page,
+)
+
+POLL_INTERVAL = 3           # fallback when the event stream is unavailable
+EVENTS_READ_TIMEOUT = 60    # backend sends keepalives every 15s
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+POLICY_KINDS = ("AttachedPolicies", "InlinePolicies", "TrustPolicies")
+
+
+def _follow_scan(scan_id):
+    """
+    Render live status from the scan's event stream until it finishes.
+    Returns the final status, or None if the stream could not be used.
+    """
+    status_line = st.empty()
+    progress_bar = st.progress(0.0)
+
+    try:
+        with api_session().get(
+            f"{BACKEND_URL}/scan/{scan_id}/events",
+            stream=True,
+            timeout=(10, EVENTS_READ_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+
+            for event, state in iter_sse(response):
+                if event != "status":
+                    continue
+
+                stage = state.get("stage") or state["status"]
+                total, done = state.get("roles_total"), state.get("roles_done") or 0
+                if total:
+                    progress_bar.progress(min(done / total, 1.0))
+                    status_line.markdown(f"**Stage:** `{stage}` · {done}/{total} roles")
+                else:
+                    status_line.markdown(f"**Stage:** `{stage}`")
+
+                if state["status"] not in ("pending", "in_progress"):
+                    return state["status"]
+
+    except requests.RequestException:
+        return None
+
+    return None
+
+
+def _scan_status(scan_id):
+    # A completed scan never changes, so its status is served from cache
+    if st.session_state.get("scan_status") == "completed":
+        return completed_scan_status(scan_id)
+
+    response = api_session().get(
+        f"{BACKEND_URL}/scan/{scan_id}",
+        params={"view": "status"},
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _render_role_page(scan_id, summary, hide_service_roles):
+    revision = summary.get("patched_at")
+    roles_total = summary.get("roles_total", 0)
+    if hide_service_roles:
+        roles_total -= summary.get("service_roles", 0)
+    pages = max(1, -(-roles_total // ROLE_PAGE_SIZE))
+
+    page = st.number_input(
+        f"Role details page (of {pages})",
+        min_value=1,
+        max_value=pages,
+        value=1,
+        key=f"role_page_{scan_id}_{hide_service_roles}"
+    ) - 1
+
+    for role in completed_roles_page(scan_id, page, hide_service_roles, revision)["roles"]:
+        with st.expander(f"👤 Role: {role['RoleName']}", expanded=False):
+            for policy in (policy for kind in POLICY_KINDS for policy in role.get(kind, [])):
+                st.markdown(f"**Policy:** `{policy['PolicyName']}`")
+                st.markdown(f"**Risk Score:** `{policy['RiskScore']}`")
+
+                unique = dict.fromkeys(
+                    (finding["title"], finding["severity"]) for finding in policy.get("Findings", [])
+                )
+                st.markdown("\n".join(f"- **{title}** (`{severity}`)" for title, severity in unique))
 
 
 def findings_dashboard(hide_service_roles: bool = True):
@@ -12,25 +101,29 @@ def findings_dashboard(hide_service_roles: bool = True):
         st.info("Start a scan to view findings")
         return
 
+    scan_id = st.session_state.scan_id
+
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/scan/{st.session_state.scan_id}",
-            timeout=10
-        )
-        response.raise_for_status()
+        # Metadata only; results are fetched in pages once the scan completes
+        job = _scan_status(scan_id)
     except Exception as exc:
         st.error(f"Failed to fetch scan status: {exc}")
         return
 
-    job = response.json()
     st.session_state.scan_status = job["status"]
 
     st.markdown(f"**Status:** `{job['status']}`")
 
-    if job["status"] == "in_progress":
-        time.sleep(POLL_INTERVAL)
+    if job["status"] in ("pending", "in_progress"):
+        # One long-lived request per session instead of a poll every few seconds
+        if _follow_scan(scan_id) is None:
+            time.sleep(POLL_INTERVAL)
         st.rerun()
 
+    if job["status"] == "cancelled":
+        st.warning("Scan cancelled")
+        return
+
     if job["status"] == "failed":
         st.error("Scan failed")
         st.write(job.get("error", "Unknown error"))
@@ -40,40 +133,35 @@ def findings_dashboard(hide_service_roles: bool = True):
         return
 
     st.success("Scan completed")
-    st.session_state.scan_result = job["data"]
-
-    severity_count = defaultdict(int)
 
-    for role in st.session_state.scan_result.get("roles", []):
-        role_name = role["RoleName"]
+    # Severity counts are computed by the backend when the scan completes
+    summary = job.get("summary") or {}
+    severity_count = summary.get(
+        "severity_counts_excluding_service_roles" if hide_service_roles else "severity_counts",
+        {}
+    )
 
-        if hide_service_roles and role_name.startswith("AWSServiceRole"):
-            continue
-
-        with st.expander(f"👤 Role: {role_name}", expanded=False):
-            for policy in role.get("AttachedPolicies", []):
-                st.markdown(f"**Policy:** `{policy['PolicyName']}`")
-                st.markdown(f"**Risk Score:** `{policy['RiskScore']}`")
-
-                seen = set()
-                for finding in policy.get("Findings", []):
-                    key = (finding["title"], finding["severity"])
-                    if key in seen:
-                        continue
-                    seen.add(key)
+    try:
+        table = completed_scan_table(scan_id, hide_service_roles, summary.get("patched_at"))
+    except Exception as exc:
+        st.error(f"Failed to fetch scan results: {exc}")
+        return
 
-                    severity_count[finding["severity"]] += 1
+    # st.dataframe virtualizes rows, so thousands of policies stay responsive
+    columns = table["columns"]
+    st.dataframe(
+        {name: [row[i] for row in table["rows"]] for i, name in enumerate(columns)},
+        use_container_width=True,
+        hide_index=True,
+    )
 
-                    st.markdown(
-                        f"- **{finding['title']}** "
-                        f"(`{finding['severity']}`)"
-                    )
+    try:
+        _render_role_page(scan_id, summary, hide_service_roles)
+    except Exception as exc:
+        st.error(f"Failed to fetch role details: {exc}")
 
     st.divider()
     st.subheader("📊 Severity Summary")
 
-    c1, c2, c3, c4 = st.columns(4)
-    c1.metric("CRITICAL", severity_count.get("CRITICAL", 0))
-    c2.metric("HIGH", severity_count.get("HIGH", 0))
-    c3.metric("MEDIUM", severity_count.get("MEDIUM", 0))
-    c4.metric("LOW", severity_count.get("LOW", 0))
+    for column, severity in zip(st.columns(4), SEVERITIES):
+        column.metric(severity, severity_count.get(severity, 0))
@@ -1,7 +1,6 @@
 import streamlit as st
-import requests
 
-BACKEND_URL = "http://localhost:8000"
+from components.api_client import BACKEND_URL, api_session
 
 
 def policy_upload_section():
@@ -9,15 +8,25 @@ def policy_upload_section():
 
     if st.button("Start IAM Scan", use_container_width=True):
         try:
-            response = requests.post(f"{BACKEND_URL}/scan", timeout=10)
+            response = api_session().post(f"{BACKEND_URL}/scan", timeout=10)
+
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After", "a few")
+                st.warning(f"Scan queue is full, retry in {retry_after} seconds")
+                return
+
             response.raise_for_status()
 
             data = response.json()
             st.session_state.scan_id = data["job_id"]
-            st.session_state.scan_status = "in_progress"
+            st.session_state.scan_status = data["status"]
             st.session_state.scan_result = None
+            st.session_state.explain_job_id = None
 
-            st.success("IAM scan started successfully")
+            if response.status_code == 200:
+                st.info("An identical scan is already running; following it")
+            else:
+                st.success("IAM scan queued successfully")
 
         except Exception as exc:
             st.error(f"Failed to start scan: {exc}")
@@ -0,0 +1,18 @@
+import json
+
+
+def iter_sse(response):
+    """
+    Yield (event, data) pairs from a streaming text/event-stream response.
+    Comment lines (keepalives) are skipped.
+    """
+    event, data = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if event and data:
+                yield event, json.loads("\n".join(data))
+            event, data = None, []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
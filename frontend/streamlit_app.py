@@ -59,7 +59,7 @@ st.markdown(DARK_THEME, unsafe_allow_html=True)
 # --------------------------------------------------
 # Session State
 # --------------------------------------------------
-for key in ["scan_id", "scan_result", "scan_status"]:
+for key in ["scan_id", "scan_result", "scan_status", "explain_job_id"]:
     if key not in st.session_state:
         st.session_state[key] = None
 